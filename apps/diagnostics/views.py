@@ -508,7 +508,7 @@ class RequisitionViewSet(viewsets.ModelViewSet):
             return Response({'error': 'procedure_id is required'}, status=status.HTTP_400_BAD_REQUEST)
         try:
             from apps.opd.models import ProcedureMaster
-            procedure = ProcedureMaster.objects.get(id=procedure_id, tenant_id=request.tenant_id)
+            procedure = ProcedureMaster.objects.cached(request.tenant_id, procedure_id)
         except ProcedureMaster.DoesNotExist:
             return Response({'error': 'Procedure not found'}, status=status.HTTP_404_NOT_FOUND)
 
@@ -534,7 +534,7 @@ class RequisitionViewSet(viewsets.ModelViewSet):
             return Response({'error': 'package_id is required'}, status=status.HTTP_400_BAD_REQUEST)
         try:
             from apps.opd.models import ProcedurePackage
-            package = ProcedurePackage.objects.get(id=package_id, tenant_id=request.tenant_id)
+            package = ProcedurePackage.objects.cached(request.tenant_id, package_id)
         except ProcedurePackage.DoesNotExist:
             return Response({'error': 'Package not found'}, status=status.HTTP_404_NOT_FOUND)
 
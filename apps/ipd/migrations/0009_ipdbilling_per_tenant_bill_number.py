@@ -0,0 +1,36 @@
+# IPD bill numbers are generated per tenant (IPD-BILL/YYYYMMDD/### counts
+# only the tenant's own bills), but bill_number was globally unique, so the
+# second tenant to bill on a given day collided with the first. Uniqueness
+# moves to (tenant_id, bill_number), matching OPDBill.
+#
+# Existing rows are globally unique, so the new constraint always holds.
+# The (tenant_id, bill_date) index serves the per-tenant daily count.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ipd", "0008_ipdbillitem_service_source"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="ipdbilling",
+            name="bill_number",
+            field=models.CharField(
+                blank=True,
+                help_text="Unique bill identifier per tenant (e.g., IPD-BILL/20231223/001)",
+                max_length=50,
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="ipdbilling",
+            unique_together={("tenant_id", "bill_number")},
+        ),
+        migrations.AddIndex(
+            model_name="ipdbilling",
+            index=models.Index(fields=["tenant_id", "bill_date"], name="ipd_bill_tenant_date_idx"),
+        ),
+    ]
@@ -6,6 +6,9 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 from decimal import Decimal
 from django.utils import timezone
 
+from common.money import CENT, HUNDRED, ZERO_AMOUNT
+from common.serializers import is_unique_violation
+
 
 class Ward(models.Model):
     """
@@ -623,9 +626,8 @@ class IPDBilling(models.Model):
 
     bill_number = models.CharField(
         max_length=50,
-        unique=True,
         blank=True,
-        help_text="Unique bill identifier (e.g., IPD-BILL/20231223/001)"
+        help_text="Unique bill identifier per tenant (e.g., IPD-BILL/20231223/001)"
     )
     bill_date = models.DateTimeField(
         default=timezone.now,
@@ -727,9 +729,12 @@ class IPDBilling(models.Model):
         ordering = ['-bill_date']
         verbose_name = 'IPD Bill'
         verbose_name_plural = 'IPD Bills'
+        # Numbers are generated per tenant, so uniqueness must be per tenant too
+        unique_together = [['tenant_id', 'bill_number']]
         indexes = [
             models.Index(fields=['tenant_id']),
             models.Index(fields=['tenant_id', 'payment_status']),
+            models.Index(fields=['tenant_id', 'bill_date'], name='ipd_bill_tenant_date_idx'),
             models.Index(fields=['admission', 'bill_date']),
             models.Index(fields=['bill_number'], name='ipd_bill_number_idx'),
             models.Index(fields=['payment_status'], name='ipd_payment_status_idx'),
@@ -787,7 +792,9 @@ class IPDBilling(models.Model):
                 return
             except IntegrityError as exc:
                 last_exception = exc
-                if 'ipd_bill_number_idx' in str(exc) or 'ipd_billings_bill_number_key' in str(exc):
+                # Retry only if the bill_number collided due to a concurrent
+                # create; NOT NULL and other constraint errors are raised
+                if is_unique_violation(exc, (type(self), ['tenant_id', 'bill_number'])):
                     self.bill_number = None
                     continue
                 raise
@@ -804,14 +811,18 @@ class IPDBilling(models.Model):
         non-deterministic per tenant. Must be an instance method (not
         @staticmethod) since it needs self.tenant_id.
         """
-        from datetime import date
+        from datetime import date, datetime, timedelta
         today = date.today()
         date_str = today.strftime('%Y%m%d')
 
-        # Get count of bills for today, scoped to this tenant only
+        # Get count of bills for today, scoped to this tenant only. A
+        # half-open range (not bill_date__date) lets ipd_bill_tenant_date_idx
+        # serve the count.
+        day_start = timezone.make_aware(datetime.combine(today, datetime.min.time()))
         today_count = IPDBilling.objects.filter(
             tenant_id=self.tenant_id,
-            bill_date__date=today
+            bill_date__gte=day_start,
+            bill_date__lt=day_start + timedelta(days=1)
         ).count() + 1
 
         return f"IPD-BILL/{date_str}/{today_count:03d}"
@@ -831,19 +842,19 @@ class IPDBilling(models.Model):
         # Sum all bill items
         items_total = self.items.aggregate(
             total=models.Sum('total_price')
-        )['total'] or Decimal('0.00')
+        )['total'] or ZERO_AMOUNT
 
         self.total_amount = items_total
 
         # Calculate discount
         if self.discount_percent > 0:
             # Calculate discount from percentage (overrides manual discount_amount)
-            self.discount_amount = (self.total_amount * self.discount_percent / Decimal('100.00')).quantize(Decimal('0.01'))
+            self.discount_amount = (self.total_amount * self.discount_percent / HUNDRED).quantize(CENT)
         # else: keep existing discount_amount (allows manual discounts when discount_percent is 0)
 
         # Ensure discount_amount is set
         if self.discount_amount is None:
-            self.discount_amount = Decimal('0.00')
+            self.discount_amount = ZERO_AMOUNT
 
         # Calculate payable amount
         self.payable_amount = self.total_amount - self.discount_amount
@@ -859,21 +870,33 @@ class IPDBilling(models.Model):
         # item was ever added). That falsely triggered the BILL_LOCKED guard
         # on bill-item create/update/delete, making it look like there was no
         # way to add items to a fresh bill at all.
-        if self.payable_amount > Decimal('0.00') and self.received_amount >= self.payable_amount:
+        if self.payable_amount > ZERO_AMOUNT and self.received_amount >= self.payable_amount:
             self.payment_status = 'paid'
-            self.balance_amount = Decimal('0.00')
-        elif self.received_amount > Decimal('0.00'):
+            self.balance_amount = ZERO_AMOUNT
+        elif self.received_amount > ZERO_AMOUNT:
             self.payment_status = 'partial'
         else:
             self.payment_status = 'unpaid'
 
     def record_payment(self, amount, mode='cash', details=None):
-        """Record a payment for this bill."""
-        self.received_amount += Decimal(str(amount))
-        self.payment_mode = mode
-        if details:
-            self.payment_details = details
-        self.save()
+        """
+        Record a payment for this bill.
+
+        received_amount is incremented in the database so concurrent payments
+        on the same bill can't overwrite each other.
+        """
+        # Only round-trip through str() for non-Decimals (floats would be inexact)
+        amount = amount if isinstance(amount, Decimal) else Decimal(str(amount))
+
+        with transaction.atomic():
+            type(self).objects.filter(pk=self.pk).update(
+                received_amount=models.F('received_amount') + amount
+            )
+            self.refresh_from_db(fields=['received_amount'])
+            self.payment_mode = mode
+            if details:
+                self.payment_details = details
+            self.save()
 
     def get_bed_day_info(self):
         """
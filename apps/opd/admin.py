@@ -1,5 +1,17 @@
 # opd/admin.py
+from contextvars import ContextVar
+
 from django.contrib import admin
+from django.contrib.admin.utils import unquote
+from django.contrib.admin.views.main import ChangeList
+from django.contrib.contenttypes.prefetch import GenericPrefetch
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Substr
+from django.http import Http404
+from django.template.response import TemplateResponse
+from django.urls import path
 from django.utils.html import format_html
 from common.admin_site import TenantModelAdmin, hms_admin_site
 from .models import (
@@ -13,6 +25,60 @@ from .models import (
 )
 
 
+# Field type labels resolved once instead of scanning choices per row
+_FIELD_TYPE_LABELS = dict(ClinicalNoteTemplateField.FIELD_TYPE_CHOICES)
+
+# Display values computed during the current changelist render, keyed by
+# field and stored value so rows sharing both reuse the same result
+_field_response_display_cache = ContextVar('field_response_display_cache', default=None)
+
+_OPTION_FIELD_TYPES = {'select', 'radio', 'multiselect', 'checkbox'}
+_UNCACHED_FIELD_TYPES = {'image', 'file', 'json'}
+
+
+# Characters of description shown in changelist previews; one extra
+# character is fetched so truncation can be detected
+DESCRIPTION_PREVIEW_LENGTH = 50
+
+
+def _truncated_description(obj):
+    """Preview of ``obj.description``, using the ``_description_preview`` annotation when present."""
+    description = getattr(obj, '_description_preview', None)
+    if description is None and 'description' not in obj.get_deferred_fields():
+        description = obj.description
+    if description:
+        return description[:DESCRIPTION_PREVIEW_LENGTH] + (
+            '...' if len(description) > DESCRIPTION_PREVIEW_LENGTH else ''
+        )
+    return '-'
+
+
+class DescriptionPreviewChangeList(ChangeList):
+    """
+    Changelist that reads a ``_description_preview`` prefix instead of the
+    full description. Only the changelist narrows the row: the change form
+    renders description, so ModelAdmin.get_queryset() keeps it loaded.
+    """
+
+    def get_queryset(self, request, *args, **kwargs):
+        return super().get_queryset(request, *args, **kwargs).defer('description').annotate(
+            _description_preview=Substr('description', 1, DESCRIPTION_PREVIEW_LENGTH + 1)
+        )
+
+
+def _related_count(model, fk_name):
+    """
+    Correlated COUNT of ``model`` rows pointing at the outer row via ``fk_name``.
+
+    Used instead of annotate(Count(...)) so the outer query is not grouped by
+    every selected column.
+    """
+    counts = model.objects.filter(
+        **{fk_name: OuterRef('pk')}
+    ).order_by().values(fk_name).annotate(c=Count('*')).values('c')
+    return Subquery(counts, output_field=IntegerField())
+
+
 class VisitAdmin(TenantModelAdmin):
     """Admin interface for Visit model."""
 
@@ -40,14 +106,14 @@ class VisitAdmin(TenantModelAdmin):
         'doctor__first_name',
         'doctor__last_name',
     ]
-    readonly_fields = [
+    readonly_fields = (
         'visit_number',
         'entry_time',
         'visit_date',
         'created_at',
         'updated_at',
         'tenant_id',
-    ]
+    )
     autocomplete_fields = ['patient', 'doctor', 'appointment', 'referred_by']
 
     fieldsets = (
@@ -134,7 +200,7 @@ class OPDBillAdmin(TenantModelAdmin):
         'doctor__first_name',
         'doctor__last_name',
     ]
-    readonly_fields = [
+    readonly_fields = (
         'bill_number',
         'bill_date',
         'payable_amount',
@@ -143,7 +209,7 @@ class OPDBillAdmin(TenantModelAdmin):
         'created_at',
         'updated_at',
         'tenant_id',
-    ]
+    )
     autocomplete_fields = ['visit', 'doctor']
 
     fieldsets = (
@@ -230,11 +296,11 @@ class ProcedureMasterAdmin(TenantModelAdmin):
         'name',
         'description',
     ]
-    readonly_fields = [
+    readonly_fields = (
         'created_at',
         'updated_at',
         'tenant_id',
-    ]
+    )
 
     fieldsets = (
         ('Basic Information', {
@@ -293,11 +359,11 @@ class ProcedurePackageAdmin(TenantModelAdmin):
         'code',
         'name',
     ]
-    readonly_fields = [
+    readonly_fields = (
         'created_at',
         'updated_at',
         'tenant_id',
-    ]
+    )
     filter_horizontal = ['procedures']
 
     fieldsets = (
@@ -332,12 +398,16 @@ class ProcedurePackageAdmin(TenantModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        """Annotate savings so the changelist doesn't compute them per row."""
+        return super().get_queryset(request).with_savings()
+
     def savings_display(self, obj):
         """Display savings amount and percentage."""
         return format_html(
             '₹{} ({}%)',
-            obj.savings_amount,
-            round(obj.discount_percent, 2)
+            obj.savings,
+            round(obj.savings_percent, 2)
         )
     savings_display.short_description = 'Savings'
 
@@ -369,12 +439,12 @@ class ClinicalNoteAdmin(TenantModelAdmin):
         'diagnosis',
         'present_complaints',
     ]
-    readonly_fields = [
+    readonly_fields = (
         'note_date',
         'created_at',
         'updated_at',
         'tenant_id',
-    ]
+    )
     autocomplete_fields = ['visit', 'referred_doctor']
 
     fieldsets = (
@@ -450,13 +520,13 @@ class VisitFindingAdmin(TenantModelAdmin):
     search_fields = [
         'visit__visit_number',
     ]
-    readonly_fields = [
+    readonly_fields = (
         'bmi',
         'finding_date',
         'created_at',
         'updated_at',
         'tenant_id',
-    ]
+    )
     autocomplete_fields = ['visit']
 
     fieldsets = (
@@ -548,10 +618,10 @@ class VisitAttachmentAdmin(TenantModelAdmin):
         'file_name',
         'description',
     ]
-    readonly_fields = [
+    readonly_fields = (
         'uploaded_at',
         'tenant_id',
-    ]
+    )
     autocomplete_fields = ['visit']
 
     fieldsets = (
@@ -602,12 +672,12 @@ class ClinicalNoteTemplateGroupAdmin(TenantModelAdmin):
         'name',
         'description',
     ]
-    readonly_fields = [
+    readonly_fields = (
         'created_at',
         'updated_at',
         'tenant_id',
         'template_count',
-    ]
+    )
 
     fieldsets = (
         ('Basic Information', {
@@ -638,13 +708,23 @@ class ClinicalNoteTemplateGroupAdmin(TenantModelAdmin):
 
     def description_short(self, obj):
         """Display truncated description."""
-        if obj.description:
-            return obj.description[:50] + ('...' if len(obj.description) > 50 else '')
-        return '-'
+        return _truncated_description(obj)
     description_short.short_description = 'Description'
 
+    def get_queryset(self, request):
+        """Annotate template counts so the changelist avoids a COUNT per row."""
+        return super().get_queryset(request).annotate(
+            _template_count=_related_count(ClinicalNoteTemplate, 'group')
+        )
+
+    def get_changelist(self, request, **kwargs):
+        """Fetch only the description preview on the changelist."""
+        return DescriptionPreviewChangeList
+
     def template_count(self, obj):
         """Count of templates in this group."""
+        if hasattr(obj, '_template_count'):
+            return obj._template_count or 0
         return obj.templates.count()
     template_count.short_description = 'Templates'
 
@@ -697,11 +777,11 @@ class ClinicalNoteTemplateFieldAdmin(TenantModelAdmin):
         'template__name',
         'template__code',
     ]
-    readonly_fields = [
+    readonly_fields = (
         'created_at',
         'updated_at',
         'tenant_id',
-    ]
+    )
     autocomplete_fields = ['template']
     inlines = [ClinicalNoteTemplateFieldOptionInline]
 
@@ -783,10 +863,24 @@ class ClinicalNoteTemplateFieldInline(admin.TabularInline):
         'display_order',
         'is_active',
     ]
-    readonly_fields = []
+    readonly_fields = ()
     ordering = ['display_order', 'id']
     show_change_link = True
 
+    def get_queryset(self, request):
+        """Load only the columns rendered in the inline rows."""
+        return super().get_queryset(request).only(
+            'id',
+            'tenant_id',
+            'template_id',
+            'field_name',
+            'field_label',
+            'field_type',
+            'is_required',
+            'display_order',
+            'is_active',
+        )
+
 
 class ClinicalNoteTemplateAdmin(TenantModelAdmin):
     """Admin interface for ClinicalNoteTemplate model."""
@@ -812,13 +906,13 @@ class ClinicalNoteTemplateAdmin(TenantModelAdmin):
         'description',
         'group__name',
     ]
-    readonly_fields = [
+    readonly_fields = (
         'created_at',
         'updated_at',
         'tenant_id',
         'field_count',
         'response_count',
-    ]
+    )
     autocomplete_fields = ['group']
     inlines = [ClinicalNoteTemplateFieldInline]
 
@@ -852,13 +946,24 @@ class ClinicalNoteTemplateAdmin(TenantModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        """Annotate field and response counts so the changelist avoids COUNTs per row."""
+        return super().get_queryset(request).select_related('group').annotate(
+            _field_count=_related_count(ClinicalNoteTemplateField, 'template'),
+            _response_count=_related_count(ClinicalNoteTemplateResponse, 'template'),
+        )
+
     def field_count(self, obj):
         """Count of fields in this template."""
+        if hasattr(obj, '_field_count'):
+            return obj._field_count or 0
         return obj.fields.count()
     field_count.short_description = 'Fields'
 
     def response_count(self, obj):
         """Count of responses to this template."""
+        if hasattr(obj, '_response_count'):
+            return obj._response_count or 0
         return obj.responses.count()
     response_count.short_description = 'Responses'
 
@@ -875,6 +980,8 @@ class ClinicalNoteTemplateAdmin(TenantModelAdmin):
 class ClinicalNoteTemplateFieldOptionAdmin(TenantModelAdmin):
     """Admin interface for ClinicalNoteTemplateFieldOption model."""
 
+    list_select_related = ['field__template']
+
     list_display = [
         'option_label',
         'option_value',
@@ -894,10 +1001,10 @@ class ClinicalNoteTemplateFieldOptionAdmin(TenantModelAdmin):
         'field__field_label',
         'field__template__name',
     ]
-    readonly_fields = [
+    readonly_fields = (
         'tenant_id',
         'field_type',
-    ]
+    )
     autocomplete_fields = ['field']
 
     fieldsets = (
@@ -929,7 +1036,8 @@ class ClinicalNoteTemplateFieldOptionAdmin(TenantModelAdmin):
 
     def field_type(self, obj):
         """Display field type."""
-        return obj.field.get_field_type_display()
+        field_type = obj.field.field_type
+        return _FIELD_TYPE_LABELS.get(field_type, field_type)
     field_type.short_description = 'Field Type'
 
     def is_active_badge(self, obj):
@@ -942,35 +1050,55 @@ class ClinicalNoteTemplateFieldOptionAdmin(TenantModelAdmin):
     is_active_badge.short_description = 'Status'
 
 
-class ClinicalNoteTemplateFieldResponseInline(admin.TabularInline):
-    """Inline admin for ClinicalNoteTemplateFieldResponse."""
+class ReadOnlyAdminMixin:
+    """
+    Disable adding and deleting through admin.
 
-    model = ClinicalNoteTemplateFieldResponse
-    extra = 0
-    fields = [
-        'field',
-        'value_display',
-        'updated_at',
-    ]
-    readonly_fields = [
-        'field',
-        'value_display',
-        'updated_at',
-    ]
-    ordering = ['field__display_order']
-    can_delete = False
+    Responses are created by the clinical workflow, so these admins never
+    offer add/delete. With no actions configured the changelist also skips
+    building and permission-filtering the action list on every render.
+    """
 
-    def value_display(self, obj):
-        """Display the field value in a readable format."""
-        return obj.get_display_value() or '-'
-    value_display.short_description = 'Value'
+    actions = None
 
-    def has_add_permission(self, request, obj=None):
-        """Disable adding responses through admin."""
+    def has_add_permission(self, request):
         return False
 
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+class EncounterTypeFilter(admin.SimpleListFilter):
+    """
+    Filter template responses by encounter type.
+
+    The encounter types are fixed, so the choices are listed statically
+    instead of querying the distinct content types on every changelist load.
+    """
 
-class ClinicalNoteTemplateResponseAdmin(TenantModelAdmin):
+    title = 'Encounter Type'
+    parameter_name = 'encounter_type'
+
+    ENCOUNTER_TYPES = {
+        'visit': ('opd', 'visit', 'OPD Visit'),
+        'admission': ('ipd', 'admission', 'IPD Admission'),
+    }
+
+    def lookups(self, request, model_admin):
+        return [(key, label) for key, (_, _, label) in self.ENCOUNTER_TYPES.items()]
+
+    def queryset(self, request, queryset):
+        encounter_type = self.ENCOUNTER_TYPES.get(self.value())
+        if encounter_type is None:
+            return queryset
+        app_label, model, _ = encounter_type
+        return queryset.filter(
+            content_type__app_label=app_label,
+            content_type__model=model
+        )
+
+
+class ClinicalNoteTemplateResponseAdmin(ReadOnlyAdminMixin, TenantModelAdmin):
     """Admin interface for ClinicalNoteTemplateResponse model (Read-Only)."""
 
     list_display = [
@@ -990,7 +1118,7 @@ class ClinicalNoteTemplateResponseAdmin(TenantModelAdmin):
         'response_date',
         'template',
         'response_sequence',
-        'content_type',
+        EncounterTypeFilter,
     ]
     search_fields = [
         'template__name',
@@ -998,7 +1126,7 @@ class ClinicalNoteTemplateResponseAdmin(TenantModelAdmin):
         'filled_by_id',
         'doctor_switched_reason',
     ]
-    readonly_fields = [
+    readonly_fields = (
         'content_type',
         'object_id',
         'encounter_display_admin',
@@ -1018,19 +1146,38 @@ class ClinicalNoteTemplateResponseAdmin(TenantModelAdmin):
         'original_assigned_doctor_id',
         'doctor_switched_reason',
         'canvas_data',
-    ]
+    )
+
+    def get_queryset(self, request):
+        """Prefetch encounters per content type instead of one lookup per row."""
+        from apps.ipd.models import Admission
+
+        return super().get_queryset(request).select_related(
+            'template',
+            'content_type'
+        ).prefetch_related(
+            GenericPrefetch('encounter', [
+                Visit.objects.only('id', 'visit_number'),
+                Admission.objects.only('id', 'admission_id'),
+            ])
+        ).annotate(
+            _field_response_count=_related_count(ClinicalNoteTemplateFieldResponse, 'response')
+        )
 
     def encounter_display_admin(self, obj):
         """Display encounter information in admin."""
-        if obj.encounter:
-            if hasattr(obj.encounter, 'visit_number'):
-                return f"OPD: {obj.encounter.visit_number}"
-            elif hasattr(obj.encounter, 'admission_id'):
-                return f"IPD: {obj.encounter.admission_id}"
+        encounter = obj.encounter
+        if encounter:
+            model = obj.content_type.model
+            if model == 'visit':
+                return f"OPD: {encounter.visit_number}"
+            elif model == 'admission':
+                return f"IPD: {encounter.admission_id}"
         return "No Encounter"
     encounter_display_admin.short_description = 'Encounter'
     autocomplete_fields = []
-    inlines = [ClinicalNoteTemplateFieldResponseInline]
+    change_form_template = 'admin/opd/clinicalnotetemplateresponse/change_form.html'
+    field_responses_per_page = 50
 
     fieldsets = (
         ('Encounter Information', {
@@ -1088,8 +1235,57 @@ class ClinicalNoteTemplateResponseAdmin(TenantModelAdmin):
         }),
     )
 
+    def get_urls(self):
+        """Add the paginated field responses endpoint used by the change form."""
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return [
+            path(
+                '<path:object_id>/field-responses/',
+                self.admin_site.admin_view(self.field_responses_view),
+                name='%s_%s_field_responses' % info,
+            ),
+        ] + super().get_urls()
+
+    def field_responses_view(self, request, object_id):
+        """
+        Render one page of field responses for a response.
+
+        Loaded by the change form after the page renders, so responses with
+        many fields do not block the primary form.
+        """
+        obj = self.get_object(request, unquote(object_id))
+        if obj is None:
+            raise Http404('Clinical note template response not found.')
+        if not self.has_view_permission(request, obj):
+            raise PermissionDenied
+
+        field_responses = obj.field_responses.select_related(
+            'field',
+            'field__template'
+        ).prefetch_related(
+            'selected_options'
+        ).order_by('field__display_order', 'id')
+
+        paginator = Paginator(field_responses, self.field_responses_per_page)
+        page_obj = paginator.get_page(request.GET.get('page'))
+        rows = [
+            {
+                'field': field_response.field,
+                'value': field_response.get_display_value() or '-',
+                'updated_at': field_response.updated_at,
+            }
+            for field_response in page_obj
+        ]
+        return TemplateResponse(
+            request,
+            'admin/opd/clinicalnotetemplateresponse/field_responses.html',
+            {'page_obj': page_obj, 'rows': rows},
+        )
+
     def field_response_count(self, obj):
         """Count of field responses."""
+        if hasattr(obj, '_field_response_count'):
+            return obj._field_response_count or 0
         return obj.field_responses.count()
     field_response_count.short_description = 'Field Responses'
 
@@ -1117,18 +1313,12 @@ class ClinicalNoteTemplateResponseAdmin(TenantModelAdmin):
         )
     is_reviewed_badge.short_description = 'Review Status'
 
-    def has_add_permission(self, request):
-        """Disable adding responses through admin."""
-        return False
-
-    def has_delete_permission(self, request, obj=None):
-        """Disable deleting responses through admin."""
-        return False
-
 
-class ClinicalNoteTemplateFieldResponseAdmin(TenantModelAdmin):
+class ClinicalNoteTemplateFieldResponseAdmin(ReadOnlyAdminMixin, TenantModelAdmin):
     """Admin interface for ClinicalNoteTemplateFieldResponse model (Read-Only)."""
 
+    list_select_related = ['field__template']
+
     list_display = [
         'response',
         'field',
@@ -1147,7 +1337,7 @@ class ClinicalNoteTemplateFieldResponseAdmin(TenantModelAdmin):
         'field__field_name',
         'value_text',
     ]
-    readonly_fields = [
+    readonly_fields = (
         'response',
         'field',
         'field_type',
@@ -1166,7 +1356,7 @@ class ClinicalNoteTemplateFieldResponseAdmin(TenantModelAdmin):
         'created_at',
         'updated_at',
         'tenant_id',
-    ]
+    )
     autocomplete_fields = []
     filter_horizontal = []
 
@@ -1215,22 +1405,61 @@ class ClinicalNoteTemplateFieldResponseAdmin(TenantModelAdmin):
 
     def field_type(self, obj):
         """Display field type."""
-        return obj.field.get_field_type_display()
+        field_type = obj.field.field_type
+        return _FIELD_TYPE_LABELS.get(field_type, field_type)
     field_type.short_description = 'Field Type'
 
+    def get_queryset(self, request):
+        """Prefetch selected options so option values resolve without extra queries."""
+        return super().get_queryset(request).prefetch_related(
+            Prefetch(
+                'selected_options',
+                queryset=ClinicalNoteTemplateFieldOption.objects.only(
+                    'id', 'option_value', 'option_label', 'display_order'
+                )
+            )
+        )
+
+    def changelist_view(self, request, extra_context=None):
+        """Memoize display values for the duration of one changelist render."""
+        token = _field_response_display_cache.set({})
+        try:
+            response = super().changelist_view(request, extra_context)
+            if hasattr(response, 'render'):
+                response.render()
+            return response
+        finally:
+            _field_response_display_cache.reset(token)
+
+    @staticmethod
+    def _display_cache_key(obj):
+        """Build the memo key for a field response, or None if it should not be cached."""
+        field_type = obj.field.field_type
+        if obj.full_canvas_json or field_type in _UNCACHED_FIELD_TYPES:
+            return None
+        if field_type in _OPTION_FIELD_TYPES:
+            return (obj.field_id, tuple(option.pk for option in obj.selected_options.all()))
+        return (
+            obj.field_id,
+            obj.value_text,
+            obj.value_number,
+            obj.value_boolean,
+            obj.value_date,
+            obj.value_datetime,
+            obj.value_time,
+        )
+
     def value_display(self, obj):
         """Display the field value in a readable format."""
-        return obj.get_display_value() or '-'
+        cache = _field_response_display_cache.get()
+        key = self._display_cache_key(obj) if cache is not None else None
+        if key is None:
+            return obj.get_display_value() or '-'
+        if key not in cache:
+            cache[key] = obj.get_display_value() or '-'
+        return cache[key]
     value_display.short_description = 'Value'
 
-    def has_add_permission(self, request):
-        """Disable adding field responses through admin."""
-        return False
-
-    def has_delete_permission(self, request, obj=None):
-        """Disable deleting field responses through admin."""
-        return False
-
 
 # ============================================================================
 # CLINICAL NOTE RESPONSE TEMPLATE ADMIN (Copy-Paste Templates)
@@ -1257,14 +1486,14 @@ class ClinicalNoteResponseTemplateAdmin(TenantModelAdmin):
         'description',
         'created_by_id',
     ]
-    readonly_fields = [
+    readonly_fields = (
         'usage_count',
         'created_by_id',
         'source_response',
         'created_at',
         'updated_at',
         'tenant_id',
-    ]
+    )
 
     fieldsets = (
         ('Template Information', {
@@ -1301,11 +1530,13 @@ class ClinicalNoteResponseTemplateAdmin(TenantModelAdmin):
         }),
     )
 
+    def get_changelist(self, request, **kwargs):
+        """Fetch only the description preview instead of the full text."""
+        return DescriptionPreviewChangeList
+
     def description_short(self, obj):
         """Display truncated description."""
-        if obj.description:
-            return obj.description[:50] + ('...' if len(obj.description) > 50 else '')
-        return '-'
+        return _truncated_description(obj)
     description_short.short_description = 'Description'
 
     def is_active_badge(self, obj):
@@ -1332,20 +1563,25 @@ class ClinicalNoteResponseTemplateAdmin(TenantModelAdmin):
 #     search_fields = ['first_name', 'last_name', 'phone', 'email', 'specialization']
 
 # Register models with custom admin site
-hms_admin_site.register(Visit, VisitAdmin)
-hms_admin_site.register(OPDBill, OPDBillAdmin)
-hms_admin_site.register(ProcedureMaster, ProcedureMasterAdmin)
-hms_admin_site.register(ProcedurePackage, ProcedurePackageAdmin)
-
-hms_admin_site.register(ClinicalNote, ClinicalNoteAdmin)
-hms_admin_site.register(VisitFinding, VisitFindingAdmin)
-hms_admin_site.register(VisitAttachment, VisitAttachmentAdmin)
-
-# Register Clinical Note Template models
-hms_admin_site.register(ClinicalNoteTemplateGroup, ClinicalNoteTemplateGroupAdmin)
-hms_admin_site.register(ClinicalNoteTemplate, ClinicalNoteTemplateAdmin)
-hms_admin_site.register(ClinicalNoteTemplateField, ClinicalNoteTemplateFieldAdmin)
-hms_admin_site.register(ClinicalNoteTemplateFieldOption, ClinicalNoteTemplateFieldOptionAdmin)
-hms_admin_site.register(ClinicalNoteTemplateResponse, ClinicalNoteTemplateResponseAdmin)
-hms_admin_site.register(ClinicalNoteTemplateFieldResponse, ClinicalNoteTemplateFieldResponseAdmin)
-hms_admin_site.register(ClinicalNoteResponseTemplate, ClinicalNoteResponseTemplateAdmin)
+OPD_ADMIN_REGISTRY = {
+    Visit: VisitAdmin,
+    OPDBill: OPDBillAdmin,
+    ProcedureMaster: ProcedureMasterAdmin,
+    ProcedurePackage: ProcedurePackageAdmin,
+
+    ClinicalNote: ClinicalNoteAdmin,
+    VisitFinding: VisitFindingAdmin,
+    VisitAttachment: VisitAttachmentAdmin,
+
+    # Clinical Note Template models
+    ClinicalNoteTemplateGroup: ClinicalNoteTemplateGroupAdmin,
+    ClinicalNoteTemplate: ClinicalNoteTemplateAdmin,
+    ClinicalNoteTemplateField: ClinicalNoteTemplateFieldAdmin,
+    ClinicalNoteTemplateFieldOption: ClinicalNoteTemplateFieldOptionAdmin,
+    ClinicalNoteTemplateResponse: ClinicalNoteTemplateResponseAdmin,
+    ClinicalNoteTemplateFieldResponse: ClinicalNoteTemplateFieldResponseAdmin,
+    ClinicalNoteResponseTemplate: ClinicalNoteResponseTemplateAdmin,
+}
+
+for model, model_admin in OPD_ADMIN_REGISTRY.items():
+    hms_admin_site.register(model, model_admin)
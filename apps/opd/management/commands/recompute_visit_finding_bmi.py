@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill VisitFinding.bmi from weight and height in a single UPDATE. "
+        "Dry-run is the default."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenant-id",
+            default=None,
+            help="Limit the backfill to a single tenant UUID.",
+        )
+        parser.add_argument(
+            "--apply",
+            action="store_true",
+            default=False,
+            help="Write recomputed bmi values.",
+        )
+
+    def handle(self, *args, **options):
+        from apps.opd.models import VisitFinding
+
+        tenant_id = options.get("tenant_id")
+        findings = VisitFinding.objects.all()
+        if tenant_id:
+            findings = findings.filter(tenant_id=tenant_id)
+
+        if not options["apply"]:
+            eligible = findings.filter(weight__gt=0, height__gt=0).count()
+            self.stdout.write(f"Findings with weight and height: {eligible}")
+            self.stdout.write(self.style.WARNING("DRY RUN complete - no rows updated."))
+            return
+
+        updated = VisitFinding.recompute_bmi(findings)
+        self.stdout.write(self.style.SUCCESS(f"Updated findings: {updated}"))
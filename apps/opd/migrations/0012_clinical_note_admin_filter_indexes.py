@@ -0,0 +1,37 @@
+# Composite indexes for the clinical note template admin changelists.
+# TenantModelAdmin always filters by tenant_id first, so each index leads
+# with it and follows with the list_filter/ordering column.
+#
+# Built with CREATE INDEX CONCURRENTLY so writes are not blocked on large
+# tables; this requires a non-atomic migration.
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('opd', '0011_create_service'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='clinicalnotetemplateresponse',
+            index=models.Index(fields=['tenant_id', 'status', 'response_date'], name='cn_response_tenant_status_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='clinicalnotetemplateresponse',
+            index=models.Index(fields=['tenant_id', 'template', 'response_sequence'], name='cn_response_tenant_tmpl_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='clinicalnotetemplatefieldresponse',
+            index=models.Index(fields=['tenant_id', 'updated_at'], name='cn_field_resp_tenant_upd_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='clinicalnotetemplatefield',
+            index=models.Index(fields=['tenant_id', 'field_type'], name='cn_field_tenant_type_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Per-tenant, per-day counters for visit and OPD bill numbers.
+# Counters are created lazily and seeded from existing numbers the first
+# time a tenant issues a number on a given day, so no backfill is needed.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('opd', '0012_clinical_note_admin_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OPDNumberSequence',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('tenant_id', models.UUIDField(help_text='Tenant this counter belongs to')),
+                ('kind', models.CharField(choices=[('visit', 'Visit Number'), ('opd_bill', 'OPD Bill Number')], max_length=20)),
+                ('sequence_date', models.DateField()),
+                ('last_value', models.PositiveIntegerField(default=0, help_text='Last sequence number issued for this tenant/kind/date')),
+            ],
+            options={
+                'verbose_name': 'OPD Number Sequence',
+                'verbose_name_plural': 'OPD Number Sequences',
+                'db_table': 'opd_number_sequences',
+                'constraints': [models.UniqueConstraint(fields=('tenant_id', 'kind', 'sequence_date'), name='unique_opd_number_sequence')],
+            },
+        ),
+    ]
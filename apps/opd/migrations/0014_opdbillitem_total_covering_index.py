@@ -0,0 +1,21 @@
+# Covering index so SUM(total_price) per bill is answered from the index
+# (index-only scan) instead of visiting every item row.
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('opd', '0013_opdnumbersequence'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='opdbillitem',
+            index=models.Index(fields=['bill'], include=['total_price'], name='opd_bill_item_total_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Composite index serving the OPD queue lookup
+# (tenant_id, visit_date, status IN (...), ORDER BY entry_time).
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('opd', '0014_opdbillitem_total_covering_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='visit',
+            index=models.Index(fields=['tenant_id', 'visit_date', 'status', 'entry_time'], name='visit_queue_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Drop indexes that duplicate coverage on Visit, OPDBill, ProcedureMaster
+# and ProcedurePackage. Every query on these tables is tenant-scoped, so the
+# tenant-leading composites (and unique_together on tenant_id) already serve
+# them; the extra single-column indexes only add write amplification.
+#
+# - tenant_id db_index=True and Index(['tenant_id']): prefix of the
+#   (tenant_id, ...) composites.
+# - payment_status / category / is_active single-column indexes: replaced by
+#   the (tenant_id, <column>) composites.
+#
+# The tenant_id db_index duplicates are dropped with DROP INDEX CONCURRENTLY
+# too: a plain AlterField would issue DROP INDEX and lock opd_visits and
+# opd_bills. Their names are the ones Django generated for db_index=True in
+# 0001_initial (<table>_<column>_<digest>); the AlterFields only update
+# migration state.
+
+from django.contrib.postgres.operations import RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+def _drop_tenant_db_index(model_name, table, index_name):
+    return migrations.SeparateDatabaseAndState(
+        database_operations=[
+            migrations.RunSQL(
+                f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"',
+                reverse_sql=f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{index_name}" ON "{table}" ("tenant_id")',
+            ),
+        ],
+        state_operations=[
+            migrations.AlterField(
+                model_name=model_name,
+                name='tenant_id',
+                field=models.UUIDField(help_text='Tenant this record belongs to'),
+            ),
+        ],
+    )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('opd', '0015_visit_queue_idx'),
+    ]
+
+    operations = [
+        RemoveIndexConcurrently(model_name='visit', name='opd_visits_tenant__5bdf40_idx'),
+        RemoveIndexConcurrently(model_name='visit', name='visit_payment_idx'),
+        RemoveIndexConcurrently(model_name='opdbill', name='opd_bills_tenant__846053_idx'),
+        RemoveIndexConcurrently(model_name='opdbill', name='opd_bill_payment_idx'),
+        RemoveIndexConcurrently(model_name='proceduremaster', name='procedure_m_tenant__35f3f8_idx'),
+        RemoveIndexConcurrently(model_name='proceduremaster', name='proc_master_category_idx'),
+        RemoveIndexConcurrently(model_name='proceduremaster', name='proc_master_active_idx'),
+        RemoveIndexConcurrently(model_name='procedurepackage', name='procedure_p_tenant__e51d66_idx'),
+        RemoveIndexConcurrently(model_name='procedurepackage', name='proc_package_active_idx'),
+        _drop_tenant_db_index('visit', 'opd_visits', 'opd_visits_tenant_id_6c89a4e4'),
+        _drop_tenant_db_index('opdbill', 'opd_bills', 'opd_bills_tenant_id_e16bdb24'),
+        _drop_tenant_db_index('proceduremaster', 'procedure_masters', 'procedure_masters_tenant_id_27ccf1bd'),
+        _drop_tenant_db_index('procedurepackage', 'procedure_packages', 'procedure_packages_tenant_id_11a33b6d'),
+    ]
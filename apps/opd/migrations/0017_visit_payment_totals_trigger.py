@@ -0,0 +1,84 @@
+# Keep opd_visits.total_amount / paid_amount / balance_amount / payment_status
+# in sync with opd_bills from a Postgres trigger instead of a Python post_save
+# signal. Every write path (save(), update(), bulk_update(), raw SQL) is now
+# covered.
+#
+# The visit row is locked before its bills are summed. Under READ COMMITTED
+# each statement takes a new snapshot, so once a concurrent payment on the
+# same visit commits and releases the lock, the SUM sees its bill too;
+# summing first would use a snapshot from before the lock wait and write a
+# stale total over the other payment's.
+#
+# The rules mirror Visit._payment_state(): totals are SUM(total_amount) and
+# SUM(received_amount) over the visit's bills.
+
+from django.db import migrations
+
+
+CREATE_SQL = """
+CREATE OR REPLACE FUNCTION opd_refresh_visit_payment_totals(target_visit integer)
+RETURNS void AS $$
+BEGIN
+    PERFORM 1 FROM opd_visits WHERE id = target_visit FOR UPDATE;
+
+    UPDATE opd_visits v
+    SET total_amount = t.total,
+        paid_amount = t.paid,
+        payment_status = CASE
+            WHEN t.paid >= t.total THEN 'paid'
+            WHEN t.paid > 0 THEN 'partial'
+            ELSE 'unpaid'
+        END,
+        balance_amount = CASE
+            WHEN t.paid >= t.total THEN 0
+            WHEN t.paid > 0 THEN t.total - t.paid
+            ELSE t.total
+        END,
+        updated_at = now()
+    FROM (
+        SELECT COALESCE(SUM(total_amount), 0) AS total,
+               COALESCE(SUM(received_amount), 0) AS paid
+        FROM opd_bills
+        WHERE visit_id = target_visit
+    ) t
+    WHERE v.id = target_visit;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION opd_bills_sync_visit_payment_totals()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM opd_refresh_visit_payment_totals(OLD.visit_id);
+    END IF;
+    IF TG_OP = 'INSERT' THEN
+        PERFORM opd_refresh_visit_payment_totals(NEW.visit_id);
+    ELSIF TG_OP = 'UPDATE' AND NEW.visit_id IS DISTINCT FROM OLD.visit_id THEN
+        PERFORM opd_refresh_visit_payment_totals(NEW.visit_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER opd_bills_sync_visit_payment_totals
+AFTER INSERT OR DELETE OR UPDATE OF total_amount, received_amount, visit_id
+ON opd_bills
+FOR EACH ROW EXECUTE FUNCTION opd_bills_sync_visit_payment_totals();
+"""
+
+DROP_SQL = """
+DROP TRIGGER IF EXISTS opd_bills_sync_visit_payment_totals ON opd_bills;
+DROP FUNCTION IF EXISTS opd_bills_sync_visit_payment_totals();
+DROP FUNCTION IF EXISTS opd_refresh_visit_payment_totals(integer);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('opd', '0016_drop_redundant_opd_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_SQL, DROP_SQL),
+    ]
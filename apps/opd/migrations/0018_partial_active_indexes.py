@@ -0,0 +1,52 @@
+# Replace full indexes on low-cardinality status/is_active columns with
+# partial indexes covering only the rows the hot queries read:
+#
+# - Visit: the queue (status IN ('waiting', 'called')) is served by
+#   visit_open_queue_idx; visit_queue_idx and visit_status_date_idx go.
+# - ProcedureMaster / ProcedurePackage: default listings filter
+#   is_active=True per tenant; inactive lookups fall back to the
+#   (tenant_id, code) unique index.
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('opd', '0017_visit_payment_totals_trigger'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='visit',
+            index=models.Index(
+                condition=models.Q(status__in=['waiting', 'called']),
+                fields=['tenant_id', 'visit_date', 'entry_time'],
+                name='visit_open_queue_idx',
+            ),
+        ),
+        RemoveIndexConcurrently(model_name='visit', name='visit_queue_idx'),
+        RemoveIndexConcurrently(model_name='visit', name='visit_status_date_idx'),
+        AddIndexConcurrently(
+            model_name='proceduremaster',
+            index=models.Index(
+                condition=models.Q(is_active=True),
+                fields=['tenant_id', 'category'],
+                name='proc_active_category_idx',
+            ),
+        ),
+        RemoveIndexConcurrently(model_name='proceduremaster', name='procedure_m_tenant__e84f71_idx'),
+        RemoveIndexConcurrently(model_name='proceduremaster', name='procedure_m_tenant__3b23a3_idx'),
+        AddIndexConcurrently(
+            model_name='procedurepackage',
+            index=models.Index(
+                condition=models.Q(is_active=True),
+                fields=['tenant_id', 'name'],
+                name='proc_package_active_name_idx',
+            ),
+        ),
+        RemoveIndexConcurrently(model_name='procedurepackage', name='procedure_p_tenant__549ea1_idx'),
+    ]
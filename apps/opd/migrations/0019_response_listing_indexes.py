@@ -0,0 +1,41 @@
+# Composite indexes matching ClinicalNoteTemplateResponse listings
+# (ordering = ['-response_date']):
+#
+# - resp_visit_tmpl_date_idx serves "responses for this encounter and
+#   template" in response_date order without a sort step, and its
+#   (content_type, object_id) prefix replaces the standalone encounter index.
+# - resp_tenant_date_idx serves the tenant-scoped listing and replaces the
+#   unscoped -response_date index.
+# - The (content_type, object_id, template, response_sequence) index
+#   duplicated the unique_response_per_encounter_template constraint.
+#
+# VisitFinding is already covered by finding_visit_date_idx.
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('opd', '0018_partial_active_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='clinicalnotetemplateresponse',
+            index=models.Index(
+                fields=['content_type', 'object_id', 'template', '-response_date'],
+                name='resp_visit_tmpl_date_idx',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='clinicalnotetemplateresponse',
+            index=models.Index(fields=['tenant_id', '-response_date'], name='resp_tenant_date_idx'),
+        ),
+        RemoveIndexConcurrently(model_name='clinicalnotetemplateresponse', name='clinical_no_content_bdb42b_idx'),
+        RemoveIndexConcurrently(model_name='clinicalnotetemplateresponse', name='clinical_no_respons_d88082_idx'),
+        RemoveIndexConcurrently(model_name='clinicalnotetemplateresponse', name='clinical_no_content_fc411c_idx'),
+    ]
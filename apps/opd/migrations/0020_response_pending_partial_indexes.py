@@ -0,0 +1,36 @@
+# The review queue reads only is_reviewed=False rows, and draft worklists
+# only status='draft' rows. Both are a shrinking minority of
+# clinical_note_template_responses, so partial indexes replace the full
+# btree on is_reviewed.
+
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('opd', '0019_response_listing_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='clinicalnotetemplateresponse',
+            index=models.Index(
+                condition=models.Q(is_reviewed=False),
+                fields=['tenant_id', 'response_date'],
+                name='resp_pending_review_idx',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='clinicalnotetemplateresponse',
+            index=models.Index(
+                condition=models.Q(status='draft'),
+                fields=['tenant_id', 'response_date'],
+                name='resp_draft_idx',
+            ),
+        ),
+        RemoveIndexConcurrently(model_name='clinicalnotetemplateresponse', name='clinical_no_is_revi_f5692b_idx'),
+    ]
@@ -0,0 +1,79 @@
+# Drop single-column tenant_id indexes that a tenant_id-leading composite
+# already covers. Each of these models had both db_index=True on tenant_id
+# and a Meta Index(fields=['tenant_id']), i.e. two identical btrees on top
+# of the composites.
+#
+# ClinicalNoteTemplateFieldOption has no tenant_id-leading composite, so it
+# keeps its Meta index and only loses the db_index duplicate.
+#
+# The db_index duplicates are dropped with DROP INDEX CONCURRENTLY as well:
+# a plain AlterField would issue DROP INDEX and lock each table. Their names
+# are the ones Django generated for db_index=True in 0001_initial
+# (<table>_<column>_<digest>); the AlterFields only update migration state.
+
+from django.contrib.postgres.operations import RemoveIndexConcurrently
+from django.db import migrations, models
+
+
+def _drop_tenant_db_index(model_name, table, index_name, help_text):
+    return migrations.SeparateDatabaseAndState(
+        database_operations=[
+            migrations.RunSQL(
+                f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"',
+                reverse_sql=f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{index_name}" ON "{table}" ("tenant_id")',
+            ),
+        ],
+        state_operations=[
+            migrations.AlterField(
+                model_name=model_name,
+                name='tenant_id',
+                field=models.UUIDField(help_text=help_text),
+            ),
+        ],
+    )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('opd', '0020_response_pending_partial_indexes'),
+    ]
+
+    operations = [
+        RemoveIndexConcurrently(model_name='visitfinding', name='visit_findi_tenant__695aed_idx'),
+        RemoveIndexConcurrently(model_name='visitattachment', name='visit_attac_tenant__ee690a_idx'),
+        RemoveIndexConcurrently(model_name='clinicalnotetemplategroup', name='clinical_no_tenant__6428d8_idx'),
+        RemoveIndexConcurrently(model_name='clinicalnotetemplate', name='clinical_no_tenant__a720e0_idx'),
+        RemoveIndexConcurrently(model_name='clinicalnotetemplatefield', name='clinical_no_tenant__dff161_idx'),
+        RemoveIndexConcurrently(model_name='clinicalnotetemplateresponse', name='clinical_no_tenant__8e7b4a_idx'),
+        _drop_tenant_db_index(
+            'visitfinding', 'visit_findings',
+            'visit_findings_tenant_id_0883cea7', 'Tenant this record belongs to',
+        ),
+        _drop_tenant_db_index(
+            'visitattachment', 'visit_attachments',
+            'visit_attachments_tenant_id_6f3be9ba', 'Tenant this record belongs to',
+        ),
+        _drop_tenant_db_index(
+            'clinicalnotetemplategroup', 'clinical_note_template_groups',
+            'clinical_note_template_groups_tenant_id_90861f4d', 'Tenant identifier for multi-tenancy',
+        ),
+        _drop_tenant_db_index(
+            'clinicalnotetemplate', 'clinical_note_templates',
+            'clinical_note_templates_tenant_id_f95f5ba7', 'Tenant identifier for multi-tenancy',
+        ),
+        _drop_tenant_db_index(
+            'clinicalnotetemplatefield', 'clinical_note_template_fields',
+            'clinical_note_template_fields_tenant_id_21b85ae4', 'Tenant identifier for multi-tenancy',
+        ),
+        _drop_tenant_db_index(
+            'clinicalnotetemplatefieldoption', 'clinical_note_template_field_options',
+            'clinical_note_template_field_options_tenant_id_2198f2d5', 'Tenant identifier for multi-tenancy',
+        ),
+        _drop_tenant_db_index(
+            'clinicalnotetemplateresponse', 'clinical_note_template_responses',
+            'clinical_note_template_responses_tenant_id_95d5337d', 'Tenant identifier for multi-tenancy',
+        ),
+    ]
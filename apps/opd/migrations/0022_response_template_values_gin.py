@@ -0,0 +1,37 @@
+# GIN index on clinical_note_response_templates.template_field_values so
+# "templates containing field X" (has_key / contains) filters don't scan the
+# table. The default jsonb_ops class is used because jsonb_path_ops cannot
+# serve key-existence (?) lookups.
+#
+# The field also switches to DjangoJSONEncoder (no schema change):
+# convert_to_reusable_template stores Decimal/date values from get_value().
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('opd', '0021_drop_redundant_tenant_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='clinicalnoteresponsetemplate',
+            name='template_field_values',
+            field=models.JSONField(
+                default=dict,
+                encoder=DjangoJSONEncoder,
+                help_text='Stores cloned field responses for quick reuse. Format: {field_name: {label, type, value}}',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='clinicalnoteresponsetemplate',
+            index=GinIndex(fields=['template_field_values'], name='cnrt_tfv_gin'),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Display copies of the visit number, patient name and doctor name on
+# opd_bills, so the bill listing reads one table instead of joining
+# visits, patients and doctors for three strings per row.
+#
+# Existing rows are backfilled below. The name formatting mirrors
+# PatientProfile.full_name and DoctorProfile.full_name; new and changed
+# rows are maintained by OPDBill.save() and the patient/doctor signals.
+
+from django.db import migrations, models
+
+
+def _patient_name(patient):
+    if patient.middle_name:
+        return f"{patient.first_name} {patient.middle_name} {patient.last_name}"
+    return f"{patient.first_name} {patient.last_name}"
+
+
+def _doctor_name(doctor):
+    if doctor.first_name and doctor.last_name:
+        return f"{doctor.first_name} {doctor.last_name}"
+    elif doctor.first_name:
+        return doctor.first_name
+    elif doctor.last_name:
+        return doctor.last_name
+    return f"Doctor {doctor.user_id}"
+
+
+def backfill_display_caches(apps, schema_editor):
+    OPDBill = apps.get_model('opd', 'OPDBill')
+
+    bills = OPDBill.objects.select_related('visit__patient', 'doctor').only(
+        'id', 'visit__visit_number',
+        'visit__patient__first_name', 'visit__patient__middle_name', 'visit__patient__last_name',
+        'doctor__first_name', 'doctor__last_name', 'doctor__user_id',
+    )
+    batch = []
+    for bill in bills.iterator(chunk_size=2000):
+        bill.visit_number_cache = bill.visit.visit_number
+        bill.patient_name_cache = _patient_name(bill.visit.patient)
+        bill.doctor_name_cache = _doctor_name(bill.doctor) if bill.doctor_id else None
+        batch.append(bill)
+        if len(batch) == 2000:
+            OPDBill.objects.bulk_update(
+                batch, ['visit_number_cache', 'patient_name_cache', 'doctor_name_cache']
+            )
+            batch = []
+    if batch:
+        OPDBill.objects.bulk_update(
+            batch, ['visit_number_cache', 'patient_name_cache', 'doctor_name_cache']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('opd', '0022_response_template_values_gin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='opdbill',
+            name='visit_number_cache',
+            field=models.CharField(blank=True, default='', editable=False, max_length=50),
+        ),
+        migrations.AddField(
+            model_name='opdbill',
+            name='patient_name_cache',
+            field=models.CharField(blank=True, default='', editable=False, max_length=302),
+        ),
+        migrations.AddField(
+            model_name='opdbill',
+            name='doctor_name_cache',
+            field=models.CharField(blank=True, editable=False, max_length=201, null=True),
+        ),
+        migrations.RunPython(backfill_display_caches, migrations.RunPython.noop),
+    ]
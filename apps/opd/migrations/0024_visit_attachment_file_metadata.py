@@ -0,0 +1,52 @@
+# Size and extension columns on visit_attachments, so attachment listings
+# read both from the row instead of asking the storage backend per file.
+#
+# Existing extensions are backfilled below from the stored file name,
+# mirroring VisitAttachment._extension_for(). Sizes are left null rather
+# than stat-ing every stored file during the migration; get_file_size()
+# falls back to storage for those rows and the next save() records them.
+
+from django.db import migrations, models
+
+
+def _extension_for(name):
+    name = name.rpartition('/')[2].lstrip('.')
+    dot = name.rfind('.')
+    return name[dot:].lower() if dot != -1 else ''
+
+
+def backfill_file_extensions(apps, schema_editor):
+    VisitAttachment = apps.get_model('opd', 'VisitAttachment')
+
+    batch = []
+    for attachment in VisitAttachment.objects.only('id', 'file').iterator(chunk_size=2000):
+        if not attachment.file:
+            continue
+        attachment.file_extension = _extension_for(attachment.file.name)
+        batch.append(attachment)
+        if len(batch) == 2000:
+            VisitAttachment.objects.bulk_update(batch, ['file_extension'])
+            batch = []
+    if batch:
+        VisitAttachment.objects.bulk_update(batch, ['file_extension'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('opd', '0023_opd_bill_display_caches'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='visitattachment',
+            name='file_size_bytes',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='visitattachment',
+            name='file_extension',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_file_extensions, migrations.RunPython.noop),
+    ]
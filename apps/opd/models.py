@@ -3,13 +3,242 @@ from django.db import models, transaction, IntegrityError
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.indexes import GinIndex
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
+from datetime import date, datetime, timedelta
 from decimal import Decimal
-import os
+from functools import lru_cache
+from operator import attrgetter
+
+from common.money import CENT, HUNDRED, ZERO_AMOUNT
+from common.serializers import is_unique_violation
 
 User = get_user_model()
 
+# Binary size units for VisitAttachment.get_file_size(), indexed by log2(size) // 10
+_FILE_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+
+@lru_cache(maxsize=2)
+def _date_str(ordinal):
+    """YYYYMMDD for a date ordinal; memoised since every number shares today's."""
+    return date.fromordinal(ordinal).strftime('%Y%m%d')
+
+
+def _max_issued_sequence(numbers):
+    """Highest trailing ``/###`` sequence among ``numbers`` (0 if none parse)."""
+    highest = 0
+    for number in numbers:
+        try:
+            # Extract numeric part: OPD/20260511/001 → 001 → 1
+            highest = max(highest, int(number.split('/')[-1]))
+        except (ValueError, IndexError, AttributeError):
+            continue
+    return highest
+
+
+class OPDNumberSequence(models.Model):
+    """
+    OPD Number Sequence Model - Per-tenant, per-day counters.
+
+    Backs visit and bill numbers so each new number costs a single
+    UPDATE ... RETURNING on one counter row, instead of scanning (and
+    locking) every visit/bill issued for the tenant that day.
+    """
+
+    KIND_VISIT = 'visit'
+    KIND_OPD_BILL = 'opd_bill'
+
+    KIND_CHOICES = [
+        (KIND_VISIT, 'Visit Number'),
+        (KIND_OPD_BILL, 'OPD Bill Number'),
+    ]
+
+    id = models.AutoField(primary_key=True)
+    tenant_id = models.UUIDField(help_text="Tenant this counter belongs to")
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    sequence_date = models.DateField()
+    last_value = models.PositiveIntegerField(
+        default=0,
+        help_text="Last sequence number issued for this tenant/kind/date"
+    )
+
+    class Meta:
+        db_table = 'opd_number_sequences'
+        verbose_name = 'OPD Number Sequence'
+        verbose_name_plural = 'OPD Number Sequences'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['tenant_id', 'kind', 'sequence_date'],
+                name='unique_opd_number_sequence'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.sequence_date}: {self.last_value}"
+
+    @classmethod
+    def next_value(cls, tenant_id, kind, sequence_date, seed, resync=False):
+        """
+        Atomically issue the next sequence number.
+
+        Args:
+            tenant_id: Tenant UUID
+            kind: One of KIND_CHOICES
+            sequence_date: Day the number belongs to
+            seed: Callable returning the highest sequence already issued for
+                this tenant/kind/date. Only called when the counter row does
+                not exist yet, or when ``resync`` is set.
+            resync: Re-align the counter with existing rows first (used after
+                a number collided with one issued outside the counter).
+
+        Returns:
+            int: The issued sequence number
+        """
+        from django.db import connection
+
+        table = cls._meta.db_table
+        params = [str(tenant_id), kind, sequence_date]
+
+        with connection.cursor() as cursor:
+            if not resync:
+                cursor.execute(
+                    f"""
+                    UPDATE {table} SET last_value = last_value + 1
+                    WHERE tenant_id = %s AND kind = %s AND sequence_date = %s
+                    RETURNING last_value
+                    """,
+                    params
+                )
+                row = cursor.fetchone()
+                if row is not None:
+                    return row[0]
+
+            # First number of the day (or resync): seed from existing rows.
+            # ON CONFLICT covers a concurrent first insert for the same key.
+            cursor.execute(
+                f"""
+                INSERT INTO {table} (tenant_id, kind, sequence_date, last_value)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (tenant_id, kind, sequence_date) DO UPDATE
+                SET last_value = GREATEST({table}.last_value, EXCLUDED.last_value - 1) + 1
+                RETURNING last_value
+                """,
+                params + [seed() + 1]
+            )
+            return cursor.fetchone()[0]
+
+
+class VisitQuerySet(models.QuerySet):
+    """QuerySet helpers for OPD visits."""
+
+    QUEUE_STATUSES = ['waiting', 'called']
+
+    def with_related(self):
+        """Join the foreign keys every visit serializer renders."""
+        return self.select_related('patient', 'doctor', 'appointment', 'referred_by')
+
+    # Columns VisitListSerializer renders, including what Patient.full_name
+    # and DoctorProfile.full_name read (waiting_time is annotated)
+    LIST_FIELDS = (
+        'id', 'visit_number', 'visit_date', 'visit_type', 'priority', 'status',
+        'queue_position', 'payment_status', 'total_amount', 'paid_amount', 'balance_amount',
+        'entry_time', 'is_follow_up',
+        'follow_up_required', 'follow_up_date', 'follow_up_notes',
+        'patient', 'patient__patient_id', 'patient__first_name', 'patient__middle_name',
+        'patient__last_name', 'patient__photo_data', 'patient__mobile_primary',
+        'patient__age', 'patient__gender',
+        'doctor', 'doctor__first_name', 'doctor__last_name', 'doctor__user_id',
+    )
+
+    def for_listing(self):
+        """
+        Rows for VisitListSerializer: only the patient/doctor joins it reads,
+        narrowed to LIST_FIELDS so clinical text and the rest of the patient
+        record stay in the database.
+        """
+        return self.select_related(None).select_related('patient', 'doctor').only(
+            *self.LIST_FIELDS
+        ).with_waiting_time()
+
+    def with_waiting_time(self):
+        """
+        Annotate ``waiting_time``: whole minutes from entry to consultation
+        start, as Visit.calculate_waiting_time() returns, or NULL until the
+        consultation starts.
+        """
+        from django.db.models.functions import Cast, Extract, Floor
+
+        waited = models.ExpressionWrapper(
+            models.F('consultation_start_time') - models.F('entry_time'),
+            output_field=models.DurationField()
+        )
+        return self.annotate(
+            waiting_time=Cast(Floor(Extract(waited, 'epoch') / 60), models.IntegerField())
+        )
+
+    def with_record_flags(self):
+        """
+        Annotate ``has_opd_bill`` and ``has_clinical_note`` as EXISTS
+        subqueries, so the flags come from the visit row itself rather than
+        from a bill/note lookup per visit.
+        """
+        return self.annotate(
+            has_opd_bill=models.Exists(OPDBill.objects.filter(visit=models.OuterRef('pk'))),
+            has_clinical_note=models.Exists(ClinicalNote.objects.filter(visit=models.OuterRef('pk')))
+        )
+
+    # Patient/doctor columns VisitDetailSerializer's nested details and
+    # names read; the visit row and appointment/referrer load in full
+    DETAIL_RELATED_FIELDS = (
+        'patient__patient_id', 'patient__first_name', 'patient__middle_name',
+        'patient__last_name', 'patient__age', 'patient__gender',
+        'patient__blood_group', 'patient__mobile_primary',
+        'doctor__first_name', 'doctor__last_name', 'doctor__user_id',
+        'doctor__consultation_fee', 'doctor__follow_up_fee',
+        'appointment', 'referred_by',
+    )
+
+    def with_full_detail(self):
+        """
+        with_related() plus what VisitDetailSerializer reads (bill/note
+        flags, findings, attachments, doctor specialties), so a detail render
+        costs a fixed number of queries.
+        """
+        from apps.doctors.models import Specialty
+
+        visit_fields = [field.name for field in self.model._meta.concrete_fields]
+        return self.with_related().only(
+            *visit_fields, *self.DETAIL_RELATED_FIELDS
+        ).with_record_flags().prefetch_related(
+            # get_doctor_details renders specialty names only
+            models.Prefetch('doctor__specialties', queryset=Specialty.objects.only('id', 'name')),
+            'findings',
+            'attachments',
+        )
+
+    def queue_positions(self, tenant_id, visit_date):
+        """
+        Queued visits for a tenant/day annotated with ``queue_pos``.
+
+        Positions come from a single ROW_NUMBER() over entry_time, so a
+        waiting-room refresh costs one query instead of one COUNT per visit.
+        """
+        from django.db.models.functions import RowNumber
+
+        return self.filter(
+            tenant_id=tenant_id,
+            visit_date=visit_date,
+            status__in=self.QUEUE_STATUSES,
+        ).annotate(
+            queue_pos=models.Window(
+                expression=RowNumber(),
+                order_by=models.F('entry_time').asc()
+            )
+        ).order_by('entry_time')
+
 
 class Visit(models.Model):
     """
@@ -33,6 +262,10 @@ class Visit(models.Model):
         ('urgent', 'Urgent'),
     ]
 
+    # Status/payment enums stay as their string codes: they are the API,
+    # filter and stats contract, and the IPD/diagnostics apps compare them
+    # directly. Short varchar keys cost only a few bytes more per index
+    # entry than smallint, so index size is handled via index shape instead.
     STATUS_CHOICES = [
         ('waiting', 'Waiting'),
         ('called', 'Called'),
@@ -50,7 +283,7 @@ class Visit(models.Model):
 
     # Primary Fields
     id = models.AutoField(primary_key=True)
-    tenant_id = models.UUIDField(db_index=True, help_text="Tenant this record belongs to")
+    tenant_id = models.UUIDField(help_text="Tenant this record belongs to")
     visit_number = models.CharField(
         max_length=50,
         help_text="Unique visit identifier (e.g., OPD/20231223/001)"
@@ -97,6 +330,8 @@ class Visit(models.Model):
     created_by_id = models.UUIDField(null=True, blank=True, help_text="User who created the visit")
 
     # Visit Information
+    # visit_date is the (editable) date the visit is booked for, not a copy of
+    # entry_time's date; it keys visit numbers and the day's queue.
     visit_date = models.DateField(default=timezone.now)
     visit_type = models.CharField(
         max_length=20,
@@ -189,21 +424,27 @@ class Visit(models.Model):
         related_query_name='visit'
     )
 
+    objects = VisitQuerySet.as_manager()
+
     class Meta:
         db_table = 'opd_visits'
         ordering = ['-visit_date', '-entry_time']
         verbose_name = 'OPD Visit'
         verbose_name_plural = 'OPD Visits'
         unique_together = [['tenant_id', 'visit_number']]
+        # tenant_id is served by the tenant-leading composites below
         indexes = [
-            models.Index(fields=['tenant_id']),
             models.Index(fields=['tenant_id', 'visit_date']),
             models.Index(fields=['tenant_id', 'status']),
             models.Index(fields=['visit_number'], name='visit_number_idx'),
             models.Index(fields=['patient', 'visit_date'], name='visit_patient_date_idx'),
             models.Index(fields=['doctor', 'visit_date'], name='visit_doctor_date_idx'),
-            models.Index(fields=['status', 'visit_date'], name='visit_status_date_idx'),
-            models.Index(fields=['payment_status'], name='visit_payment_idx'),
+            # Only queued visits: the hot queue predicate is status IN QUEUE_STATUSES
+            models.Index(
+                fields=['tenant_id', 'visit_date', 'entry_time'],
+                condition=models.Q(status__in=VisitQuerySet.QUEUE_STATUSES),
+                name='visit_open_queue_idx'
+            ),
         ]
 
     def __str__(self):
@@ -216,16 +457,12 @@ class Visit(models.Model):
             for attempt in range(max_retries):
                 try:
                     with transaction.atomic():
-                        # Lock any existing records for this tenant/date to prevent race conditions
-                        Visit.objects.select_for_update().filter(
-                            tenant_id=self.tenant_id,
-                            visit_date=self.visit_date
-                        ).exists()
-
-                        # Generate visit number with guaranteed isolation
+                        # The counter row lock serialises concurrent visits for
+                        # this tenant/date until the transaction commits
                         self.visit_number = self.generate_visit_number_for_tenant(
                             self.tenant_id,
-                            self.visit_date
+                            self.visit_date,
+                            resync=attempt > 0
                         )
                         super().save(*args, **kwargs)
                     return
@@ -240,42 +477,39 @@ class Visit(models.Model):
             super().save(*args, **kwargs)
 
     @staticmethod
-    def generate_visit_number_for_tenant(tenant_id, visit_date):
+    def generate_visit_number_for_tenant(tenant_id, visit_date, resync=False):
         """Generate unique visit number per tenant: OPD/YYYYMMDD/###
 
-        Fetches all matching visit_numbers and sorts in Python to ensure
-        correct numeric sequence regardless of database or string sorting issues.
+        The sequence comes from OPDNumberSequence. Existing visit numbers are
+        only scanned to seed the day's counter (or on ``resync``), sorting in
+        Python so numeric order is correct (001 < 010 < 100).
         """
-        from datetime import date
         from django.db import connection
 
         visit_date_obj = visit_date if isinstance(visit_date, date) else visit_date.date()
-        date_str = visit_date_obj.strftime('%Y%m%d')
+        date_str = _date_str(visit_date_obj.toordinal())
         visit_prefix = f"OPD/{date_str}/"
 
-        # Query without ORDER BY to avoid string-based sorting issues
-        # Sort in Python to ensure numeric ordering (001 < 010 < 100)
-        with connection.cursor() as cursor:
-            cursor.execute(
-                """
-                SELECT visit_number FROM opd_visits
-                WHERE tenant_id = %s AND visit_date = %s
-                AND visit_number LIKE %s
-                """,
-                [str(tenant_id), visit_date_obj, f"{visit_prefix}%"]
-            )
-            results = cursor.fetchall()
-
-        today_count = 1
-        for row in results:
-            try:
-                # Extract numeric part: OPD/20260511/001 → 001 → 1
-                sequence = int(row[0].split('/')[-1])
-                today_count = max(today_count, sequence + 1)
-            except (ValueError, IndexError):
-                continue
-
-        return f"{visit_prefix}{today_count:03d}"
+        def issued_sequence():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT visit_number FROM opd_visits
+                    WHERE tenant_id = %s AND visit_date = %s
+                    AND visit_number LIKE %s
+                    """,
+                    [str(tenant_id), visit_date_obj, f"{visit_prefix}%"]
+                )
+                return _max_issued_sequence(row[0] for row in cursor.fetchall())
+
+        sequence = OPDNumberSequence.next_value(
+            tenant_id,
+            OPDNumberSequence.KIND_VISIT,
+            visit_date_obj,
+            seed=issued_sequence,
+            resync=resync
+        )
+        return f"{visit_prefix}{sequence:03d}"
 
     @staticmethod
     def generate_visit_number():
@@ -296,28 +530,63 @@ class Visit(models.Model):
         return None
 
     def get_queue_position(self):
-        """Calculate current position in queue."""
-        if self.status not in ['waiting', 'called']:
+        """
+        Calculate current position in queue.
+
+        For a whole queue use Visit.objects.queue_positions(), which computes
+        every position in one query.
+        """
+        if self.status not in VisitQuerySet.QUEUE_STATUSES:
             return None
 
         return Visit.objects.filter(
+            tenant_id=self.tenant_id,
             visit_date=self.visit_date,
-            status__in=['waiting', 'called'],
+            status__in=VisitQuerySet.QUEUE_STATUSES,
             entry_time__lt=self.entry_time
         ).count() + 1
 
+    @staticmethod
+    def _payment_state(total_amount, paid_amount):
+        """
+        Return (payment_status, balance_amount) for the given amounts.
+
+        Mirrors opd_refresh_visit_payment_totals(), the trigger function that
+        keeps these columns in sync with opd_bills.
+        """
+        if paid_amount >= total_amount:
+            return 'paid', ZERO_AMOUNT
+        if paid_amount > ZERO_AMOUNT:
+            return 'partial', total_amount - paid_amount
+        return 'unpaid', total_amount
+
     def update_payment_status(self):
         """Update payment status based on amounts."""
-        if self.paid_amount >= self.total_amount:
-            self.payment_status = 'paid'
-            self.balance_amount = Decimal('0.00')
-        elif self.paid_amount > Decimal('0.00'):
-            self.payment_status = 'partial'
-            self.balance_amount = self.total_amount - self.paid_amount
-        else:
-            self.payment_status = 'unpaid'
-            self.balance_amount = self.total_amount
-        self.save()
+        self.payment_status, self.balance_amount = self._payment_state(
+            self.total_amount, self.paid_amount
+        )
+        # Callers refresh total/paid amounts from bill aggregates before calling this
+        self.save(update_fields=[
+            'total_amount', 'paid_amount', 'payment_status', 'balance_amount', 'updated_at'
+        ])
+
+
+class OPDBillQuerySet(models.QuerySet):
+    """QuerySet helpers for OPD bills."""
+
+    # Columns OPDBillListSerializer renders (items are prefetched separately)
+    LIST_FIELDS = (
+        'id', 'bill_number', 'bill_date', 'opd_type', 'charge_type',
+        'total_amount', 'payable_amount', 'received_amount', 'balance_amount', 'payment_status',
+        'visit', 'doctor', 'visit_number_cache', 'patient_name_cache', 'doctor_name_cache',
+    )
+
+    def for_listing(self):
+        """
+        Rows for OPDBillListSerializer, narrowed to LIST_FIELDS. Names come
+        from the bill's display caches, so no joins are needed.
+        """
+        return self.select_related(None).only(*self.LIST_FIELDS)
 
 
 class OPDBill(models.Model):
@@ -358,7 +627,7 @@ class OPDBill(models.Model):
 
     # Primary Fields
     id = models.AutoField(primary_key=True)
-    tenant_id = models.UUIDField(db_index=True, help_text="Tenant this record belongs to")
+    tenant_id = models.UUIDField(help_text="Tenant this record belongs to")
     visit = models.ForeignKey(
         Visit,
         on_delete=models.CASCADE,
@@ -460,29 +729,72 @@ class OPDBill(models.Model):
     # Audit Fields
     billed_by_id = models.UUIDField(null=True, blank=True, help_text="User who created this bill")
 
+    # Display copies for list views, so listings need no visit/patient/doctor
+    # joins. Set by save() and refreshed by the patient/doctor signals.
+    # Lengths fit the longest full_name the source name fields can produce.
+    visit_number_cache = models.CharField(max_length=50, blank=True, default='', editable=False)
+    patient_name_cache = models.CharField(max_length=302, blank=True, default='', editable=False)
+    doctor_name_cache = models.CharField(max_length=201, blank=True, null=True, editable=False)
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = OPDBillQuerySet.as_manager()
+
     class Meta:
         db_table = 'opd_bills'
         ordering = ['-bill_date']
         verbose_name = 'OPD Bill'
         verbose_name_plural = 'OPD Bills'
         unique_together = [['tenant_id', 'bill_number']]
+        # tenant_id is served by the tenant-leading composites below
         indexes = [
-            models.Index(fields=['tenant_id']),
             models.Index(fields=['tenant_id', 'bill_date']),
             models.Index(fields=['tenant_id', 'payment_status']),
             models.Index(fields=['bill_number'], name='opd_bill_number_idx'),
             models.Index(fields=['visit'], name='opd_bill_visit_idx'),
             models.Index(fields=['doctor', 'bill_date'], name='opd_bill_doctor_date_idx'),
-            models.Index(fields=['payment_status'], name='opd_bill_payment_idx'),
         ]
 
+    # Fields recomputed from items by _calculate_derived_totals()
+    DERIVED_TOTAL_FIELDS = ['total_amount', 'discount_amount', 'payable_amount', 'balance_amount', 'payment_status']
+    # A normal save() only recalculates when one of these changed since load:
+    # the derived totals themselves or the fields they depend on. Item changes
+    # recalculate through the OPDBillItem signal instead.
+    TOTALS_INPUT_FIELDS = ['discount_percent', 'received_amount', *DERIVED_TOTAL_FIELDS]
+    DISPLAY_CACHE_FIELDS = ['visit_number_cache', 'patient_name_cache', 'doctor_name_cache']
+
     def __str__(self):
         return self.bill_number
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_totals_inputs = instance._totals_inputs()
+        instance._loaded_display_keys = instance._display_keys()
+        return instance
+
+    def _display_keys(self):
+        """The foreign keys the display caches are copied from."""
+        return self.__dict__.get('visit_id'), self.__dict__.get('doctor_id')
+
+    def _refresh_display_caches(self):
+        """Copy visit number, patient name and doctor name onto the bill."""
+        self.visit_number_cache = self.visit.visit_number
+        self.patient_name_cache = self.visit.patient.full_name
+        self.doctor_name_cache = self.doctor.full_name if self.doctor_id else None
+
+    def _totals_inputs(self):
+        """Current TOTALS_INPUT_FIELDS values, or None if any are deferred."""
+        if any(name not in self.__dict__ for name in self.TOTALS_INPUT_FIELDS):
+            return None
+        return tuple(self.__dict__[name] for name in self.TOTALS_INPUT_FIELDS)
+
+    def _totals_inputs_changed(self):
+        loaded = getattr(self, '_loaded_totals_inputs', None)
+        return loaded is None or loaded != self._totals_inputs()
+
     def save(self, *args, **kwargs):
         """
         Save OPDBill with safeguards against duplicate bill numbers (race conditions).
@@ -490,30 +802,31 @@ class OPDBill(models.Model):
         max_retries = 10
         last_exception = None
 
-        for _ in range(max_retries):
+        for attempt in range(max_retries):
             save_kwargs = kwargs.copy()
             try:
                 with transaction.atomic():
                     is_new_instance = self.pk is None
 
                     if not self.bill_number:
-                        self.bill_number = self.generate_bill_number(self.tenant_id)
+                        self.bill_number = self.generate_bill_number(
+                            self.tenant_id,
+                            resync=attempt > 0
+                        )
 
                     # Check if this is a signal-triggered save (has explicit update_fields)
                     is_signal_save = 'update_fields' in save_kwargs
 
-                    if is_new_instance:
-                        # For NEW instances: save all fields first to get PK
-                        super().save(*args, **save_kwargs)
-                        # Clear kwargs to prevent double-saving issues
-                        save_kwargs.pop('force_insert', None)
-                        save_kwargs.pop('force_update', None)
-                        save_kwargs.pop('using', None)
-                        save_kwargs.pop('update_fields', None)
+                    if getattr(self, '_loaded_display_keys', None) != self._display_keys():
+                        self._refresh_display_caches()
+                        if is_signal_save:
+                            save_kwargs['update_fields'] = [*save_kwargs['update_fields'], *self.DISPLAY_CACHE_FIELDS]
 
-                        # Then calculate and save derived fields
-                        self._calculate_derived_totals()
-                        save_kwargs['update_fields'] = ['total_amount', 'discount_amount', 'payable_amount', 'balance_amount', 'payment_status']
+                    if is_new_instance:
+                        # For NEW instances: no items can reference the bill
+                        # yet, so the derived totals are known up front and
+                        # the row is written by a single INSERT
+                        self._calculate_derived_totals(items_total=ZERO_AMOUNT)
                         super().save(*args, **save_kwargs)
 
                     elif is_signal_save:
@@ -526,16 +839,21 @@ class OPDBill(models.Model):
                         # This ensures fields like received_amount, payment_mode, etc. are saved
                         super().save(*args, **save_kwargs)
 
-                        # Then recalculate derived fields and save them
-                        self._calculate_derived_totals()
-                        save_kwargs['update_fields'] = ['total_amount', 'discount_amount', 'payable_amount', 'balance_amount', 'payment_status']
-                        super().save(*args, **save_kwargs)
+                        # Then recalculate derived fields and save them, unless
+                        # only unrelated fields (remarks, diagnosis, ...) changed
+                        if self._totals_inputs_changed():
+                            self._calculate_derived_totals()
+                            save_kwargs['update_fields'] = self.DERIVED_TOTAL_FIELDS
+                            super().save(*args, **save_kwargs)
 
+                self._loaded_totals_inputs = self._totals_inputs()
+                self._loaded_display_keys = self._display_keys()
                 return
             except IntegrityError as exc:
                 last_exception = exc
-                # Retry if the bill_number collided due to a concurrent create
-                if 'bill_number' in str(exc):
+                # Retry only if the bill_number collided due to a concurrent
+                # create; NOT NULL and other constraint errors are raised
+                if is_unique_violation(exc, (type(self), ['tenant_id', 'bill_number'])):
                     self.bill_number = None
                     continue
                 raise
@@ -545,64 +863,63 @@ class OPDBill(models.Model):
             raise last_exception
 
     @staticmethod
-    def generate_bill_number(tenant_id):
+    def generate_bill_number(tenant_id, resync=False):
         """Generate unique bill number per tenant: OPD-BILL/YYYYMMDD/###
 
-        Uses select_for_update() to serialise concurrent bill creation for
-        the same tenant+date, eliminating the race condition that caused
-        duplicate key violations.  Must be called inside a transaction.atomic()
-        block (which save() already provides).
-
-        Uses Django ORM (not a raw cursor) so Django's connection management
-        calls ensure_connection() automatically — preventing InterfaceError
-        when the underlying psycopg2 connection has been dropped.
+        The sequence comes from OPDNumberSequence, whose row lock serialises
+        concurrent bill creation for the same tenant+date until the caller's
+        transaction commits (save() already provides one). Existing bill
+        numbers are only scanned to seed the day's counter, or on ``resync``.
         """
-        from datetime import date
-
         today = date.today()
-        date_str = today.strftime('%Y%m%d')
+        date_str = _date_str(today.toordinal())
         bill_prefix = f"OPD-BILL/{date_str}/"
 
-        # select_for_update() acquires row-level locks on every matching row —
-        # same semantics as the old "SELECT ... FOR UPDATE" raw query.
-        existing_numbers = (
-            OPDBill.objects
-            .filter(
-                tenant_id=tenant_id,
-                bill_date__date=today,
-                bill_number__startswith=bill_prefix,
+        def issued_sequence():
+            # Half-open range instead of bill_date__date so the
+            # (tenant_id, bill_date) index can serve the scan
+            day_start = timezone.make_aware(datetime.combine(today, datetime.min.time()))
+            return _max_issued_sequence(
+                OPDBill.objects.filter(
+                    tenant_id=tenant_id,
+                    bill_date__gte=day_start,
+                    bill_date__lt=day_start + timedelta(days=1),
+                    bill_number__startswith=bill_prefix,
+                ).values_list('bill_number', flat=True)
             )
-            .order_by('bill_number')
-            .select_for_update()
-            .values_list('bill_number', flat=True)
-        )
-
-        today_count = 1
-        for bill_number in existing_numbers:
-            try:
-                sequence = int(bill_number.split('/')[-1])
-                today_count = max(today_count, sequence + 1)
-            except (ValueError, IndexError):
-                continue
 
-        return f"{bill_prefix}{today_count:03d}"
+        sequence = OPDNumberSequence.next_value(
+            tenant_id,
+            OPDNumberSequence.KIND_OPD_BILL,
+            today,
+            seed=issued_sequence,
+            resync=resync
+        )
+        return f"{bill_prefix}{sequence:03d}"
 
-    def _calculate_derived_totals(self):
+    def _calculate_derived_totals(self, items_total=None):
         """
         Calculate total amounts from items, apply discount, and update status.
-        This method assumes self.pk is available.
+        This method assumes self.pk is available unless ``items_total`` is given.
+
+        ``items_total`` may be passed by callers that already aggregated the
+        items (e.g. bulk_record_payments) to skip the per-bill SUM query.
         """
         # Calculate total ONLY from actual bill items (no automatic fees)
-        items_total = sum(item.total_price for item in self.items.all())
+        if items_total is None:
+            items_total = self.items.aggregate(
+                total=models.Sum('total_price')
+            )['total']
+        items_total = items_total or ZERO_AMOUNT
 
         self.total_amount = items_total
 
         # Calculate payable amount
         if self.discount_percent > 0:
-            self.discount_amount = (self.total_amount * self.discount_percent / Decimal('100.00')).quantize(Decimal('0.01'))
+            self.discount_amount = (self.total_amount * self.discount_percent / HUNDRED).quantize(CENT)
 
         if self.discount_amount is None:
-            self.discount_amount = Decimal('0.00')
+            self.discount_amount = ZERO_AMOUNT
 
         self.payable_amount = self.total_amount - self.discount_amount
 
@@ -612,21 +929,151 @@ class OPDBill(models.Model):
         # Update payment status
         if self.received_amount >= self.payable_amount:
             self.payment_status = 'paid'
-            self.balance_amount = Decimal('0.00')
-        elif self.received_amount > Decimal('0.00') and self.received_amount > 0:
+            self.balance_amount = ZERO_AMOUNT
+        elif self.received_amount > ZERO_AMOUNT:
             self.payment_status = 'partial'
         else:
             self.payment_status = 'unpaid'
 
     def record_payment(self, amount, mode='cash', details=None):
-        """Record a payment for this bill."""
-        self.received_amount += Decimal(str(amount))
-        self.payment_mode = mode
+        """
+        Record a payment for this bill.
+
+        received_amount is incremented in the database, so two terminals paying
+        the same bill can't overwrite each other's payment. The UPDATE's row
+        lock is held until commit, so the derived totals computed from the
+        refreshed amount are consistent without a separate SELECT FOR UPDATE.
+        """
+        # Only round-trip through str() for non-Decimals (floats would be inexact)
+        amount = amount if isinstance(amount, Decimal) else Decimal(str(amount))
 
+        update_fields = ['payment_mode', *self.DERIVED_TOTAL_FIELDS, 'updated_at']
+
+        merged_details = None
         if details:
-            self.payment_details = details
+            # Merge the new keys in the database (jsonb ||) instead of
+            # re-serialising the whole blob on every payment
+            merged_details = {**(self.payment_details or {}), **details}
+            self.payment_details = models.Func(
+                models.F('payment_details'),
+                models.Value(details, output_field=models.JSONField()),
+                template='%(expressions)s',
+                arg_joiner=' || ',
+                output_field=models.JSONField(),
+            )
+            update_fields.append('payment_details')
 
-        self.save()
+        with transaction.atomic():
+            type(self).objects.filter(pk=self.pk).update(
+                received_amount=models.F('received_amount') + amount
+            )
+            self.refresh_from_db(fields=['received_amount'])
+            self.payment_mode = mode
+
+            # save() recalculates the derived totals before writing update_fields
+            self.save(update_fields=update_fields)
+
+        if merged_details is not None:
+            self.payment_details = merged_details
+
+    @classmethod
+    def bulk_record_payments(cls, tenant_id, payments, batch_size=1000):
+        """
+        Record many payments at once, e.g. for end-of-day reconciliation.
+
+        ``payments`` is an iterable of ``(bill_id, amount, mode)`` tuples for
+        bills of ``tenant_id``; a bill may appear more than once. Bills are
+        locked and loaded with their item totals in one query and written
+        back with a single bulk_update, instead of the SELECT + UPDATE that
+        record_payment() costs per bill. The visit totals follow through the
+        opd_bills trigger.
+
+        bulk_update() sends no signals, so post_save is sent for each bill
+        afterwards: the payments app records the ledger Transactions exactly
+        as it does for record_payment().
+
+        Returns the updated bills keyed by id.
+        """
+        payments = list(payments)
+        if not payments:
+            return {}
+
+        fields = ['received_amount', 'payment_mode', *cls.DERIVED_TOTAL_FIELDS, 'updated_at']
+        with transaction.atomic():
+            # A correlated subquery rather than a join: FOR UPDATE can't be
+            # combined with GROUP BY
+            items_total = OPDBillItem.objects.filter(
+                bill=models.OuterRef('pk')
+            ).values('bill').annotate(total=models.Sum('total_price')).values('total')
+            # The ledger receivers read visit.patient; lock the bill rows only
+            bills = cls.objects.filter(tenant_id=tenant_id).select_related(
+                'visit__patient'
+            ).select_for_update(of=('self',)).annotate(
+                _items_total=models.Subquery(items_total)
+            ).in_bulk({bill_id for bill_id, _, _ in payments})
+
+            for bill_id, amount, mode in payments:
+                bill = bills.get(bill_id)
+                if bill is None:
+                    raise cls.DoesNotExist(f"OPD bill {bill_id} does not exist")
+                bill.received_amount += amount if isinstance(amount, Decimal) else Decimal(str(amount))
+                bill.payment_mode = mode
+
+            now = timezone.now()
+            for bill in bills.values():
+                bill._calculate_derived_totals(items_total=bill._items_total)
+                bill.updated_at = now
+
+            cls.objects.bulk_update(bills.values(), fields=fields, batch_size=batch_size)
+
+            for bill in bills.values():
+                bill._loaded_totals_inputs = bill._totals_inputs()
+                models.signals.post_save.send(
+                    sender=cls, instance=bill, created=False, update_fields=frozenset(fields),
+                    raw=False, using=bill._state.db
+                )
+
+        return bills
+
+
+class MasterDataQuerySet(models.QuerySet):
+    """
+    QuerySet for read-mostly master data with a Redis-backed lookup by id.
+
+    Cached entries hold the concrete field values only and are dropped by the
+    post_save/post_delete receivers in signals.py; CACHE_TTL bounds staleness
+    for writes that bypass signals (update(), bulk_update()).
+    """
+
+    CACHE_TTL = 300
+
+    @staticmethod
+    def cache_key(model, tenant_id, pk):
+        return f"opd:{model._meta.model_name}:{tenant_id}:{pk}"
+
+    def cached(self, tenant_id, pk):
+        """Return the tenant's row with ``pk``, reading through the cache."""
+        from common.cache import CeliyoCache
+
+        cache = CeliyoCache()
+        key = self.cache_key(self.model, tenant_id, pk)
+        fields = self.model._meta.concrete_fields
+
+        values = cache.get(key)
+        if isinstance(values, dict):
+            return self.model.from_db(
+                self.db,
+                [field.attname for field in fields],
+                [field.to_python(values.get(field.attname)) for field in fields]
+            )
+
+        obj = self.get(tenant_id=tenant_id, pk=pk)
+        cache.set(
+            key,
+            {field.attname: getattr(obj, field.attname) for field in fields},
+            ttl=self.CACHE_TTL
+        )
+        return obj
 
 
 class ProcedureMaster(models.Model):
@@ -652,7 +1099,7 @@ class ProcedureMaster(models.Model):
 
     # Primary Fields
     id = models.AutoField(primary_key=True)
-    tenant_id = models.UUIDField(db_index=True, help_text="Tenant this record belongs to")
+    tenant_id = models.UUIDField(help_text="Tenant this record belongs to")
     name = models.CharField(max_length=200)
     code = models.CharField(
         max_length=50,
@@ -678,19 +1125,23 @@ class ProcedureMaster(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = MasterDataQuerySet.as_manager()
+
     class Meta:
         db_table = 'procedure_masters'
         ordering = ['category', 'name']
         verbose_name = 'Procedure Master'
         verbose_name_plural = 'Procedure Masters'
         unique_together = [['tenant_id', 'code']]
+        # tenant_id is served by unique_together and the composites below
         indexes = [
-            models.Index(fields=['tenant_id']),
-            models.Index(fields=['tenant_id', 'category']),
-            models.Index(fields=['tenant_id', 'is_active']),
+            # Lists and lookups filter to active procedures by default
+            models.Index(
+                fields=['tenant_id', 'category'],
+                condition=models.Q(is_active=True),
+                name='proc_active_category_idx'
+            ),
             models.Index(fields=['code'], name='proc_master_code_idx'),
-            models.Index(fields=['category'], name='proc_master_category_idx'),
-            models.Index(fields=['is_active'], name='proc_master_active_idx'),
         ]
 
     def __str__(self):
@@ -764,6 +1215,41 @@ class Service(models.Model):
         return f"{self.code} - {self.name}"
 
 
+class ProcedurePackageQuerySet(MasterDataQuerySet):
+    """QuerySet helpers for procedure packages."""
+
+    def with_savings(self):
+        """
+        Annotate ``savings`` and ``savings_percent`` in SQL.
+
+        List views render these for every row; computing them in the query
+        avoids Decimal arithmetic per instance.
+        """
+        money = models.DecimalField(max_digits=10, decimal_places=2)
+        savings = models.ExpressionWrapper(
+            models.F('total_charge') - models.F('discounted_charge'),
+            output_field=money
+        )
+        return self.annotate(
+            savings=savings,
+            savings_percent=models.Case(
+                models.When(
+                    total_charge__gt=0,
+                    then=models.ExpressionWrapper(
+                        savings * 100 / models.F('total_charge'),
+                        output_field=models.DecimalField()
+                    )
+                ),
+                default=models.Value(Decimal('0')),
+                output_field=models.DecimalField()
+            )
+        )
+
+    def with_procedure_count(self):
+        """Annotate ``procedure_count`` (COUNT over the M2M in the same query)."""
+        return self.annotate(procedure_count=models.Count('procedures'))
+
+
 class ProcedurePackage(models.Model):
     """
     Procedure Package Model - Bundled procedures.
@@ -774,7 +1260,7 @@ class ProcedurePackage(models.Model):
 
     # Primary Fields
     id = models.AutoField(primary_key=True)
-    tenant_id = models.UUIDField(db_index=True, help_text="Tenant this record belongs to")
+    tenant_id = models.UUIDField(help_text="Tenant this record belongs to")
     name = models.CharField(max_length=200)
     code = models.CharField(
         max_length=50,
@@ -808,17 +1294,22 @@ class ProcedurePackage(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProcedurePackageQuerySet.as_manager()
+
     class Meta:
         db_table = 'procedure_packages'
         ordering = ['name']
         verbose_name = 'Procedure Package'
         verbose_name_plural = 'Procedure Packages'
         unique_together = [['tenant_id', 'code']]
+        # tenant_id is served by unique_together and the composites below
         indexes = [
-            models.Index(fields=['tenant_id']),
-            models.Index(fields=['tenant_id', 'is_active']),
+            models.Index(
+                fields=['tenant_id', 'name'],
+                condition=models.Q(is_active=True),
+                name='proc_package_active_name_idx'
+            ),
             models.Index(fields=['code'], name='proc_package_code_idx'),
-            models.Index(fields=['is_active'], name='proc_package_active_idx'),
         ]
 
     def __str__(self):
@@ -1226,13 +1717,27 @@ class OPDBillItem(models.Model):
             models.Index(fields=['tenant_id']),
             models.Index(fields=['bill', 'source']),
             models.Index(fields=['origin_content_type', 'origin_object_id']),
+            models.Index(fields=['bill'], include=['total_price'], name='opd_bill_item_total_idx'),
         ]
 
     def __str__(self):
         return f"{self.item_name} - {self.quantity} × {self.unit_price}"
 
-    def save(self, *args, **kwargs):
-        """Calculate total price and track manual overrides."""
+    def save(self, *args, recalculate_bill=True, **kwargs):
+        """
+        Calculate total price and track manual overrides.
+
+        Pass ``recalculate_bill=False`` when adding several items in a row,
+        then save the bill once with ``update_fields=OPDBill.DERIVED_TOTAL_FIELDS``
+        instead of re-summing the bill after every item.
+        """
+        # Read by the post_save receiver that recalculates the parent bill
+        self._skip_bill_recalculation = not recalculate_bill
+        self._apply_pricing()
+        super().save(*args, **kwargs)
+
+    def _apply_pricing(self):
+        """Fill system price, override flag and total_price (save() and bulk_add())."""
         # Set system_calculated_price on first save if not set
         if not self.pk and not self.system_calculated_price:
             self.system_calculated_price = self.unit_price
@@ -1244,7 +1749,62 @@ class OPDBillItem(models.Model):
         # Calculate total price
         self.total_price = Decimal(str(self.quantity)) * self.unit_price
 
-        super().save(*args, **kwargs)
+    @classmethod
+    def bulk_add(cls, bill, items, batch_size=500):
+        """
+        Insert new items for ``bill`` in one multi-row INSERT, then
+        recalculate the bill's totals once.
+
+        bulk_create skips save() and signals, so the per-item pricing is
+        applied here and the bill is saved explicitly.
+
+        Returns:
+            The created items, with primary keys set
+        """
+        for item in items:
+            item.bill = bill
+            item._apply_pricing()
+
+        created = cls.objects.bulk_create(items, batch_size=batch_size)
+        if created:
+            bill.save(update_fields=OPDBill.DERIVED_TOTAL_FIELDS)
+        return created
+
+
+class VisitChildQuerySet(models.QuerySet):
+    """QuerySet helpers for visit-owned clinical records."""
+
+    # Visit/patient columns behind the visit_number and patient_name
+    # (PatientProfile.full_name) columns of the clinical list serializers
+    VISIT_LIST_FIELDS = ('visit', 'visit__visit_number')
+    PATIENT_LIST_FIELDS = (
+        'visit__patient', 'visit__patient__first_name',
+        'visit__patient__middle_name', 'visit__patient__last_name',
+    )
+
+    def for_listing(self, with_patient=True):
+        """
+        Rows for the model's list serializer: its LIST_FIELDS plus the visit
+        number (and patient name), so wide clinical text and the rest of the
+        visit and patient rows stay in the database.
+        """
+        fields = self.model.LIST_FIELDS + self.VISIT_LIST_FIELDS
+        if with_patient:
+            return self.select_related(None).select_related('visit__patient').only(
+                *fields, *self.PATIENT_LIST_FIELDS
+            )
+        return self.select_related(None).select_related('visit').only(*fields)
+
+
+class VisitChildManager(models.Manager.from_queryset(VisitChildQuerySet)):
+    """
+    Default manager for visit-owned records whose __str__ shows the visit
+    number: joins the visit so admin pages, logs and deletion summaries
+    don't fetch it once per row.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('visit')
 
 
 class ClinicalNote(models.Model):
@@ -1334,6 +1894,11 @@ class ClinicalNote(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = VisitChildManager()
+
+    # Columns ClinicalNoteListSerializer renders (diagnosis_short is annotated)
+    LIST_FIELDS = ('id', 'note_date', 'next_followup_date')
+
     class Meta:
         db_table = 'clinical_notes'
         ordering = ['-note_date']
@@ -1365,7 +1930,7 @@ class VisitFinding(models.Model):
 
     # Primary Fields
     id = models.AutoField(primary_key=True)
-    tenant_id = models.UUIDField(db_index=True, help_text="Tenant this record belongs to")
+    tenant_id = models.UUIDField(help_text="Tenant this record belongs to")
     visit = models.ForeignKey(
         Visit,
         on_delete=models.CASCADE,
@@ -1505,13 +2070,21 @@ class VisitFinding(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = VisitChildManager()
+
+    # Columns VisitFindingListSerializer renders, including what the
+    # blood_pressure and bmi_category properties read
+    LIST_FIELDS = (
+        'id', 'finding_date', 'finding_type', 'temperature', 'pulse',
+        'bp_systolic', 'bp_diastolic', 'weight', 'height', 'bmi', 'spo2',
+    )
+
     class Meta:
         db_table = 'visit_findings'
         ordering = ['-finding_date']
         verbose_name = 'Visit Finding'
         verbose_name_plural = 'Visit Findings'
         indexes = [
-            models.Index(fields=['tenant_id']),
             models.Index(fields=['tenant_id', 'visit']),
             models.Index(fields=['visit', '-finding_date'], name='finding_visit_date_idx'),
         ]
@@ -1519,16 +2092,53 @@ class VisitFinding(models.Model):
     def __str__(self):
         return f"Findings - {self.visit.visit_number}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_bmi_inputs = instance._bmi_inputs()
+        return instance
+
+    def _bmi_inputs(self):
+        return (self.__dict__.get('weight'), self.__dict__.get('height'))
+
     def save(self, *args, **kwargs):
-        """Calculate BMI before saving."""
-        self.calculate_bmi()
+        """Calculate BMI before saving, when weight or height changed."""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'weight', 'height'} & set(update_fields):
+            if self.bmi is None or self._bmi_inputs() != getattr(self, '_loaded_bmi_inputs', None):
+                self.calculate_bmi()
+                if update_fields is not None and 'bmi' not in update_fields:
+                    kwargs['update_fields'] = [*update_fields, 'bmi']
         super().save(*args, **kwargs)
+        self._loaded_bmi_inputs = self._bmi_inputs()
+
+    @classmethod
+    def recompute_bmi(cls, queryset=None):
+        """
+        Recompute BMI for many findings in a single UPDATE.
+
+        Applies the calculate_bmi() formula in SQL, so backfills don't load
+        and save every row. Rows without both weight and height are left
+        untouched. Returns the number of rows updated.
+        """
+        if queryset is None:
+            queryset = cls.objects.all()
+        # weight(kg) / (height(cm) / 100)^2 == weight * 10000 / height^2
+        return queryset.filter(
+            weight__gt=0,
+            height__gt=0
+        ).update(
+            bmi=models.ExpressionWrapper(
+                models.F('weight') * 10000 / (models.F('height') * models.F('height')),
+                output_field=models.DecimalField(max_digits=5, decimal_places=2)
+            )
+        )
 
     def calculate_bmi(self):
         """Calculate BMI from height and weight."""
         if self.weight and self.height:
             # Convert height from cm to meters
-            height_m = self.height / Decimal('100.0')
+            height_m = self.height / HUNDRED
             # BMI = weight(kg) / height(m)²
             self.bmi = self.weight / (height_m ** 2)
             # Round to 2 decimal places
@@ -1576,7 +2186,7 @@ class VisitAttachment(models.Model):
 
     # Primary Fields
     id = models.AutoField(primary_key=True)
-    tenant_id = models.UUIDField(db_index=True, help_text="Tenant this record belongs to")
+    tenant_id = models.UUIDField(help_text="Tenant this record belongs to")
     visit = models.ForeignKey(
         Visit,
         on_delete=models.CASCADE,
@@ -1597,17 +2207,30 @@ class VisitAttachment(models.Model):
         help_text="Description of the attachment"
     )
 
+    # Recorded by save() while the upload is in hand, so listings don't ask
+    # the storage backend for each file's size. Null on rows uploaded before
+    # the column existed; get_file_size() falls back to storage for those.
+    file_size_bytes = models.PositiveBigIntegerField(null=True, blank=True, editable=False)
+    file_extension = models.CharField(max_length=255, blank=True, default='', editable=False)
+
     # Audit Fields
     uploaded_by_id = models.UUIDField(null=True, blank=True, help_text="User who uploaded this attachment")
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
+    objects = VisitChildManager()
+
+    # Columns VisitAttachmentListSerializer renders, including what
+    # get_file_size() and get_file_extension() read
+    LIST_FIELDS = (
+        'id', 'file', 'file_name', 'file_type', 'file_size_bytes', 'file_extension', 'uploaded_at',
+    )
+
     class Meta:
         db_table = 'visit_attachments'
         ordering = ['-uploaded_at']
         verbose_name = 'Visit Attachment'
         verbose_name_plural = 'Visit Attachments'
         indexes = [
-            models.Index(fields=['tenant_id']),
             models.Index(fields=['tenant_id', 'visit']),
             models.Index(fields=['visit'], name='attachment_visit_idx'),
             models.Index(fields=['file_type'], name='attachment_type_idx'),
@@ -1617,25 +2240,40 @@ class VisitAttachment(models.Model):
         return f"{self.file_name} - {self.visit.visit_number}"
 
     def save(self, *args, **kwargs):
-        """Store original filename."""
-        if self.file and not self.file_name:
-            self.file_name = os.path.basename(self.file.name)
+        """Store original filename, size and extension."""
+        if self.file:
+            if not self.file_name:
+                # Storage names always use '/', so no os.path normalisation needed
+                self.file_name = self.file.name.rpartition('/')[2]
+            # A new upload reports its size from the request body, not storage
+            if not self.file._committed or self.file_size_bytes is None:
+                self.file_size_bytes = self.file.size
+            self.file_extension = self._extension_for(self.file.name)
         super().save(*args, **kwargs)
 
+    @staticmethod
+    def _extension_for(name):
+        # Same result as os.path.splitext(): leading dots don't start an extension
+        name = name.rpartition('/')[2].lstrip('.')
+        dot = name.rfind('.')
+        return name[dot:].lower() if dot != -1 else ''
+
     def get_file_size(self):
         """Return file size in a human-readable format."""
         if self.file:
-            size = self.file.size
-            for unit in ['B', 'KB', 'MB', 'GB']:
-                if size < 1024.0:
-                    return f"{size:.2f} {unit}"
-                size /= 1024.0
+            size = self.file_size_bytes
+            if size is None:
+                size = self.file.size
+            if not size:
+                return f"0.00 {_FILE_SIZE_UNITS[0]}"
+            unit = min((size.bit_length() - 1) // 10, len(_FILE_SIZE_UNITS) - 1)
+            return f"{size / (1 << (10 * unit)):.2f} {_FILE_SIZE_UNITS[unit]}"
         return None
 
     def get_file_extension(self):
         """Return file extension."""
         if self.file:
-            return os.path.splitext(self.file.name)[1].lower()
+            return self.file_extension
         return None
 
 
@@ -1650,7 +2288,6 @@ class ClinicalNoteTemplateGroup(models.Model):
 
     # Tenant Information
     tenant_id = models.UUIDField(
-        db_index=True,
         help_text="Tenant identifier for multi-tenancy"
     )
 
@@ -1676,7 +2313,6 @@ class ClinicalNoteTemplateGroup(models.Model):
         verbose_name_plural = 'Clinical Note Template Groups'
         unique_together = [['tenant_id', 'name']]
         indexes = [
-            models.Index(fields=['tenant_id']),
             models.Index(fields=['tenant_id', 'is_active']),
         ]
 
@@ -1695,7 +2331,6 @@ class ClinicalNoteTemplate(models.Model):
 
     # Tenant Information
     tenant_id = models.UUIDField(
-        db_index=True,
         help_text="Tenant identifier for multi-tenancy"
     )
 
@@ -1730,7 +2365,6 @@ class ClinicalNoteTemplate(models.Model):
         verbose_name_plural = 'Clinical Note Templates'
         unique_together = [['tenant_id', 'code']]
         indexes = [
-            models.Index(fields=['tenant_id']),
             models.Index(fields=['tenant_id', 'is_active']),
             models.Index(fields=['code'], name='clinical_template_code_idx'),
         ]
@@ -1738,6 +2372,32 @@ class ClinicalNoteTemplate(models.Model):
     def __str__(self):
         return f"{self.code} - {self.name}"
 
+    FIELD_IDS_CACHE_TTL = 300
+
+    @staticmethod
+    def field_ids_cache_key(template_id):
+        return f"opd:clinicalnotetemplate:{template_id}:field_ids"
+
+    def get_field_ids_by_name(self):
+        """
+        Return ``{field_name: field_id}`` for this template, read through the cache.
+
+        Dropped by the ClinicalNoteTemplateField post_save/post_delete
+        receivers in signals.py.
+        """
+        from common.cache import CeliyoCache
+
+        cache = CeliyoCache()
+        key = self.field_ids_cache_key(self.pk)
+
+        field_ids = cache.get(key)
+        if isinstance(field_ids, dict):
+            return field_ids
+
+        field_ids = dict(self.fields.values_list('field_name', 'id'))
+        cache.set(key, field_ids, ttl=self.FIELD_IDS_CACHE_TTL)
+        return field_ids
+
 
 class ClinicalNoteTemplateField(models.Model):
     """
@@ -1768,7 +2428,6 @@ class ClinicalNoteTemplateField(models.Model):
 
     # Tenant Information
     tenant_id = models.UUIDField(
-        db_index=True,
         help_text="Tenant identifier for multi-tenancy"
     )
 
@@ -1869,8 +2528,8 @@ class ClinicalNoteTemplateField(models.Model):
         verbose_name_plural = 'Clinical Note Template Fields'
         unique_together = [['template', 'field_name']]
         indexes = [
-            models.Index(fields=['tenant_id']),
             models.Index(fields=['template', 'display_order']),
+            models.Index(fields=['tenant_id', 'field_type'], name='cn_field_tenant_type_idx'),
         ]
 
     def __str__(self):
@@ -1888,7 +2547,6 @@ class ClinicalNoteTemplateFieldOption(models.Model):
 
     # Tenant Information
     tenant_id = models.UUIDField(
-        db_index=True,
         help_text="Tenant identifier for multi-tenancy"
     )
 
@@ -1931,6 +2589,101 @@ class ClinicalNoteTemplateFieldOption(models.Model):
         return f"{self.field.field_label} - {self.option_label}"
 
 
+# Option-backed field types (values live in selected_options)
+_SINGLE_CHOICE_FIELD_TYPES = frozenset({'select', 'radio'})
+_MULTI_CHOICE_FIELD_TYPES = frozenset({'multiselect', 'checkbox'})
+_CHOICE_FIELD_TYPES = _SINGLE_CHOICE_FIELD_TYPES | _MULTI_CHOICE_FIELD_TYPES
+
+
+def _to_decimal(value):
+    """
+    Numeric field value as Decimal (None when empty).
+
+    Decimals and ints convert without a trip through str(); floats and
+    strings still go via str() so floats keep their short repr.
+    """
+    if not value:
+        return None
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    return Decimal(str(value))
+
+
+# clone_from_template(): stored field type -> setter for a saved template value.
+# Select-type fields carry option IDs and are linked separately.
+_CLONED_VALUE_SETTERS = {
+    'text': lambda fr, value: setattr(fr, 'value_text', value or ''),
+    'textarea': lambda fr, value: setattr(fr, 'value_text', value or ''),
+    'number': lambda fr, value: setattr(fr, 'value_number', _to_decimal(value)),
+    'decimal': lambda fr, value: setattr(fr, 'value_number', _to_decimal(value)),
+    'boolean': lambda fr, value: setattr(fr, 'value_boolean', bool(value) if value is not None else None),
+    'date': lambda fr, value: setattr(fr, 'value_date', value),
+    'datetime': lambda fr, value: setattr(fr, 'value_datetime', value),
+    'time': lambda fr, value: setattr(fr, 'value_time', value),
+    'json': lambda fr, value: setattr(fr, 'value_json', value if isinstance(value, dict) else {}),
+}
+
+# ClinicalNoteTemplateFieldResponse.get_value(): field type -> reader
+_VALUE_GETTERS = {
+    'text': attrgetter('value_text'),
+    'textarea': attrgetter('value_text'),
+    'number': attrgetter('value_number'),
+    'decimal': attrgetter('value_number'),
+    'boolean': attrgetter('value_boolean'),
+    'date': attrgetter('value_date'),
+    'datetime': attrgetter('value_datetime'),
+    'time': attrgetter('value_time'),
+    'json': attrgetter('value_json'),
+    'image': lambda fr: fr.value_file.url if fr.value_file else None,
+    'file': lambda fr: fr.value_file.url if fr.value_file else None,
+    # Option readers go through .all() so a prefetch is reused
+    'select': lambda fr: next((option.option_value for option in fr.selected_options.all()), None),
+    'radio': lambda fr: next((option.option_value for option in fr.selected_options.all()), None),
+    'multiselect': lambda fr: [option.option_value for option in fr.selected_options.all()],
+    'checkbox': lambda fr: [option.option_value for option in fr.selected_options.all()],
+}
+
+# ClinicalNoteTemplateFieldResponse.set_value(): field type -> column setter.
+# Select-type fields save and link options instead.
+_VALUE_SETTERS = {
+    'text': lambda fr, value: setattr(fr, 'value_text', str(value) if value else ''),
+    'textarea': lambda fr, value: setattr(fr, 'value_text', str(value) if value else ''),
+    'number': lambda fr, value: setattr(fr, 'value_number', _to_decimal(value)),
+    'decimal': lambda fr, value: setattr(fr, 'value_number', _to_decimal(value)),
+    'boolean': lambda fr, value: setattr(fr, 'value_boolean', bool(value) if value is not None else None),
+    'date': lambda fr, value: setattr(fr, 'value_date', value),
+    'datetime': lambda fr, value: setattr(fr, 'value_datetime', value),
+    'time': lambda fr, value: setattr(fr, 'value_time', value),
+    'json': lambda fr, value: setattr(fr, 'value_json', value if isinstance(value, dict) else {}),
+    'image': lambda fr, value: setattr(fr, 'value_file', value),
+    'file': lambda fr, value: setattr(fr, 'value_file', value),
+}
+
+
+class ClinicalNoteTemplateResponseQuerySet(models.QuerySet):
+    """QuerySet helpers for clinical note template responses."""
+
+    def for_listing(self):
+        """
+        Rows for ClinicalNoteTemplateResponseListSerializer.
+
+        Listings never render response_summary and only count field
+        responses, so the summary JSON is deferred and the prefetch loads
+        field response ids alone (no canvas JSON or option joins). The
+        generic ``encounter`` is prefetched per content type for the
+        encounter_display column.
+        """
+        return self.select_related('template', 'content_type').defer('response_summary').prefetch_related(
+            'encounter',
+            models.Prefetch(
+                'field_responses',
+                queryset=ClinicalNoteTemplateFieldResponse.objects.only('id', 'response_id')
+            )
+        )
+
+
 class ClinicalNoteTemplateResponse(models.Model):
     """
     Template Response Model - Actual filled form data.
@@ -1950,7 +2703,6 @@ class ClinicalNoteTemplateResponse(models.Model):
 
     # Tenant Information
     tenant_id = models.UUIDField(
-        db_index=True,
         help_text="Tenant identifier for multi-tenancy"
     )
 
@@ -2033,6 +2785,8 @@ class ClinicalNoteTemplateResponse(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ClinicalNoteTemplateResponseQuerySet.as_manager()
+
     class Meta:
         db_table = 'clinical_note_template_responses'
         ordering = ['-response_date']
@@ -2046,14 +2800,21 @@ class ClinicalNoteTemplateResponse(models.Model):
             )
         ]
         indexes = [
-            models.Index(fields=['tenant_id']),
-            models.Index(fields=['content_type', 'object_id']),
             models.Index(fields=['template']),
             models.Index(fields=['status']),
-            models.Index(fields=['-response_date']),
-            models.Index(fields=['content_type', 'object_id', 'template', 'response_sequence']),
+            # Per-encounter listings filter on (encounter, template) and order by
+            # -response_date; this serves them without a sort step. Lookups on the
+            # encounter alone, or by response_sequence, use its prefix or the
+            # unique_response_per_encounter_template index.
+            models.Index(fields=['content_type', 'object_id', 'template', '-response_date'], name='resp_visit_tmpl_date_idx'),
+            models.Index(fields=['tenant_id', '-response_date'], name='resp_tenant_date_idx'),
             models.Index(fields=['original_assigned_doctor_id']),
-            models.Index(fields=['is_reviewed']),
+            # Review queue and draft worklists only ever read the pending rows,
+            # which stay a small fraction of the table as responses age.
+            models.Index(fields=['tenant_id', 'response_date'], name='resp_pending_review_idx', condition=models.Q(is_reviewed=False)),
+            models.Index(fields=['tenant_id', 'response_date'], name='resp_draft_idx', condition=models.Q(status='draft')),
+            models.Index(fields=['tenant_id', 'status', 'response_date'], name='cn_response_tenant_status_idx'),
+            models.Index(fields=['tenant_id', 'template', 'response_sequence'], name='cn_response_tenant_tmpl_idx'),
         ]
 
     def __str__(self):
@@ -2067,8 +2828,14 @@ class ClinicalNoteTemplateResponse(models.Model):
         return f"{encounter_display} - {self.template.name} (Seq: {self.response_sequence})"
 
     def save(self, *args, **kwargs):
-        """Auto-calculate response_sequence if not set."""
-        if not self.response_sequence:
+        """
+        Auto-calculate response_sequence if not set.
+
+        The field defaults to 1, so the MAX lookup only runs for new rows
+        whose caller explicitly cleared the sequence (the create serializer
+        computes it itself); updates never pay for it.
+        """
+        if self._state.adding and not self.response_sequence:
             # Get max sequence for this encounter + template combination
             max_seq = ClinicalNoteTemplateResponse.objects.filter(
                 content_type=self.content_type,
@@ -2078,17 +2845,64 @@ class ClinicalNoteTemplateResponse(models.Model):
             self.response_sequence = (max_seq or 0) + 1
         super().save(*args, **kwargs)
 
+    def prefetch_field_responses(self):
+        """
+        Load field responses with their fields and selected options in one
+        pass, unless the queryset already prefetched them.
+
+        Detail rendering reads them twice (nested rows and generate_summary());
+        this lets responses that didn't come from the viewset queryset
+        (just created, reviewed, or cloned into) share one load too.
+        """
+        if 'field_responses' not in getattr(self, '_prefetched_objects_cache', {}):
+            models.prefetch_related_objects([self], models.Prefetch(
+                'field_responses',
+                queryset=ClinicalNoteTemplateFieldResponse.objects.with_value_relations()
+            ))
+
+    def _field_responses_with_fields(self):
+        """
+        Field responses with their template field joined in.
+
+        Summary/copy/compare loops read ``field_response.field`` and the
+        selected options on every row; the join and prefetch avoid per-row
+        lookups. The version history blob is never read by these loops, so it
+        is deferred.
+
+        Rows are streamed in chunks (options prefetched per chunk) rather
+        than cached on the queryset, so large canvas-heavy forms don't hold
+        every row in memory at once.
+
+        When the caller already prefetched field_responses with field and
+        selected_options (as the response viewset does), those rows are
+        reused instead of querying again.
+        """
+        prefetched = getattr(self, '_prefetched_objects_cache', {}).get('field_responses')
+        if prefetched is not None:
+            rows = list(prefetched)
+            if not rows or (
+                ClinicalNoteTemplateFieldResponse._meta.get_field('field').is_cached(rows[0])
+                and 'selected_options' in getattr(rows[0], '_prefetched_objects_cache', {})
+            ):
+                return rows
+        return self.field_responses.with_value_relations().defer(
+            'canvas_version_history'
+        ).iterator(chunk_size=500)
+
     def generate_summary(self):
         """Generate a summary of all field responses."""
         summary = {}
-        for field_response in self.field_responses.all():
+        for field_response in self._field_responses_with_fields():
             summary[field_response.field.field_name] = {
                 'label': field_response.field.field_label,
                 'value': field_response.get_display_value(),
                 'type': field_response.field.field_type
             }
-        self.response_summary = summary
-        self.save()
+        # The detail serializer calls this on every read: write only the
+        # summary column, and only when it changed, instead of a full save()
+        if summary != self.response_summary:
+            type(self).objects.filter(pk=self.pk).update(response_summary=summary)
+            self.response_summary = summary
         return summary
 
     @classmethod
@@ -2122,6 +2936,47 @@ class ClinicalNoteTemplateResponse(models.Model):
         response.save()
         return response
 
+    USER_ID_FIELDS = ('filled_by_id', 'reviewed_by_id', 'original_assigned_doctor_id')
+
+    @classmethod
+    def attach_user_names(cls, responses):
+        """
+        Set ``filled_by_name``, ``reviewed_by_name`` and
+        ``original_assigned_doctor_name`` on each response.
+
+        The user columns are bare SuperAdmin UUIDs, so names come from the
+        local DoctorProfile cache in one query for the whole batch; ids
+        without a profile resolve to None.
+
+        Args:
+            responses: List of ClinicalNoteTemplateResponse instances
+
+        Returns:
+            The same list
+        """
+        from apps.doctors.models import DoctorProfile
+
+        user_ids = {
+            getattr(response, field)
+            for response in responses
+            for field in cls.USER_ID_FIELDS
+        }
+        user_ids.discard(None)
+
+        names = {}
+        if user_ids:
+            names = {
+                profile.user_id: profile.full_name
+                for profile in DoctorProfile.objects.filter(user_id__in=user_ids).only(
+                    'user_id', 'first_name', 'last_name'
+                )
+            }
+
+        for response in responses:
+            for field in cls.USER_ID_FIELDS:
+                setattr(response, field[:-3] + '_name', names.get(getattr(response, field)))
+        return responses
+
     def clone_from_template(self, response_template):
         """
         Clone field values from a saved ResponseTemplate (copy-paste template).
@@ -2132,56 +2987,50 @@ class ClinicalNoteTemplateResponse(models.Model):
         Returns:
             List of created ClinicalNoteTemplateFieldResponse instances
         """
-        from decimal import Decimal
+        template_values = response_template.template_field_values or {}
+        field_ids = self.template.get_field_ids_by_name()
 
         field_responses = []
-        template_values = response_template.template_field_values or {}
+        option_ids_by_response = []
 
         for field_name, field_data in template_values.items():
-            try:
-                # Find the field in current template
-                field = self.template.fields.get(field_name=field_name)
-
-                # Create field response
-                field_response = ClinicalNoteTemplateFieldResponse(
-                    response=self,
-                    field=field,
-                    tenant_id=self.tenant_id
-                )
+            # Skip if field no longer exists in template
+            field_id = field_ids.get(field_name)
+            if field_id is None:
+                continue
+
+            field_response = ClinicalNoteTemplateFieldResponse(
+                response=self,
+                field_id=field_id,
+                tenant_id=self.tenant_id
+            )
+
+            # Set value based on type
+            field_type = field_data.get('type')
+            value = field_data.get('value')
 
-                # Set value based on type
-                field_type = field_data.get('type')
-                value = field_data.get('value')
+            set_value = _CLONED_VALUE_SETTERS.get(field_type)
+            if set_value is not None:
+                set_value(field_response, value)
 
-                if field_type in ['text', 'textarea']:
-                    field_response.value_text = value or ''
-                elif field_type in ['number', 'decimal']:
-                    field_response.value_number = Decimal(str(value)) if value else None
-                elif field_type == 'boolean':
-                    field_response.value_boolean = bool(value) if value is not None else None
-                elif field_type == 'date':
-                    field_response.value_date = value
-                elif field_type == 'datetime':
-                    field_response.value_datetime = value
-                elif field_type == 'time':
-                    field_response.value_time = value
-                elif field_type == 'json':
-                    field_response.value_json = value if isinstance(value, dict) else {}
+            # Options are linked once the responses have primary keys
+            if field_type in _CHOICE_FIELD_TYPES and value:
+                option_ids_by_response.append(
+                    (field_response, value if isinstance(value, list) else [value])
+                )
 
-                field_response.save()
+            field_responses.append(field_response)
 
-                # Handle multiselect options
-                if field_type in ['select', 'radio', 'multiselect', 'checkbox'] and value:
-                    option_ids = value if isinstance(value, list) else [value]
-                    field_response.selected_options.set(option_ids)
+        with transaction.atomic():
+            ClinicalNoteTemplateFieldResponse.objects.bulk_create(field_responses, batch_size=500)
 
-                field_responses.append(field_response)
+            ClinicalNoteTemplateFieldResponse.bulk_link_selected_options(option_ids_by_response)
 
-            except ClinicalNoteTemplateField.DoesNotExist:
-                continue  # Skip if field no longer exists in template
+            # Prefetched rows predate the clone
+            getattr(self, '_prefetched_objects_cache', {}).pop('field_responses', None)
 
-        # Regenerate summary
-        self.generate_summary()
+            # Regenerate summary
+            self.generate_summary()
 
         return field_responses
 
@@ -2199,7 +3048,7 @@ class ClinicalNoteTemplateResponse(models.Model):
         """
         # Collect all field values
         template_field_values = {}
-        for field_response in self.field_responses.all():
+        for field_response in self._field_responses_with_fields():
             field_name = field_response.field.field_name
             template_field_values[field_name] = {
                 'label': field_response.field.field_label,
@@ -2254,8 +3103,8 @@ class ClinicalNoteTemplateResponse(models.Model):
         }
 
         # Compare field responses
-        self_fields = {fr.field.field_name: fr for fr in self.field_responses.all()}
-        other_fields = {fr.field.field_name: fr for fr in other_response.field_responses.all()}
+        self_fields = {fr.field.field_name: fr for fr in self._field_responses_with_fields()}
+        other_fields = {fr.field.field_name: fr for fr in other_response._field_responses_with_fields()}
 
         all_field_names = set(self_fields.keys()) | set(other_fields.keys())
 
@@ -2278,12 +3127,50 @@ class ClinicalNoteTemplateResponse(models.Model):
         return comparison
 
 
+class ClinicalNoteTemplateFieldResponseQuerySet(models.QuerySet):
+    """QuerySet helpers for clinical note template field responses."""
+
+    CANVAS_BLOB_FIELDS = ('full_canvas_json', 'canvas_version_history')
+
+    def without_canvas_blobs(self):
+        """
+        Defer the canvas JSON columns for list rendering.
+
+        Excalidraw documents and their history can run to megabytes per row.
+        ``has_canvas`` is annotated in their place so get_value() and
+        get_display_value() can still tell canvas answers apart without
+        loading the document.
+        """
+        return self.defer(*self.CANVAS_BLOB_FIELDS).annotate(
+            has_canvas=models.ExpressionWrapper(
+                models.Q(full_canvas_json__isnull=False) & ~models.Q(full_canvas_json={}),
+                output_field=models.BooleanField()
+            )
+        )
+
+    def with_value_relations(self):
+        """
+        Load what get_value() and get_display_value() read: the field row and
+        the value/label of each selected option, so rendering any number of
+        responses costs one query for the rows and one for their options.
+        """
+        return self.select_related('field').prefetch_related(
+            models.Prefetch(
+                'selected_options',
+                queryset=ClinicalNoteTemplateFieldOption.objects.only('id', 'option_value', 'option_label')
+            )
+        )
+
+
 class ClinicalNoteTemplateFieldResponse(models.Model):
     """
     Field Response Model - Individual field answers.
 
     Stores the actual value for each field in a template response.
     Supports both keyboard input and stylus/canvas input.
+
+    get_value()/get_display_value() read ``field`` and ``selected_options``;
+    querysets rendering many rows should use ``with_value_relations()``.
     """
 
     id = models.AutoField(primary_key=True)
@@ -2306,6 +3193,10 @@ class ClinicalNoteTemplateFieldResponse(models.Model):
     )
 
     # Value Storage (use appropriate field based on type)
+    # Typed columns are kept on purpose: Postgres stores the unused NULLs in
+    # the row's null bitmap (one bit each), value_number/value_date stay
+    # filterable and sortable in SQL, and value_file needs a real FileField.
+    # To keep reads narrow, defer the columns a path doesn't need instead.
     value_text = models.TextField(null=True, blank=True)
     value_number = models.DecimalField(
         max_digits=10,
@@ -2355,6 +3246,11 @@ class ClinicalNoteTemplateFieldResponse(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ClinicalNoteTemplateFieldResponseQuerySet.as_manager()
+
+    # Stands in for the canvas document when it was not loaded
+    CANVAS_PLACEHOLDER = '[canvas]'
+
     class Meta:
         db_table = 'clinical_note_template_field_responses'
         ordering = ['response', 'field__display_order']
@@ -2364,6 +3260,7 @@ class ClinicalNoteTemplateFieldResponse(models.Model):
         indexes = [
             models.Index(fields=['tenant_id']),
             models.Index(fields=['response']),
+            models.Index(fields=['tenant_id', 'updated_at'], name='cn_field_resp_tenant_upd_idx'),
         ]
 
     def __str__(self):
@@ -2376,17 +3273,32 @@ class ClinicalNoteTemplateFieldResponse(models.Model):
                 encounter_display = self.response.encounter.admission_id
         return f"{encounter_display} - {self.field.field_label}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Canvas as loaded, so save() can detect changes without re-reading
+        # the row. Callers replace full_canvas_json rather than mutating it.
+        if 'full_canvas_json' in instance.__dict__:
+            instance._loaded_full_canvas_json = instance.full_canvas_json
+        return instance
+
     def save(self, *args, **kwargs):
         # Track changes to full_canvas_json for version history
+        history_appended = False
         if self.pk is not None:
             try:
-                orig = ClinicalNoteTemplateFieldResponse.objects.get(pk=self.pk)
-                if orig.full_canvas_json != self.full_canvas_json and orig.full_canvas_json:
-                    if self.canvas_version_history is None:
-                        self.canvas_version_history = []
-                    self.canvas_version_history.append(orig.full_canvas_json)
-            except ClinicalNoteTemplateFieldResponse.DoesNotExist:
-                pass
+                orig_json = self._loaded_full_canvas_json
+            except AttributeError:
+                # Not loaded via from_db (or the column was deferred)
+                orig_json = ClinicalNoteTemplateFieldResponse.objects.filter(
+                    pk=self.pk
+                ).values_list('full_canvas_json', flat=True).first()
+            if orig_json and orig_json != self.full_canvas_json:
+                history_appended = True
+                history = self._append_canvas_history(orig_json)
+                update_fields = kwargs.get('update_fields')
+                if update_fields is not None and 'canvas_version_history' not in update_fields:
+                    kwargs['update_fields'] = [*update_fields, 'canvas_version_history']
 
         # TODO: Implement thumbnail generation from full_canvas_json.
         # This requires a library to convert Excalidraw JSON to an image (e.g., SVG or PNG).
@@ -2403,98 +3315,207 @@ class ClinicalNoteTemplateFieldResponse(models.Model):
         #         print(f"Could not generate thumbnail for {self.id}: {e}")
 
         super().save(*args, **kwargs)
+        self._loaded_full_canvas_json = self.full_canvas_json
+
+        if history_appended:
+            if history is None:
+                # Leave the column unloaded; the next access re-reads it
+                del self.__dict__['canvas_version_history']
+            else:
+                self.canvas_version_history = history
+
+    def _append_canvas_history(self, entry):
+        """
+        Point canvas_version_history at a jsonb append of ``entry`` so the
+        next save() grows the list in the database (``coalesce(col, '[]') ||
+        [entry]``) instead of re-sending the whole history.
+
+        Returns the in-memory history with ``entry`` appended, or None when
+        the column wasn't loaded (it stays unread).
+        """
+        from django.db.models.functions import Coalesce
+
+        loaded = 'canvas_version_history' in self.__dict__
+        history = [*(self.canvas_version_history or []), entry] if loaded else None
+        self.canvas_version_history = models.Func(
+            Coalesce(
+                models.F('canvas_version_history'),
+                models.Value([], output_field=models.JSONField()),
+            ),
+            models.Value([entry], output_field=models.JSONField()),
+            template='%(expressions)s',
+            arg_joiner=' || ',
+            output_field=models.JSONField(),
+        )
+        return history
+
+    @classmethod
+    def bulk_link_selected_options(cls, pending, batch_size=500):
+        """
+        Link selected options to newly created field responses in bulk.
+
+        Calling selected_options.set() per response issues a DELETE and an
+        INSERT for every field; this writes all through rows in one INSERT
+        per batch. Only use it for responses with no existing options.
+
+        Args:
+            pending: Iterable of (field_response, options) pairs, where options
+                are option IDs or ClinicalNoteTemplateFieldOption instances
+            batch_size: Rows per INSERT statement
+        """
+        SelectedOption = cls.selected_options.through
+        return SelectedOption.objects.bulk_create(
+            [
+                SelectedOption(
+                    clinicalnotetemplatefieldresponse_id=field_response.pk,
+                    clinicalnotetemplatefieldoption_id=getattr(option, 'pk', option)
+                )
+                for field_response, options in pending
+                for option in options
+            ],
+            batch_size=batch_size,
+            # Repeated option IDs in one payload hit the through-table unique key
+            ignore_conflicts=True
+        )
+
+    @classmethod
+    def bulk_save_with_history(cls, rows, fields, batch_size=500):
+        """
+        Write many existing field responses, keeping canvas version history.
+
+        The bulk counterpart of save(): a changed canvas appends the previous
+        one to canvas_version_history with the same jsonb append, but all rows
+        go out in at most two UPDATEs per batch (rows with and without a
+        canvas change) instead of one save() per row. Canvases that were not
+        loaded from the database are read in a single query.
+
+        Args:
+            rows: Saved ClinicalNoteTemplateFieldResponse instances holding
+                their new values
+            fields: Names of the value fields to write
+            batch_size: Rows per UPDATE statement
+        """
+        rows = list(rows)
+        unloaded = [row.pk for row in rows if not hasattr(row, '_loaded_full_canvas_json')]
+        prior = dict(
+            cls.objects.filter(pk__in=unloaded).values_list('pk', 'full_canvas_json')
+        ) if unloaded else {}
+
+        now = timezone.now()
+        fields = [*fields, 'updated_at']
+        changed, unchanged, histories = [], [], []
+        for row in rows:
+            row.updated_at = now
+            orig_json = getattr(row, '_loaded_full_canvas_json', prior.get(row.pk))
+            if orig_json and orig_json != row.full_canvas_json:
+                histories.append((row, row._append_canvas_history(orig_json)))
+                changed.append(row)
+            else:
+                unchanged.append(row)
+
+        if changed:
+            cls.objects.bulk_update(changed, [*fields, 'canvas_version_history'], batch_size=batch_size)
+        if unchanged:
+            cls.objects.bulk_update(unchanged, fields, batch_size=batch_size)
+
+        for row, history in histories:
+            if history is None:
+                del row.__dict__['canvas_version_history']
+            else:
+                row.canvas_version_history = history
+        for row in rows:
+            row._loaded_full_canvas_json = row.full_canvas_json
 
     def get_value(self):
         """Get the value based on field type."""
-        field_type = self.field.field_type
-
-        if self.full_canvas_json:
+        return self._value_for(self.field.field_type)
+
+    def _canvas_deferred(self):
+        """True when the row came from without_canvas_blobs()."""
+        return 'full_canvas_json' not in self.__dict__ and hasattr(self, 'has_canvas')
+
+    def _value_for(self, field_type):
+        """get_value() for an already-resolved field type."""
+        if self._canvas_deferred():
+            if self.has_canvas:
+                return self.CANVAS_PLACEHOLDER
+        elif self.full_canvas_json:
             return self.full_canvas_json
 
-        if field_type in ['text', 'textarea']:
-            return self.value_text
-        elif field_type in ['number', 'decimal']:
-            return self.value_number
-        elif field_type == 'boolean':
-            return self.value_boolean
-        elif field_type == 'date':
-            return self.value_date
-        elif field_type == 'datetime':
-            return self.value_datetime
-        elif field_type == 'time':
-            return self.value_time
-        elif field_type == 'json':
-            return self.value_json
-        elif field_type in ['image', 'file']:
-            return self.value_file.url if self.value_file else None
-        elif field_type in ['select', 'radio']:
-            # Return single selected option
-            option = self.selected_options.first()
-            return option.option_value if option else None
-        elif field_type in ['multiselect', 'checkbox']:
-            # Return list of selected options
-            return list(self.selected_options.values_list('option_value', flat=True))
-
-        return None
+        getter = _VALUE_GETTERS.get(field_type)
+        return getter(self) if getter is not None else None
 
     def get_display_value(self):
         """Get human-readable display value."""
         field_type = self.field.field_type
 
-        if self.full_canvas_json:
+        has_canvas = self.has_canvas if self._canvas_deferred() else self.full_canvas_json
+        if has_canvas:
             return f"Canvas Data (Thumbnail: {self.canvas_thumbnail.url if self.canvas_thumbnail else 'Not generated'})"
 
-        if field_type in ['select', 'radio']:
-            option = self.selected_options.first()
+        if field_type in _SINGLE_CHOICE_FIELD_TYPES:
+            option = next(iter(self.selected_options.all()), None)
             return option.option_label if option else None
-        elif field_type in ['multiselect', 'checkbox']:
-            return list(self.selected_options.values_list('option_label', flat=True))
+        elif field_type in _MULTI_CHOICE_FIELD_TYPES:
+            return [option.option_label for option in self.selected_options.all()]
         elif field_type == 'boolean':
             return 'Yes' if self.value_boolean else 'No' if self.value_boolean is False else None
 
-        return self.get_value()
+        return self._value_for(field_type)
 
-    def set_value(self, value):
-        """Set the value based on field type."""
+    def set_value(self, value, save=True):
+        """
+        Set the value based on field type.
+
+        With ``save=False`` nothing is written: the caller bulk-creates the
+        instance and passes ``(instance, returned option IDs)`` to
+        bulk_link_selected_options(), instead of one save + set() per field.
+
+        Returns:
+            Option IDs to link (empty for non-option fields)
+        """
         field_type = self.field.field_type
 
-        if field_type in ['text', 'textarea']:
-            self.value_text = str(value) if value else ''
-        elif field_type in ['number', 'decimal']:
-            self.value_number = Decimal(str(value)) if value else None
-        elif field_type == 'boolean':
-            self.value_boolean = bool(value) if value is not None else None
-        elif field_type == 'date':
-            self.value_date = value
-        elif field_type == 'datetime':
-            self.value_datetime = value
-        elif field_type == 'time':
-            self.value_time = value
-        elif field_type == 'json':
-            self.value_json = value if isinstance(value, dict) else {}
-        elif field_type in ['image', 'file']:
-            self.value_file = value
-        elif field_type in ['select', 'radio']:
-            # For single select, save first then set selected option
-            self.save()
+        # None leaves existing options untouched; a list replaces them
+        option_ids = None
+        setter = _VALUE_SETTERS.get(field_type)
+        if setter is not None:
+            setter(self, value)
+        elif field_type in _SINGLE_CHOICE_FIELD_TYPES:
             if value:
                 # value should be a single option ID
                 option_id = value if isinstance(value, (int, str)) else value[0] if isinstance(value, list) else None
                 if option_id:
-                    self.selected_options.set([option_id])
-            return
-        elif field_type in ['multiselect', 'checkbox']:
-            # For multiple select, save first then set selected options
-            self.save()
-            if value:
-                # value should be a list of option IDs
-                option_ids = value if isinstance(value, list) else [value]
-                self.selected_options.set(option_ids)
-            else:
-                self.selected_options.clear()
-            return
+                    option_ids = [option_id]
+        elif field_type in _MULTI_CHOICE_FIELD_TYPES:
+            # value should be a list of option IDs; empty clears the selection
+            option_ids = (value if isinstance(value, list) else [value]) if value else []
+
+        if save:
+            # Row and option links commit together
+            with transaction.atomic():
+                self.save()
+                if option_ids is not None:
+                    self.replace_selected_options(option_ids)
+        return option_ids or []
+
+    def replace_selected_options(self, option_ids):
+        """
+        Make ``option_ids`` the selected options in at most two statements.
 
-        self.save()
+        selected_options.set() reads the current links to diff them before
+        deleting and inserting; here one DELETE drops the links outside
+        ``option_ids`` and one INSERT (conflicts ignored) adds the rest.
+        """
+        SelectedOption = self.selected_options.through
+        SelectedOption.objects.filter(
+            clinicalnotetemplatefieldresponse_id=self.pk
+        ).exclude(
+            clinicalnotetemplatefieldoption_id__in=option_ids
+        ).delete()
+        self.bulk_link_selected_options([(self, option_ids)])
+        # Like set(), drop a stale prefetch of the options
+        getattr(self, '_prefetched_objects_cache', {}).pop('selected_options', None)
 
 
 class ClinicalNoteResponseTemplate(models.Model):
@@ -2540,6 +3561,8 @@ class ClinicalNoteResponseTemplate(models.Model):
     # Template Data
     template_field_values = models.JSONField(
         default=dict,
+        # convert_to_reusable_template stores get_value() results (Decimal, date, time)
+        encoder=DjangoJSONEncoder,
         help_text="Stores cloned field responses for quick reuse. Format: {field_name: {label, type, value}}"
     )
 
@@ -2574,6 +3597,8 @@ class ClinicalNoteResponseTemplate(models.Model):
             models.Index(fields=['tenant_id', 'is_active']),
             models.Index(fields=['created_by_id']),
             models.Index(fields=['-usage_count']),
+            # Key-existence/containment filters (template_field_values__has_key, __contains)
+            GinIndex(fields=['template_field_values'], name='cnrt_tfv_gin'),
         ]
 
     def __str__(self):
@@ -2593,9 +3618,14 @@ class ClinicalNoteResponseTemplate(models.Model):
         """
         field_responses = clinical_response.clone_from_template(self)
 
-        # Increment usage count
-        self.usage_count += 1
-        self.save(update_fields=['usage_count', 'updated_at'])
+        # Increment usage count in SQL so concurrent applies don't lose counts
+        now = timezone.now()
+        type(self).objects.filter(pk=self.pk).update(
+            usage_count=models.F('usage_count') + 1,
+            updated_at=now
+        )
+        self.refresh_from_db(fields=['usage_count'])
+        self.updated_at = now
 
         return field_responses
 
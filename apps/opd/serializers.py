@@ -3,6 +3,10 @@ from rest_framework import serializers
 from django.db import transaction, models
 from decimal import Decimal
 
+from apps.doctors.models import DoctorProfile
+from apps.patients.models import PatientProfile
+from common.serializers import CachedFieldsModelSerializer, EagerLoadingListSerializer, unique_violation
+
 from .models import (
     Visit, OPDBill, OPDBillItem, ProcedureMaster, ProcedurePackage, Service,
   ClinicalNote,
@@ -18,7 +22,7 @@ from .models import (
 # VISIT SERIALIZERS
 # ============================================================================
 
-class VisitListSerializer(serializers.ModelSerializer):
+class VisitListSerializer(CachedFieldsModelSerializer):
     """Serializer for listing visits (lightweight)"""
 
     patient_name = serializers.CharField(source='patient.full_name', read_only=True)
@@ -30,8 +34,11 @@ class VisitListSerializer(serializers.ModelSerializer):
     doctor_name = serializers.CharField(source='doctor.full_name', read_only=True)
     waiting_time = serializers.SerializerMethodField()
 
+    eager_lookups = ('patient', 'doctor')
+
     class Meta:
         model = Visit
+        list_serializer_class = EagerLoadingListSerializer
         fields = [
             'id', 'visit_number', 'patient', 'patient_name', 'patient_id', 'patient_photo',
             'patient_mobile', 'patient_age', 'patient_gender',
@@ -44,20 +51,52 @@ class VisitListSerializer(serializers.ModelSerializer):
 
     def get_waiting_time(self, obj):
         """Get waiting time in minutes"""
+        # Annotated by VisitQuerySet.for_listing()
+        if hasattr(obj, 'waiting_time'):
+            return obj.waiting_time
         return obj.calculate_waiting_time()
 
 
-class VisitDetailSerializer(serializers.ModelSerializer):
+class VisitPatientDetailsSerializer(CachedFieldsModelSerializer):
+    """Essential patient details nested in VisitDetailSerializer"""
+
+    full_name = serializers.CharField(read_only=True)
+    mobile = serializers.CharField(source='mobile_primary', read_only=True)
+
+    class Meta:
+        model = PatientProfile
+        fields = ['patient_id', 'full_name', 'age', 'gender', 'blood_group', 'mobile']
+        read_only_fields = fields
+
+
+class VisitDoctorDetailsSerializer(CachedFieldsModelSerializer):
+    """Essential doctor details nested in VisitDetailSerializer"""
+
+    full_name = serializers.CharField(read_only=True)
+    specialties = serializers.SlugRelatedField(many=True, read_only=True, slug_field='name')
+    # Fees render as str(Decimal), as this payload always has
+    consultation_fee = serializers.CharField(read_only=True)
+    follow_up_fee = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = DoctorProfile
+        fields = ['id', 'full_name', 'specialties', 'consultation_fee', 'follow_up_fee']
+        read_only_fields = fields
+
+
+class VisitDetailSerializer(CachedFieldsModelSerializer):
     """Detailed visit serializer with all relationships"""
 
     patient_name = serializers.CharField(source='patient.full_name', read_only=True)
-    patient_details = serializers.SerializerMethodField()
+    patient_details = VisitPatientDetailsSerializer(source='patient', read_only=True)
     doctor_name = serializers.CharField(source='doctor.full_name', read_only=True)
-    doctor_details = serializers.SerializerMethodField()
+    doctor_details = VisitDoctorDetailsSerializer(source='doctor', read_only=True)
     referred_by_name = serializers.CharField(source='referred_by.full_name', read_only=True)
     waiting_time = serializers.SerializerMethodField()
-    has_opd_bill = serializers.SerializerMethodField()
-    has_clinical_note = serializers.SerializerMethodField()
+    # Annotated by VisitQuerySet.with_record_flags(); a visit rendered straight
+    # after creation has neither record yet, hence the default.
+    has_opd_bill = serializers.BooleanField(read_only=True, default=False)
+    has_clinical_note = serializers.BooleanField(read_only=True, default=False)
     active_ipd_admission = serializers.SerializerMethodField()
 
     class Meta:
@@ -68,41 +107,10 @@ class VisitDetailSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
 
-    def get_patient_details(self, obj):
-        """Get essential patient details"""
-        return {
-            'patient_id': obj.patient.patient_id,
-            'full_name': obj.patient.full_name,
-            'age': obj.patient.age,
-            'gender': obj.patient.gender,
-            'blood_group': obj.patient.blood_group,
-            'mobile': obj.patient.mobile_primary,
-        }
-
-    def get_doctor_details(self, obj):
-        """Get essential doctor details"""
-        if obj.doctor:
-            return {
-                'id': obj.doctor.id,
-                'full_name': obj.doctor.full_name,
-                'specialties': [s.name for s in obj.doctor.specialties.all()],
-                'consultation_fee': str(obj.doctor.consultation_fee),
-                'follow_up_fee': str(obj.doctor.follow_up_fee),
-            }
-        return None
-
     def get_waiting_time(self, obj):
         """Get waiting time"""
         return obj.calculate_waiting_time()
 
-    def get_has_opd_bill(self, obj):
-        """Check if visit has OPD bill"""
-        return obj.opd_bills.exists()
-
-    def get_has_clinical_note(self, obj):
-        """Check if visit has clinical note"""
-        return hasattr(obj, 'clinical_note')
-
     def get_active_ipd_admission(self, obj):
         """Return minimal active IPD admission data so the frontend avoids a separate API call."""
         try:
@@ -117,7 +125,7 @@ class VisitDetailSerializer(serializers.ModelSerializer):
             return None
 
 
-class VisitCreateUpdateSerializer(serializers.ModelSerializer):
+class VisitCreateUpdateSerializer(CachedFieldsModelSerializer):
     """Serializer for creating/updating visits"""
 
     class Meta:
@@ -173,7 +181,7 @@ class VisitSetFollowUpSerializer(serializers.Serializer):
 # OPD BILL SERIALIZERS
 # ============================================================================
 
-class OPDBillItemSerializer(serializers.ModelSerializer):
+class OPDBillItemSerializer(CachedFieldsModelSerializer):
     """Serializer for OPD Bill Items."""
 
     class Meta:
@@ -189,12 +197,13 @@ class OPDBillItemSerializer(serializers.ModelSerializer):
         ]
 
 
-class OPDBillListSerializer(serializers.ModelSerializer):
+class OPDBillListSerializer(CachedFieldsModelSerializer):
     """Serializer for listing OPD bills"""
 
-    patient_name = serializers.CharField(source='visit.patient.full_name', read_only=True, allow_null=True, default=None)
-    doctor_name = serializers.CharField(source='doctor.full_name', read_only=True, allow_null=True, default=None)
-    visit_number = serializers.CharField(source='visit.visit_number', read_only=True, allow_null=True, default=None)
+    # Display copies kept on the bill row (see OPDBill.DISPLAY_CACHE_FIELDS)
+    patient_name = serializers.CharField(source='patient_name_cache', read_only=True)
+    doctor_name = serializers.CharField(source='doctor_name_cache', read_only=True, allow_null=True)
+    visit_number = serializers.CharField(source='visit_number_cache', read_only=True)
     items = OPDBillItemSerializer(many=True, read_only=True)
 
     class Meta:
@@ -208,7 +217,7 @@ class OPDBillListSerializer(serializers.ModelSerializer):
         read_only_fields = ['bill_number', 'bill_date']
 
 
-class OPDBillDetailSerializer(serializers.ModelSerializer):
+class OPDBillDetailSerializer(CachedFieldsModelSerializer):
     """Detailed OPD bill serializer"""
 
     patient_name = serializers.CharField(source='visit.patient.full_name', read_only=True, allow_null=True, default=None)
@@ -225,7 +234,7 @@ class OPDBillDetailSerializer(serializers.ModelSerializer):
         ]
 
 
-class OPDBillCreateUpdateSerializer(serializers.ModelSerializer):
+class OPDBillCreateUpdateSerializer(CachedFieldsModelSerializer):
     """Serializer for creating/updating OPD bills"""
 
     class Meta:
@@ -286,7 +295,7 @@ class OPDBillCreateUpdateSerializer(serializers.ModelSerializer):
 
         return super().create(validated_data)
 
-class ProcedureMasterListSerializer(serializers.ModelSerializer):
+class ProcedureMasterListSerializer(CachedFieldsModelSerializer):
 
     """Serializer for listing procedure masters"""
 
@@ -297,7 +306,7 @@ class ProcedureMasterListSerializer(serializers.ModelSerializer):
         ]
 
 
-class ProcedureMasterDetailSerializer(serializers.ModelSerializer):
+class ProcedureMasterDetailSerializer(CachedFieldsModelSerializer):
 
     """Detailed procedure master serializer"""
 
@@ -307,7 +316,7 @@ class ProcedureMasterDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class ProcedureMasterCreateUpdateSerializer(serializers.ModelSerializer):
+class ProcedureMasterCreateUpdateSerializer(CachedFieldsModelSerializer):
     """Serializer for creating/updating procedure masters"""
 
     class Meta:
@@ -317,13 +326,6 @@ class ProcedureMasterCreateUpdateSerializer(serializers.ModelSerializer):
             'default_charge', 'is_active'
         ]
 
-    def validate_code(self, value):
-        """Validate unique code"""
-        if self.instance is None:  # Only for creation
-            if ProcedureMaster.objects.filter(code=value).exists():
-                raise serializers.ValidationError("Procedure code already exists")
-        return value
-
     def create(self, validated_data):
         """Create procedure master with tenant_id"""
         request = self.context.get('request')
@@ -332,14 +334,27 @@ class ProcedureMasterCreateUpdateSerializer(serializers.ModelSerializer):
         if request and hasattr(request, 'tenant_id'):
             validated_data['tenant_id'] = request.tenant_id
 
-        return super().create(validated_data)
+        with self._unique_code():
+            return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        """Update procedure master"""
+        with self._unique_code():
+            return super().update(instance, validated_data)
+
+    def _unique_code(self):
+        """Report a duplicate (tenant_id, code) as a field error."""
+        return unique_violation(
+            (ProcedureMaster, ['tenant_id', 'code']),
+            {'code': 'Procedure code already exists'}
+        )
 
 
 # ============================================================================
 # SERVICE SERIALIZERS
 # ============================================================================
 
-class ServiceListSerializer(serializers.ModelSerializer):
+class ServiceListSerializer(CachedFieldsModelSerializer):
     """Serializer for listing services"""
 
     class Meta:
@@ -349,7 +364,7 @@ class ServiceListSerializer(serializers.ModelSerializer):
         ]
 
 
-class ServiceDetailSerializer(serializers.ModelSerializer):
+class ServiceDetailSerializer(CachedFieldsModelSerializer):
     """Detailed service serializer"""
 
     class Meta:
@@ -358,7 +373,7 @@ class ServiceDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class ServiceCreateUpdateSerializer(serializers.ModelSerializer):
+class ServiceCreateUpdateSerializer(CachedFieldsModelSerializer):
     """Serializer for creating/updating services"""
 
     class Meta:
@@ -390,15 +405,13 @@ class ServiceCreateUpdateSerializer(serializers.ModelSerializer):
 # PROCEDURE PACKAGE SERIALIZERS
 # ============================================================================
 
-class ProcedurePackageListSerializer(serializers.ModelSerializer):
+class ProcedurePackageListSerializer(CachedFieldsModelSerializer):
     """Serializer for listing procedure packages"""
 
-    procedure_count = serializers.IntegerField(
-        source='procedures.count',
-        read_only=True
-    )
+    # Annotated by ProcedurePackage.objects.with_procedure_count()
+    procedure_count = serializers.IntegerField(read_only=True)
+    # Annotated by ProcedurePackage.objects.with_savings()
     savings = serializers.DecimalField(
-        source='savings_amount',
         max_digits=10,
         decimal_places=2,
         read_only=True
@@ -412,16 +425,19 @@ class ProcedurePackageListSerializer(serializers.ModelSerializer):
         ]
 
 
-class ProcedurePackageDetailSerializer(serializers.ModelSerializer):
+class ProcedurePackageDetailSerializer(CachedFieldsModelSerializer):
     """Detailed procedure package serializer"""
 
     procedures = ProcedureMasterListSerializer(many=True, read_only=True)
+    # Annotated by ProcedurePackage.objects.with_savings()
     discount_percent = serializers.DecimalField(
+        source='savings_percent',
         max_digits=5,
         decimal_places=2,
         read_only=True
     )
     savings_amount = serializers.DecimalField(
+        source='savings',
         max_digits=10,
         decimal_places=2,
         read_only=True
@@ -433,7 +449,7 @@ class ProcedurePackageDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class ProcedurePackageCreateUpdateSerializer(serializers.ModelSerializer):
+class ProcedurePackageCreateUpdateSerializer(CachedFieldsModelSerializer):
     """Serializer for creating/updating procedure packages"""
 
     class Meta:
@@ -654,15 +670,18 @@ class ProcedurePackageCreateUpdateSerializer(serializers.ModelSerializer):
 # CLINICAL NOTE SERIALIZERS
 # ============================================================================
 
-class ClinicalNoteListSerializer(serializers.ModelSerializer):
+class ClinicalNoteListSerializer(CachedFieldsModelSerializer):
     """Serializer for listing clinical notes"""
 
     visit_number = serializers.CharField(source='visit.visit_number', read_only=True)
     patient_name = serializers.CharField(source='visit.patient.full_name', read_only=True)
     diagnosis_short = serializers.SerializerMethodField()
 
+    eager_lookups = ('visit__patient',)
+
     class Meta:
         model = ClinicalNote
+        list_serializer_class = EagerLoadingListSerializer
         fields = [
             'id', 'visit', 'visit_number', 'patient_name', 'note_date',
             'diagnosis_short', 'next_followup_date'
@@ -670,12 +689,15 @@ class ClinicalNoteListSerializer(serializers.ModelSerializer):
 
     def get_diagnosis_short(self, obj):
         """Return truncated diagnosis"""
+        # Annotated by ClinicalNoteViewSet.get_queryset() for list
+        if hasattr(obj, 'diagnosis_short'):
+            return obj.diagnosis_short
         if obj.diagnosis:
             return obj.diagnosis[:100] + ('...' if len(obj.diagnosis) > 100 else '')
         return None
 
 
-class ClinicalNoteDetailSerializer(serializers.ModelSerializer):
+class ClinicalNoteDetailSerializer(CachedFieldsModelSerializer):
     """Detailed clinical note serializer"""
 
     visit_number = serializers.CharField(source='visit.visit_number', read_only=True)
@@ -688,7 +710,7 @@ class ClinicalNoteDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ['note_date', 'created_at', 'updated_at']
 
 
-class ClinicalNoteCreateUpdateSerializer(serializers.ModelSerializer):
+class ClinicalNoteCreateUpdateSerializer(CachedFieldsModelSerializer):
     """Serializer for creating/updating clinical notes"""
 
     class Meta:
@@ -700,15 +722,9 @@ class ClinicalNoteCreateUpdateSerializer(serializers.ModelSerializer):
             'suggested_surgery_name', 'suggested_surgery_reason',
             'referred_doctor', 'next_followup_date'
         ]
-
-    def validate_visit(self, value):
-        """Validate that visit doesn't already have a clinical note"""
-        if self.instance is None:  # Only for creation
-            if hasattr(value, 'clinical_note'):
-                raise serializers.ValidationError(
-                    "This visit already has a clinical note"
-                )
-        return value
+        # One note per visit is enforced by the visit column's unique
+        # constraint; see _unique_visit()
+        extra_kwargs = {'visit': {'validators': []}}
 
     def create(self, validated_data):
         """Create clinical note"""
@@ -722,14 +738,27 @@ class ClinicalNoteCreateUpdateSerializer(serializers.ModelSerializer):
         if request and hasattr(request, 'user_id'):
             validated_data['created_by_id'] = request.user_id
 
-        return super().create(validated_data)
+        with self._unique_visit():
+            return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        """Update clinical note"""
+        with self._unique_visit():
+            return super().update(instance, validated_data)
+
+    def _unique_visit(self):
+        """Report a second note for the same visit as a field error."""
+        return unique_violation(
+            (ClinicalNote, ['visit']),
+            {'visit': 'This visit already has a clinical note'}
+        )
 
 
 # ============================================================================
 # VISIT FINDING SERIALIZERS
 # ============================================================================
 
-class VisitFindingListSerializer(serializers.ModelSerializer):
+class VisitFindingListSerializer(CachedFieldsModelSerializer):
     """Serializer for listing visit findings"""
 
     visit_number = serializers.CharField(source='visit.visit_number', read_only=True)
@@ -737,8 +766,11 @@ class VisitFindingListSerializer(serializers.ModelSerializer):
     blood_pressure = serializers.CharField(read_only=True)
     bmi_category = serializers.CharField(read_only=True)
 
+    eager_lookups = ('visit__patient',)
+
     class Meta:
         model = VisitFinding
+        list_serializer_class = EagerLoadingListSerializer
         fields = [
             'id', 'visit', 'visit_number', 'patient_name', 'finding_date',
             'finding_type', 'temperature', 'pulse', 'blood_pressure',
@@ -747,7 +779,7 @@ class VisitFindingListSerializer(serializers.ModelSerializer):
         read_only_fields = ['bmi', 'finding_date']
 
 
-class VisitFindingDetailSerializer(serializers.ModelSerializer):
+class VisitFindingDetailSerializer(CachedFieldsModelSerializer):
     """Detailed visit finding serializer"""
 
     visit_number = serializers.CharField(source='visit.visit_number', read_only=True)
@@ -763,7 +795,7 @@ class VisitFindingDetailSerializer(serializers.ModelSerializer):
         ]
 
 
-class VisitFindingCreateUpdateSerializer(serializers.ModelSerializer):
+class VisitFindingCreateUpdateSerializer(CachedFieldsModelSerializer):
     """Serializer for creating/updating visit findings"""
 
     class Meta:
@@ -794,51 +826,40 @@ class VisitFindingCreateUpdateSerializer(serializers.ModelSerializer):
 # VISIT ATTACHMENT SERIALIZERS
 # ============================================================================
 
-class VisitAttachmentListSerializer(serializers.ModelSerializer):
+class VisitAttachmentListSerializer(CachedFieldsModelSerializer):
     """Serializer for listing visit attachments"""
 
     visit_number = serializers.CharField(source='visit.visit_number', read_only=True)
-    file_size = serializers.SerializerMethodField()
-    file_extension = serializers.SerializerMethodField()
+    # Both read stored columns (file_size_bytes / file_extension), not storage
+    file_size = serializers.CharField(source='get_file_size', read_only=True)
+    file_extension = serializers.CharField(source='get_file_extension', read_only=True)
+
+    eager_lookups = ('visit',)
 
     class Meta:
         model = VisitAttachment
+        list_serializer_class = EagerLoadingListSerializer
         fields = [
             'id', 'visit', 'visit_number', 'file_name', 'file_type',
             'file_size', 'file_extension', 'uploaded_at'
         ]
 
-    def get_file_size(self, obj):
-        """Get file size"""
-        return obj.get_file_size()
-
-    def get_file_extension(self, obj):
-        """Get file extension"""
-        return obj.get_file_extension()
-
 
-class VisitAttachmentDetailSerializer(serializers.ModelSerializer):
+class VisitAttachmentDetailSerializer(CachedFieldsModelSerializer):
     """Detailed visit attachment serializer"""
 
     visit_number = serializers.CharField(source='visit.visit_number', read_only=True)
-    file_size = serializers.SerializerMethodField()
-    file_extension = serializers.SerializerMethodField()
+    # Both read stored columns (file_size_bytes / file_extension), not storage
+    file_size = serializers.CharField(source='get_file_size', read_only=True)
+    file_extension = serializers.CharField(source='get_file_extension', read_only=True)
 
     class Meta:
         model = VisitAttachment
         fields = '__all__'
         read_only_fields = ['uploaded_at']
 
-    def get_file_size(self, obj):
-        """Get file size"""
-        return obj.get_file_size()
 
-    def get_file_extension(self, obj):
-        """Get file extension"""
-        return obj.get_file_extension()
-
-
-class VisitAttachmentCreateUpdateSerializer(serializers.ModelSerializer):
+class VisitAttachmentCreateUpdateSerializer(CachedFieldsModelSerializer):
     """Serializer for creating/updating visit attachments"""
 
     class Meta:
@@ -892,13 +913,11 @@ class OPDBillStatisticsSerializer(serializers.Serializer):
 # CLINICAL NOTE TEMPLATE GROUP SERIALIZERS
 # ============================================================================
 
-class ClinicalNoteTemplateGroupListSerializer(serializers.ModelSerializer):
+class ClinicalNoteTemplateGroupListSerializer(CachedFieldsModelSerializer):
     """Serializer for listing template groups"""
 
-    template_count = serializers.IntegerField(
-        source='templates.count',
-        read_only=True
-    )
+    # Annotated by ClinicalNoteTemplateGroupViewSet.queryset
+    template_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = ClinicalNoteTemplateGroup
@@ -908,13 +927,11 @@ class ClinicalNoteTemplateGroupListSerializer(serializers.ModelSerializer):
         ]
 
 
-class ClinicalNoteTemplateGroupDetailSerializer(serializers.ModelSerializer):
+class ClinicalNoteTemplateGroupDetailSerializer(CachedFieldsModelSerializer):
     """Detailed template group serializer"""
 
-    template_count = serializers.IntegerField(
-        source='templates.count',
-        read_only=True
-    )
+    # Annotated by ClinicalNoteTemplateGroupViewSet.queryset
+    template_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = ClinicalNoteTemplateGroup
@@ -922,7 +939,7 @@ class ClinicalNoteTemplateGroupDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class ClinicalNoteTemplateGroupCreateUpdateSerializer(serializers.ModelSerializer):
+class ClinicalNoteTemplateGroupCreateUpdateSerializer(CachedFieldsModelSerializer):
     """Serializer for creating/updating template groups"""
 
     class Meta:
@@ -944,7 +961,7 @@ class ClinicalNoteTemplateGroupCreateUpdateSerializer(serializers.ModelSerialize
 # CLINICAL NOTE TEMPLATE FIELD OPTION SERIALIZERS
 # ============================================================================
 
-class ClinicalNoteTemplateFieldOptionSerializer(serializers.ModelSerializer):
+class ClinicalNoteTemplateFieldOptionSerializer(CachedFieldsModelSerializer):
     """Serializer for template field options"""
 
     class Meta:
@@ -959,13 +976,11 @@ class ClinicalNoteTemplateFieldOptionSerializer(serializers.ModelSerializer):
 # CLINICAL NOTE TEMPLATE FIELD SERIALIZERS
 # ============================================================================
 
-class ClinicalNoteTemplateFieldListSerializer(serializers.ModelSerializer):
+class ClinicalNoteTemplateFieldListSerializer(CachedFieldsModelSerializer):
     """Serializer for listing template fields"""
 
-    option_count = serializers.IntegerField(
-        source='options.count',
-        read_only=True
-    )
+    # Annotated by ClinicalNoteTemplateFieldViewSet.get_queryset() for list
+    option_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = ClinicalNoteTemplateField
@@ -975,7 +990,7 @@ class ClinicalNoteTemplateFieldListSerializer(serializers.ModelSerializer):
         ]
 
 
-class ClinicalNoteTemplateFieldDetailSerializer(serializers.ModelSerializer):
+class ClinicalNoteTemplateFieldDetailSerializer(CachedFieldsModelSerializer):
     """Detailed template field serializer with options"""
 
     options = ClinicalNoteTemplateFieldOptionSerializer(many=True, read_only=True)
@@ -986,7 +1001,7 @@ class ClinicalNoteTemplateFieldDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class ClinicalNoteTemplateFieldCreateUpdateSerializer(serializers.ModelSerializer):
+class ClinicalNoteTemplateFieldCreateUpdateSerializer(CachedFieldsModelSerializer):
     """Serializer for creating/updating template fields"""
 
     options = ClinicalNoteTemplateFieldOptionSerializer(many=True, required=False)
@@ -1028,13 +1043,15 @@ class ClinicalNoteTemplateFieldCreateUpdateSerializer(serializers.ModelSerialize
         # Create field
         field = ClinicalNoteTemplateField.objects.create(**validated_data)
 
-        # Create options
-        for option_data in options_data:
-            ClinicalNoteTemplateFieldOption.objects.create(
+        # Create options in one INSERT
+        ClinicalNoteTemplateFieldOption.objects.bulk_create([
+            ClinicalNoteTemplateFieldOption(
                 field=field,
                 tenant_id=validated_data['tenant_id'],
                 **option_data
             )
+            for option_data in options_data
+        ])
 
         return field
 
@@ -1050,16 +1067,33 @@ class ClinicalNoteTemplateFieldCreateUpdateSerializer(serializers.ModelSerialize
 
         # Update options if provided
         if options_data is not None:
-            # Delete existing options
-            instance.options.all().delete()
-
-            # Create new options
+            # Match options on option_value (unique per field) so the ones
+            # that survive the edit keep their ids, and with them the
+            # selected_options of responses that picked them
+            existing = {option.option_value: option for option in instance.options.all()}
+            changed = []
+            new_options = []
             for option_data in options_data:
-                ClinicalNoteTemplateFieldOption.objects.create(
-                    field=instance,
-                    tenant_id=instance.tenant_id,
-                    **option_data
-                )
+                option = existing.pop(option_data['option_value'], None)
+                if option is None:
+                    new_options.append(ClinicalNoteTemplateFieldOption(
+                        field=instance,
+                        tenant_id=instance.tenant_id,
+                        **option_data
+                    ))
+                elif any(getattr(option, attr) != value for attr, value in option_data.items()):
+                    for attr, value in option_data.items():
+                        setattr(option, attr, value)
+                    changed.append(option)
+
+            # Options no longer listed are removed
+            if existing:
+                ClinicalNoteTemplateFieldOption.objects.filter(
+                    pk__in=[option.pk for option in existing.values()]
+                ).delete()
+            if changed:
+                ClinicalNoteTemplateFieldOption.objects.bulk_update(changed, ['option_label', 'display_order'])
+            ClinicalNoteTemplateFieldOption.objects.bulk_create(new_options)
 
         return instance
 
@@ -1068,24 +1102,25 @@ class ClinicalNoteTemplateFieldCreateUpdateSerializer(serializers.ModelSerialize
 # CLINICAL NOTE TEMPLATE SERIALIZERS
 # ============================================================================
 
-class ClinicalNoteTemplateListSerializer(serializers.ModelSerializer):
+class ClinicalNoteTemplateListSerializer(CachedFieldsModelSerializer):
     """Serializer for listing templates"""
 
     group_name = serializers.CharField(source='group.name', read_only=True, allow_null=True)
-    field_count = serializers.IntegerField(
-        source='fields.count',
-        read_only=True
-    )
+    # Annotated by ClinicalNoteTemplateViewSet.get_queryset() for list
+    field_count = serializers.IntegerField(read_only=True)
+
+    eager_lookups = ('group',)
 
     class Meta:
         model = ClinicalNoteTemplate
+        list_serializer_class = EagerLoadingListSerializer
         fields = [
             'id', 'name', 'code', 'group', 'group_name',
             'field_count', 'is_active', 'display_order'
         ]
 
 
-class ClinicalNoteTemplateDetailSerializer(serializers.ModelSerializer):
+class ClinicalNoteTemplateDetailSerializer(CachedFieldsModelSerializer):
     """Detailed template serializer with fields"""
 
     group_name = serializers.CharField(source='group.name', read_only=True, allow_null=True)
@@ -1097,7 +1132,7 @@ class ClinicalNoteTemplateDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class ClinicalNoteTemplateCreateUpdateSerializer(serializers.ModelSerializer):
+class ClinicalNoteTemplateCreateUpdateSerializer(CachedFieldsModelSerializer):
     """Serializer for creating/updating templates"""
 
     fields = ClinicalNoteTemplateFieldCreateUpdateSerializer(many=True, required=False)
@@ -1137,7 +1172,8 @@ class ClinicalNoteTemplateCreateUpdateSerializer(serializers.ModelSerializer):
         # Create template
         template = ClinicalNoteTemplate.objects.create(**validated_data)
 
-        # Create fields
+        # Create fields; their options go out in one INSERT afterwards
+        options = []
         for field_data in fields_data:
             options_data = field_data.pop('options', [])
 
@@ -1147,13 +1183,16 @@ class ClinicalNoteTemplateCreateUpdateSerializer(serializers.ModelSerializer):
                 **field_data
             )
 
-            # Create options for this field
-            for option_data in options_data:
-                ClinicalNoteTemplateFieldOption.objects.create(
+            options.extend(
+                ClinicalNoteTemplateFieldOption(
                     field=field,
                     tenant_id=validated_data['tenant_id'],
                     **option_data
                 )
+                for option_data in options_data
+            )
+
+        ClinicalNoteTemplateFieldOption.objects.bulk_create(options)
 
         return template
 
@@ -1172,7 +1211,8 @@ class ClinicalNoteTemplateCreateUpdateSerializer(serializers.ModelSerializer):
             # Delete existing fields (cascade will delete options)
             instance.fields.all().delete()
 
-            # Create new fields
+            # Create new fields; their options go out in one INSERT afterwards
+            options = []
             for field_data in fields_data:
                 options_data = field_data.pop('options', [])
 
@@ -1182,13 +1222,16 @@ class ClinicalNoteTemplateCreateUpdateSerializer(serializers.ModelSerializer):
                     **field_data
                 )
 
-                # Create options for this field
-                for option_data in options_data:
-                    ClinicalNoteTemplateFieldOption.objects.create(
+                options.extend(
+                    ClinicalNoteTemplateFieldOption(
                         field=field,
                         tenant_id=instance.tenant_id,
                         **option_data
                     )
+                    for option_data in options_data
+                )
+
+            ClinicalNoteTemplateFieldOption.objects.bulk_create(options)
 
         return instance
 
@@ -1197,7 +1240,7 @@ class ClinicalNoteTemplateCreateUpdateSerializer(serializers.ModelSerializer):
 # CLINICAL NOTE TEMPLATE FIELD RESPONSE SERIALIZERS
 # ============================================================================
 
-class ClinicalNoteTemplateFieldResponseSerializer(serializers.ModelSerializer):
+class ClinicalNoteTemplateFieldResponseSerializer(CachedFieldsModelSerializer):
     """Serializer for template field responses"""
 
     field_label = serializers.CharField(source='field.field_label', read_only=True)
@@ -1205,8 +1248,11 @@ class ClinicalNoteTemplateFieldResponseSerializer(serializers.ModelSerializer):
     display_value = serializers.SerializerMethodField()
     selected_options = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
 
+    eager_lookups = ('field', 'selected_options')
+
     class Meta:
         model = ClinicalNoteTemplateFieldResponse
+        list_serializer_class = EagerLoadingListSerializer
         fields = [
             'id', 'field', 'field_label', 'field_type',
             'value_text', 'value_number', 'value_boolean',
@@ -1220,7 +1266,22 @@ class ClinicalNoteTemplateFieldResponseSerializer(serializers.ModelSerializer):
         return obj.get_display_value()
 
 
-class ClinicalNoteTemplateFieldResponseCreateUpdateSerializer(serializers.ModelSerializer):
+class ClinicalNoteTemplateFieldResponseListSerializer(ClinicalNoteTemplateFieldResponseSerializer):
+    """List serializer for template field responses (no canvas JSON)"""
+
+    has_canvas = serializers.BooleanField(read_only=True)
+
+    class Meta(ClinicalNoteTemplateFieldResponseSerializer.Meta):
+        fields = [
+            'id', 'field', 'field_label', 'field_type',
+            'value_text', 'value_number', 'value_boolean',
+            'value_date', 'value_datetime', 'value_time', 'value_json',
+            'has_canvas', 'canvas_thumbnail',
+            'selected_options', 'display_value'
+        ]
+
+
+class ClinicalNoteTemplateFieldResponseCreateUpdateSerializer(CachedFieldsModelSerializer):
     """Serializer for creating/updating field responses"""
 
     # Explicitly allow null for all value fields
@@ -1246,12 +1307,38 @@ class ClinicalNoteTemplateFieldResponseCreateUpdateSerializer(serializers.ModelS
             'value_json', 'full_canvas_json', 'selected_options'
         ]
 
+    @transaction.atomic
+    def create(self, validated_data):
+        """Create field response and link its options in one INSERT"""
+        selected_options = validated_data.pop('selected_options', [])
+        instance = super().create(validated_data)
+        ClinicalNoteTemplateFieldResponse.bulk_link_selected_options([(instance, selected_options)])
+        return instance
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        """Update field response, replacing its options without a diff read"""
+        selected_options = validated_data.pop('selected_options', None)
+        instance = super().update(instance, validated_data)
+        if selected_options is not None:
+            instance.replace_selected_options([option.pk for option in selected_options])
+        return instance
+
 
 # ============================================================================
 # CLINICAL NOTE TEMPLATE RESPONSE SERIALIZERS
 # ============================================================================
 
-class ClinicalNoteTemplateResponseListSerializer(serializers.ModelSerializer):
+class ClinicalNoteTemplateResponseUserNamesListSerializer(serializers.ListSerializer):
+    """Resolves user names for the whole page in one query before rendering."""
+
+    def to_representation(self, data):
+        responses = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        ClinicalNoteTemplateResponse.attach_user_names(responses)
+        return super().to_representation(responses)
+
+
+class ClinicalNoteTemplateResponseListSerializer(CachedFieldsModelSerializer):
     """Serializer for listing template responses"""
 
     template_name = serializers.CharField(source='template.name', read_only=True)
@@ -1261,16 +1348,22 @@ class ClinicalNoteTemplateResponseListSerializer(serializers.ModelSerializer):
         source='field_responses.count',
         read_only=True
     )
+    # Set by ClinicalNoteTemplateResponse.attach_user_names() (many=True only)
+    filled_by_name = serializers.CharField(read_only=True, default=None)
+    reviewed_by_name = serializers.CharField(read_only=True, default=None)
+    original_assigned_doctor_name = serializers.CharField(read_only=True, default=None)
 
     class Meta:
         model = ClinicalNoteTemplateResponse
+        list_serializer_class = ClinicalNoteTemplateResponseUserNamesListSerializer
         fields = [
             'id', 'content_type', 'object_id', 'encounter_type', 'encounter_display',
             'template', 'template_name', 'response_date',
             'field_response_count', 'status',
             'response_sequence', 'is_reviewed', 'original_assigned_doctor_id',
+            'original_assigned_doctor_name',
             'doctor_switched_reason', 'canvas_data',
-            'filled_by_id', 'reviewed_by_id', 'reviewed_at'
+            'filled_by_id', 'filled_by_name', 'reviewed_by_id', 'reviewed_by_name', 'reviewed_at'
         ]
         read_only_fields = ['response_date', 'response_sequence', 'content_type', 'object_id']
 
@@ -1290,7 +1383,7 @@ class ClinicalNoteTemplateResponseListSerializer(serializers.ModelSerializer):
         return None
 
 
-class ClinicalNoteTemplateResponseDetailSerializer(serializers.ModelSerializer):
+class ClinicalNoteTemplateResponseDetailSerializer(CachedFieldsModelSerializer):
     """Detailed template response serializer with field responses"""
 
     template_name = serializers.CharField(source='template.name', read_only=True)
@@ -1308,6 +1401,11 @@ class ClinicalNoteTemplateResponseDetailSerializer(serializers.ModelSerializer):
             'content_type', 'object_id', 'tenant_id'
         ]
 
+    def to_representation(self, instance):
+        # Nested rows and the summary share one load of the field responses
+        instance.prefetch_field_responses()
+        return super().to_representation(instance)
+
     def get_summary(self, obj):
         """Get generated summary"""
         return obj.generate_summary()
@@ -1328,7 +1426,7 @@ class ClinicalNoteTemplateResponseDetailSerializer(serializers.ModelSerializer):
         return None
 
 
-class ClinicalNoteTemplateResponseCreateUpdateSerializer(serializers.ModelSerializer):
+class ClinicalNoteTemplateResponseCreateUpdateSerializer(CachedFieldsModelSerializer):
     """Serializer for creating/updating template responses"""
 
     field_responses = ClinicalNoteTemplateFieldResponseCreateUpdateSerializer(many=True, required=False)
@@ -1378,9 +1476,9 @@ class ClinicalNoteTemplateResponseCreateUpdateSerializer(serializers.ModelSerial
         # Set content_type and object_id from encounter fields
         if encounter_type and object_id:
             if encounter_type.lower() == 'visit' or encounter_type.lower() == 'opd':
-                content_type = ContentType.objects.get(app_label='opd', model='visit')
+                content_type = ContentType.objects.get_by_natural_key('opd', 'visit')
             elif encounter_type.lower() == 'admission' or encounter_type.lower() == 'ipd':
-                content_type = ContentType.objects.get(app_label='ipd', model='admission')
+                content_type = ContentType.objects.get_by_natural_key('ipd', 'admission')
             else:
                 raise serializers.ValidationError({
                     'encounter_type': f'Invalid encounter type: {encounter_type}. Must be "visit", "opd", "admission", or "ipd".'
@@ -1398,24 +1496,34 @@ class ClinicalNoteTemplateResponseCreateUpdateSerializer(serializers.ModelSerial
             ).aggregate(models.Max('response_sequence'))['response_sequence__max']
             validated_data['response_sequence'] = (max_seq or 0) + 1
 
-        # Create response
-        response = ClinicalNoteTemplateResponse.objects.create(**validated_data)
+        # Create response. Two concurrent creates can compute the same
+        # sequence; unique_response_per_encounter_template rejects the second.
+        with unique_violation('unique_response_per_encounter_template', {
+            'response_sequence': 'Another response for this template was saved at the same time; please retry.'
+        }):
+            response = ClinicalNoteTemplateResponse.objects.create(**validated_data)
 
-        # Create field responses
+        # Create field responses in one INSERT
+        field_responses = []
+        pending_options = []
         for field_response_data in field_responses_data:
             # Extract selected_options before creating (ManyToMany must be set after object creation)
             selected_options = field_response_data.pop('selected_options', [])
 
-            # Create the field response
-            field_response = ClinicalNoteTemplateFieldResponse.objects.create(
+            field_response = ClinicalNoteTemplateFieldResponse(
                 response=response,
                 tenant_id=validated_data['tenant_id'],
                 **field_response_data
             )
+            field_responses.append(field_response)
 
-            # Set the ManyToMany relationship
             if selected_options:
-                field_response.selected_options.set(selected_options)
+                pending_options.append((field_response, selected_options))
+
+        ClinicalNoteTemplateFieldResponse.objects.bulk_create(field_responses)
+
+        # Link all selected options in one INSERT
+        ClinicalNoteTemplateFieldResponse.bulk_link_selected_options(pending_options)
 
         return response
 
@@ -1431,36 +1539,65 @@ class ClinicalNoteTemplateResponseCreateUpdateSerializer(serializers.ModelSerial
 
         # Update field responses if provided
         if field_responses_data is not None:
-            # Delete existing field responses
-            instance.field_responses.all().delete()
+            value_fields = [
+                'value_text', 'value_number', 'value_boolean',
+                'value_date', 'value_datetime', 'value_time', 'value_json', 'full_canvas_json'
+            ]
+            # Existing answers are updated in place (keeping their canvas
+            # history); anything not answered again is removed below
+            existing = {
+                field_response.field_id: field_response
+                for field_response in instance.field_responses.all()
+            }
 
-            # Create new field responses
+            pending_options = []
+            created = []
+            updated = []
             for field_response_data in field_responses_data:
-                # Check if there is any value data before creating
-                value_fields = [
-                    'value_text', 'value_number', 'value_boolean',
-                    'value_date', 'value_datetime', 'value_time', 'value_json', 'full_canvas_json'
-                ]
+                # Check if there is any value data before saving
                 has_value = any(field in field_response_data and field_response_data[field] is not None for field in value_fields)
 
                 # Also check if selected_options has any values
                 has_selected_options = 'selected_options' in field_response_data and len(field_response_data.get('selected_options', [])) > 0
 
-                # Only create if there's an actual value or selected options
+                # Only save if there's an actual value or selected options
                 if has_value or has_selected_options:
-                    # Extract selected_options before creating (ManyToMany must be set after object creation)
+                    # Extract selected_options before saving (ManyToMany must be set after object creation)
                     selected_options = field_response_data.pop('selected_options', [])
 
-                    # Create the field response
-                    field_response = ClinicalNoteTemplateFieldResponse.objects.create(
-                        response=instance,
-                        tenant_id=instance.tenant_id,
-                        **field_response_data
-                    )
+                    field_response = existing.pop(field_response_data['field'].pk, None)
+                    if field_response is None:
+                        field_response = ClinicalNoteTemplateFieldResponse(
+                            response=instance,
+                            tenant_id=instance.tenant_id,
+                            **field_response_data
+                        )
+                        created.append(field_response)
+                    else:
+                        # Unsent values reset to their defaults, as a recreated row would
+                        for field in value_fields:
+                            default = ClinicalNoteTemplateFieldResponse._meta.get_field(field).get_default()
+                            setattr(field_response, field, field_response_data.get(field, default))
+                        updated.append(field_response)
 
-                    # Set the ManyToMany relationship
                     if selected_options:
-                        field_response.selected_options.set(selected_options)
+                        pending_options.append((field_response, selected_options))
+
+            if existing:
+                ClinicalNoteTemplateFieldResponse.objects.filter(
+                    pk__in=[field_response.pk for field_response in existing.values()]
+                ).delete()
+
+            ClinicalNoteTemplateFieldResponse.objects.bulk_create(created)
+
+            if updated:
+                ClinicalNoteTemplateFieldResponse.bulk_save_with_history(updated, value_fields)
+                ClinicalNoteTemplateFieldResponse.selected_options.through.objects.filter(
+                    clinicalnotetemplatefieldresponse_id__in=[field_response.pk for field_response in updated]
+                ).delete()
+
+            # Link all selected options in one INSERT
+            ClinicalNoteTemplateFieldResponse.bulk_link_selected_options(pending_options)
 
         return instance
 
@@ -1469,7 +1606,7 @@ class ClinicalNoteTemplateResponseCreateUpdateSerializer(serializers.ModelSerial
 # CLINICAL NOTE RESPONSE TEMPLATE SERIALIZERS (Copy-Paste Templates)
 # ============================================================================
 
-class ClinicalNoteResponseTemplateListSerializer(serializers.ModelSerializer):
+class ClinicalNoteResponseTemplateListSerializer(CachedFieldsModelSerializer):
     """Serializer for listing copy-paste response templates"""
 
     class Meta:
@@ -1481,7 +1618,7 @@ class ClinicalNoteResponseTemplateListSerializer(serializers.ModelSerializer):
         read_only_fields = ['usage_count', 'created_at', 'updated_at']
 
 
-class ClinicalNoteResponseTemplateDetailSerializer(serializers.ModelSerializer):
+class ClinicalNoteResponseTemplateDetailSerializer(CachedFieldsModelSerializer):
     """Detailed copy-paste response template serializer"""
 
     source_response_details = serializers.SerializerMethodField()
@@ -1505,7 +1642,7 @@ class ClinicalNoteResponseTemplateDetailSerializer(serializers.ModelSerializer):
         return None
 
 
-class ClinicalNoteResponseTemplateCreateUpdateSerializer(serializers.ModelSerializer):
+class ClinicalNoteResponseTemplateCreateUpdateSerializer(CachedFieldsModelSerializer):
     """Serializer for creating/updating copy-paste response templates"""
 
     class Meta:
@@ -21,6 +21,7 @@ from django.db.models import (
     DurationField,
     ExpressionWrapper,
     F,
+    Prefetch,
     Q,
     Sum,
 )
@@ -125,7 +126,7 @@ def compute_doctor_stats(
     the average consultation duration is aggregated in the database, and
     all DoctorProfile rows (with specialties) are fetched in one query.
     """
-    from apps.doctors.models import DoctorProfile
+    from apps.doctors.models import DoctorProfile, Specialty
     from apps.opd.models import Visit
 
     qs = Visit.objects.filter(
@@ -189,7 +190,10 @@ def compute_doctor_stats(
         profile.id: profile
         for profile in DoctorProfile.objects.filter(
             tenant_id=tenant_id, id__in=profile_ids
-        ).prefetch_related('specialties')
+        ).prefetch_related(
+            # Only the names are joined into doctor_specialty
+            Prefetch('specialties', queryset=Specialty.objects.only('id', 'name'))
+        )
     }
 
     for row in doctor_rows:
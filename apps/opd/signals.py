@@ -1,9 +1,13 @@
 # opd/signals.py
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from django.db.models import Sum # Added Sum import
-from decimal import Decimal
-from .models import OPDBillItem, OPDBill # Added OPDBill import
+from common.cache import CeliyoCache
+from apps.doctors.models import DoctorProfile
+from apps.patients.models import PatientProfile
+from .models import (
+    OPDBillItem, OPDBill, ProcedureMaster, ProcedurePackage, MasterDataQuerySet,
+    ClinicalNoteTemplate, ClinicalNoteTemplateField,
+)
 
 @receiver([post_save, post_delete], sender=OPDBillItem)
 def update_opd_bill_totals(sender, instance, **kwargs):
@@ -11,32 +15,63 @@ def update_opd_bill_totals(sender, instance, **kwargs):
     Signal to update the parent OPDBill's totals whenever an
     OPDBillItem is saved or deleted.
     """
+    # Batched item writes recalculate the bill once themselves
+    if kwargs.get('signal') is post_save and getattr(instance, '_skip_bill_recalculation', False):
+        return
+
     if instance.bill:
         # The save() method will call _calculate_derived_totals() automatically
         # Just trigger a save to recalculate totals
-        instance.bill.save(update_fields=['total_amount', 'discount_amount', 'payable_amount', 'balance_amount', 'payment_status'])
+        instance.bill.save(update_fields=OPDBill.DERIVED_TOTAL_FIELDS)
+
+
+# Visit totals/payment status are maintained from opd_bills by a Postgres
+# trigger (migration 0017_visit_payment_totals_trigger), not by a signal.
 
 
-# New signal for OPDBill
-@receiver([post_save, post_delete], sender=OPDBill)
-def update_visit_payment_status(sender, instance, **kwargs):
+@receiver([post_save, post_delete], sender=ProcedureMaster)
+@receiver([post_save, post_delete], sender=ProcedurePackage)
+def invalidate_master_data_cache(sender, instance, **kwargs):
     """
-    Signal to update the associated Visit's payment status and total/paid amounts
-    whenever an OPDBill is saved or deleted.
+    Drop the cached copy served by ``<Model>.objects.cached()`` whenever a
+    procedure or package is saved or deleted.
     """
-    if instance.visit:
-        visit = instance.visit
+    CeliyoCache().delete(
+        MasterDataQuerySet.cache_key(sender, instance.tenant_id, instance.pk)
+    )
+
+
+@receiver([post_save, post_delete], sender=ClinicalNoteTemplateField)
+def invalidate_template_field_ids_cache(sender, instance, **kwargs):
+    """
+    Drop the cached ``{field_name: field_id}`` map served by
+    ``ClinicalNoteTemplate.get_field_ids_by_name()`` when a field changes.
+    """
+    CeliyoCache().delete(ClinicalNoteTemplate.field_ids_cache_key(instance.template_id))
+
+
+def _name_changed(update_fields, name_fields):
+    """False only when an update_fields save left every name field alone."""
+    return update_fields is None or not name_fields.isdisjoint(update_fields)
 
-        # Calculate aggregated amounts from all OPDBills associated with this visit
-        bill_aggregates = OPDBill.objects.filter(visit=visit).aggregate(
-            total_amount_sum=Sum('total_amount'),
-            received_amount_sum=Sum('received_amount')
-        )
 
-        # Update visit's total and paid amounts
-        visit.total_amount = bill_aggregates['total_amount_sum'] or Decimal('0.00')
-        visit.paid_amount = bill_aggregates['received_amount_sum'] or Decimal('0.00')
+@receiver(post_save, sender=PatientProfile)
+def refresh_bill_patient_names(sender, instance, created, update_fields=None, **kwargs):
+    """Keep OPDBill.patient_name_cache in step with patient renames."""
+    if created or not _name_changed(update_fields, {'first_name', 'middle_name', 'last_name'}):
+        return
+    name = instance.full_name
+    OPDBill.objects.filter(visit__patient=instance).exclude(
+        patient_name_cache=name
+    ).update(patient_name_cache=name)
 
-        # Update payment status (this method calls save() on the Visit)
-        visit.update_payment_status()
 
+@receiver(post_save, sender=DoctorProfile)
+def refresh_bill_doctor_names(sender, instance, created, update_fields=None, **kwargs):
+    """Keep OPDBill.doctor_name_cache in step with doctor renames."""
+    if created or not _name_changed(update_fields, {'first_name', 'last_name'}):
+        return
+    name = instance.full_name
+    OPDBill.objects.filter(doctor=instance).exclude(
+        doctor_name_cache=name
+    ).update(doctor_name_cache=name)
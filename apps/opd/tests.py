@@ -1,22 +1,47 @@
 
 from decimal import Decimal
+from io import StringIO
 import datetime
 import uuid
+from contextlib import nullcontext
 from types import SimpleNamespace
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import jwt
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError
+from django.db.models.signals import post_delete, post_save
 from django.test import SimpleTestCase, TestCase
+from rest_framework.exceptions import ValidationError
 from rest_framework.test import APIClient
 
-from apps.doctors.models import DoctorProfile
+from apps.doctors.models import DoctorProfile, Specialty
 from apps.opd.management.commands.recompute_opd_bill_totals import Command
 from apps.opd.filters import VisitFilter
-from apps.opd.models import OPDBillItem, Visit
+from apps.opd.models import (
+    ClinicalNote,
+    ClinicalNoteTemplate,
+    ClinicalNoteTemplateField,
+    ClinicalNoteTemplateFieldOption,
+    ClinicalNoteTemplateFieldResponse,
+    ClinicalNoteTemplateResponse,
+    OPDBill,
+    OPDBillItem,
+    OPDNumberSequence,
+    Visit,
+    VisitAttachment,
+    VisitFinding,
+)
 from apps.patients.models import PatientProfile
-from apps.opd.serializers import VisitListSerializer, VisitSetFollowUpSerializer
+from apps.payments.models import Transaction
+from apps.opd.serializers import (
+    ClinicalNoteCreateUpdateSerializer,
+    VisitListSerializer,
+    VisitSetFollowUpSerializer,
+)
 from apps.opd.signals import update_opd_bill_totals
 from apps.opd.views import VisitViewSet, _invalidate_today_cache
 
@@ -47,6 +72,37 @@ class OPDBillSynchronizationTests(SimpleTestCase):
         synchronous_receivers, _ = post_save._live_receivers(OPDBillItem)
         self.assertIn(update_opd_bill_totals, synchronous_receivers)
 
+    def test_batched_item_save_skips_bill_recalculation(self):
+        bill = SimpleNamespace(save=Mock())
+        item = SimpleNamespace(bill=bill, _skip_bill_recalculation=True)
+
+        update_opd_bill_totals(OPDBillItem, item, signal=post_save)
+        bill.save.assert_not_called()
+
+        update_opd_bill_totals(OPDBillItem, item, signal=post_delete)
+        bill.save.assert_called_once_with(update_fields=OPDBill.DERIVED_TOTAL_FIELDS)
+
+    @patch("apps.opd.models.transaction.atomic")
+    @patch("django.db.models.Model.save")
+    def test_new_bill_is_inserted_once_with_totals(self, model_save, atomic):
+        patient = PatientProfile(first_name="Asha", last_name="Rao")
+        bill = OPDBill(
+            tenant_id=uuid.uuid4(),
+            visit=Visit(pk=1, visit_number="OPD/20260101/001", patient=patient),
+            bill_number="OPD-BILL/20260101/001",
+            received_amount=Decimal("0.00"),
+        )
+
+        bill.save()
+
+        model_save.assert_called_once_with()
+        self.assertEqual(bill.total_amount, Decimal("0.00"))
+        self.assertEqual(bill.payable_amount, Decimal("0.00"))
+        self.assertEqual(
+            (bill.visit_number_cache, bill.patient_name_cache, bill.doctor_name_cache),
+            ("OPD/20260101/001", "Asha Rao", None),
+        )
+
     def test_recompute_uses_items_and_payment_ledger(self):
         bill = SimpleNamespace(
             items_total=Decimal("1000.00"),
@@ -68,6 +124,25 @@ class OPDBillSynchronizationTests(SimpleTestCase):
         )
 
 
+class CachedSerializerFieldsTests(SimpleTestCase):
+    def test_fields_are_built_once_and_copied_per_instance(self):
+        first = VisitListSerializer().fields
+        with patch("rest_framework.serializers.ModelSerializer.get_fields") as get_fields:
+            second = VisitListSerializer().fields
+        get_fields.assert_not_called()
+        self.assertEqual(list(first), list(second))
+        self.assertIsNot(first["patient_name"], second["patient_name"])
+        self.assertIs(second["patient_name"].parent.__class__, VisitListSerializer)
+
+    @patch("common.serializers.prefetch_related_objects")
+    @patch("rest_framework.serializers.ListSerializer.to_representation", return_value=[])
+    def test_list_serializer_loads_child_lookups_for_the_page(self, render, prefetch):
+        visits = [Visit(pk=1), Visit(pk=2)]
+        VisitListSerializer(many=True).to_representation(iter(visits))
+        prefetch.assert_called_once_with(visits, "patient", "doctor")
+        render.assert_called_once_with(visits)
+
+
 class VisitFollowUpContractTests(SimpleTestCase):
     def test_visit_list_exposes_flat_patient_fields(self):
         fields = VisitListSerializer().fields
@@ -103,6 +178,136 @@ class VisitFollowUpContractTests(SimpleTestCase):
         self.assertEqual(VisitViewSet.action_permission_map["set_follow_up"], "edit")
 
 
+class FieldResponseOptionValueTests(SimpleTestCase):
+    # SimpleTestCase rejects queries, so these fail if .first()/values_list() return
+
+    def _field_response(self, field_type, options):
+        field_response = ClinicalNoteTemplateFieldResponse(
+            pk=1,
+            field=ClinicalNoteTemplateField(field_type=field_type),
+        )
+        prefetched = ClinicalNoteTemplateFieldOption.objects.none()
+        prefetched._result_cache = options
+        prefetched._prefetch_done = True
+        field_response._prefetched_objects_cache = {"selected_options": prefetched}
+        return field_response
+
+    def test_single_choice_reads_prefetched_options(self):
+        field_response = self._field_response("select", [
+            ClinicalNoteTemplateFieldOption(option_value="y", option_label="Yes"),
+        ])
+        self.assertEqual(field_response.get_value(), "y")
+        self.assertEqual(field_response.get_display_value(), "Yes")
+
+    def test_multi_choice_reads_prefetched_options(self):
+        field_response = self._field_response("checkbox", [
+            ClinicalNoteTemplateFieldOption(option_value="a", option_label="A"),
+            ClinicalNoteTemplateFieldOption(option_value="b", option_label="B"),
+        ])
+        self.assertEqual(field_response.get_value(), ["a", "b"])
+        self.assertEqual(field_response.get_display_value(), ["A", "B"])
+
+    def test_empty_single_choice_is_none(self):
+        self.assertIsNone(self._field_response("radio", []).get_value())
+
+    def test_response_reuses_prefetched_field_responses(self):
+        field_response = self._field_response("text", [])
+        response = ClinicalNoteTemplateResponse(pk=1)
+        prefetched = ClinicalNoteTemplateFieldResponse.objects.none()
+        prefetched._result_cache = [field_response]
+        prefetched._prefetch_done = True
+        response._prefetched_objects_cache = {"field_responses": prefetched}
+        self.assertEqual(response._field_responses_with_fields(), [field_response])
+        # Already prefetched, so a detail render loads nothing more
+        response.prefetch_field_responses()
+        self.assertIs(response._prefetched_objects_cache["field_responses"], prefetched)
+
+    def test_deferred_canvas_uses_placeholder(self):
+        field_response = self._field_response("canvas", [])
+        del field_response.__dict__["full_canvas_json"]
+        field_response.has_canvas = True
+        self.assertEqual(field_response.get_value(), "[canvas]")
+        self.assertTrue(field_response.get_display_value().startswith("Canvas Data"))
+
+
+def _integrity_error(constraint_name):
+    exc = IntegrityError("integrity violation")
+    exc.__cause__ = SimpleNamespace(diag=SimpleNamespace(constraint_name=constraint_name))
+    return exc
+
+
+class ClinicalNoteUniqueVisitTests(SimpleTestCase):
+    def test_visit_uniqueness_is_left_to_the_database(self):
+        self.assertEqual(ClinicalNoteCreateUpdateSerializer().fields["visit"].validators, [])
+
+    @patch("django.db.transaction.atomic", nullcontext)
+    @patch(
+        "common.serializers._unique_constraint_names",
+        {("opd.ClinicalNote", ("visit",)): {"clinical_notes_visit_id_key"}},
+    )
+    @patch("rest_framework.serializers.ModelSerializer.create")
+    def test_duplicate_visit_is_reported_as_field_error(self, create):
+        create.side_effect = _integrity_error("clinical_notes_visit_id_key")
+        with self.assertRaises(ValidationError) as caught:
+            ClinicalNoteCreateUpdateSerializer().create({"visit": Visit(pk=1)})
+        self.assertIn("visit", caught.exception.detail)
+
+    @patch("django.db.transaction.atomic", nullcontext)
+    @patch("rest_framework.serializers.ModelSerializer.create")
+    def test_other_integrity_errors_propagate(self, create):
+        create.side_effect = _integrity_error(None)
+        with self.assertRaises(IntegrityError):
+            ClinicalNoteCreateUpdateSerializer().create({"visit": Visit(pk=1)})
+
+
+class FieldResponseBulkSaveTests(SimpleTestCase):
+    def _loaded(self, pk, canvas):
+        field_response = ClinicalNoteTemplateFieldResponse(pk=pk, full_canvas_json=canvas)
+        field_response._loaded_full_canvas_json = canvas
+        return field_response
+
+    @patch("django.db.models.query.QuerySet.bulk_update")
+    def test_only_changed_canvases_write_history(self, bulk_update):
+        changed = self._loaded(1, {"elements": [1]})
+        changed.full_canvas_json = {"elements": [2]}
+        unchanged = self._loaded(2, {})
+        unchanged.value_text = "note"
+
+        ClinicalNoteTemplateFieldResponse.bulk_save_with_history(
+            [changed, unchanged], ["value_text", "full_canvas_json"]
+        )
+
+        (changed_rows, changed_fields), _ = bulk_update.call_args_list[0]
+        (unchanged_rows, unchanged_fields), _ = bulk_update.call_args_list[1]
+        self.assertEqual((changed_rows, unchanged_rows), ([changed], [unchanged]))
+        self.assertIn("canvas_version_history", changed_fields)
+        self.assertNotIn("canvas_version_history", unchanged_fields)
+        self.assertEqual(changed.canvas_version_history[-1]["elements"], [1])
+        self.assertEqual(changed._loaded_full_canvas_json, {"elements": [2]})
+
+
+class VisitAttachmentMetadataTests(SimpleTestCase):
+    @patch("django.db.models.Model.save")
+    def test_save_records_size_and_extension_from_upload(self, model_save):
+        attachment = VisitAttachment(file=SimpleUploadedFile("Scan.JPG", b"x" * 3000))
+
+        attachment.save()
+
+        self.assertEqual(attachment.file_size_bytes, 3000)
+        self.assertEqual(attachment.file_extension, ".jpg")
+        self.assertEqual(attachment.get_file_size(), "2.93 KB")
+
+    def test_listing_reads_stored_size_without_storage(self):
+        # The file does not exist on disk, so a storage stat would raise
+        attachment = VisitAttachment(
+            file="opd/attachments/2024/01/missing.pdf",
+            file_size_bytes=2048,
+            file_extension=".pdf",
+        )
+        self.assertEqual(attachment.get_file_size(), "2.00 KB")
+        self.assertEqual(attachment.get_file_extension(), ".pdf")
+
+
 class VisitCacheFailureTests(SimpleTestCase):
     @patch("apps.opd.views.CeliyoCache")
     def test_cache_invalidation_is_best_effort(self, cache_class):
@@ -113,6 +318,96 @@ class VisitCacheFailureTests(SimpleTestCase):
         _invalidate_today_cache("tenant-1")
 
 
+class OPDNumberSequenceTests(TestCase):
+    day = datetime.date(2024, 1, 5)
+
+    def setUp(self):
+        self.tenant_id = uuid.uuid4()
+
+    def _next(self, seed=lambda: 0, tenant_id=None, kind=OPDNumberSequence.KIND_VISIT, resync=False):
+        return OPDNumberSequence.next_value(
+            tenant_id or self.tenant_id, kind, self.day, seed=seed, resync=resync
+        )
+
+    def test_first_number_of_the_day_is_seeded_from_existing_rows(self):
+        seed = Mock(return_value=7)
+        self.assertEqual(self._next(seed), 8)
+        seed.assert_called_once_with()
+
+    def test_numbers_increment_without_rescanning_rows(self):
+        seed = Mock(return_value=0)
+        self.assertEqual([self._next(seed) for _ in range(3)], [1, 2, 3])
+        seed.assert_called_once_with()
+
+    def test_resync_jumps_past_numbers_issued_outside_the_counter(self):
+        self._next()
+        self._next()
+        # A row numbered 10 was written without going through the counter
+        self.assertEqual(self._next(lambda: 10, resync=True), 11)
+        self.assertEqual(self._next(), 12)
+
+    def test_resync_never_moves_the_counter_back(self):
+        for _ in range(5):
+            self._next()
+        self.assertEqual(self._next(lambda: 1, resync=True), 6)
+
+    def test_tenants_and_kinds_count_separately(self):
+        other_tenant = uuid.uuid4()
+        self.assertEqual(self._next(), 1)
+        self.assertEqual(self._next(), 2)
+        self.assertEqual(self._next(tenant_id=other_tenant), 1)
+        self.assertEqual(self._next(kind=OPDNumberSequence.KIND_OPD_BILL), 1)
+        self.assertEqual(self._next(), 3)
+        self.assertEqual(OPDNumberSequence.objects.filter(sequence_date=self.day).count(), 3)
+
+    def test_visit_numbers_continue_from_existing_visits(self):
+        patient = PatientProfile.objects.create(
+            tenant_id=self.tenant_id,
+            first_name="Seed",
+            last_name="Patient",
+            gender="female",
+            mobile_primary="9999999998",
+        )
+        for number in ("OPD/20240105/009", "OPD/20240105/010"):
+            Visit.objects.create(
+                tenant_id=self.tenant_id,
+                visit_number=number,
+                patient=patient,
+                visit_date=self.day,
+            )
+
+        self.assertEqual(
+            Visit.generate_visit_number_for_tenant(self.tenant_id, self.day), "OPD/20240105/011"
+        )
+        self.assertEqual(
+            Visit.generate_visit_number_for_tenant(self.tenant_id, self.day), "OPD/20240105/012"
+        )
+
+    @patch("time.sleep")
+    def test_visit_save_resyncs_after_colliding_with_an_outside_number(self, sleep):
+        patient = PatientProfile.objects.create(
+            tenant_id=self.tenant_id,
+            first_name="Seed",
+            last_name="Patient",
+            gender="female",
+            mobile_primary="9999999998",
+        )
+        first = Visit.objects.create(tenant_id=self.tenant_id, patient=patient, visit_date=self.day)
+        # Issued outside the counter, e.g. by an import
+        Visit.objects.create(
+            tenant_id=self.tenant_id,
+            visit_number="OPD/20240105/002",
+            patient=patient,
+            visit_date=self.day,
+        )
+
+        second = Visit.objects.create(tenant_id=self.tenant_id, patient=patient, visit_date=self.day)
+
+        self.assertEqual(first.visit_number, "OPD/20240105/001")
+        self.assertEqual(second.visit_number, "OPD/20240105/003")
+        sleep.assert_called_once()
+
+
 class VisitOwnScopeTests(TestCase):
     def setUp(self):
         self.tenant_id = uuid.uuid4()
@@ -171,3 +466,414 @@ class VisitOwnScopeTests(TestCase):
         self.assertEqual(response.status_code, 200)
         waiting_ids = [row["id"] for row in response.data["data"]["waiting"]]
         self.assertEqual(waiting_ids, [self.own_visit.id])
+
+
+class EndpointQueryCountTests(TestCase):
+    """
+    Render list and detail endpoints over several rows and pin the query
+    count, so a serializer reading a column or relation the view's queryset
+    did not load fails here instead of costing a query per row.
+    """
+
+    def setUp(self):
+        self.tenant_id = uuid.uuid4()
+        self.doctor_user_id = uuid.uuid4()
+        self.doctor = DoctorProfile.objects.create(
+            tenant_id=self.tenant_id,
+            user_id=self.doctor_user_id,
+            first_name="Query",
+            last_name="Doctor",
+            status="active",
+        )
+        self.doctor.specialties.add(
+            Specialty.objects.create(tenant_id=self.tenant_id, name="Cardiology", code="CARD")
+        )
+        template = ClinicalNoteTemplate.objects.create(
+            tenant_id=self.tenant_id, name="Assessment", code="ASSESS"
+        )
+        field = ClinicalNoteTemplateField.objects.create(
+            tenant_id=self.tenant_id,
+            template=template,
+            field_name="severity",
+            field_label="Severity",
+            field_type="select",
+        )
+        option = ClinicalNoteTemplateFieldOption.objects.create(
+            tenant_id=self.tenant_id, field=field, option_value="mild", option_label="Mild"
+        )
+        visit_type = ContentType.objects.get_for_model(Visit)
+
+        self.visits = []
+        for index in range(3):
+            patient = PatientProfile.objects.create(
+                tenant_id=self.tenant_id,
+                first_name=f"Patient{index}",
+                last_name="Rows",
+                gender="female",
+                mobile_primary=f"900000000{index}",
+            )
+            visit = Visit.objects.create(
+                tenant_id=self.tenant_id,
+                patient=patient,
+                doctor=self.doctor,
+                visit_date=datetime.date.today(),
+            )
+            self.visits.append(visit)
+            bill = OPDBill.objects.create(
+                tenant_id=self.tenant_id,
+                visit=visit,
+                doctor=self.doctor,
+                received_amount=Decimal("0.00"),
+            )
+            OPDBillItem.bulk_add(bill, [
+                OPDBillItem(tenant_id=self.tenant_id, item_name="Consultation", unit_price=Decimal("500.00")),
+                OPDBillItem(tenant_id=self.tenant_id, item_name="Dressing", unit_price=Decimal("50.00")),
+            ])
+            ClinicalNote.objects.create(tenant_id=self.tenant_id, visit=visit, diagnosis="d" * 150)
+            VisitFinding.objects.create(
+                tenant_id=self.tenant_id,
+                visit=visit,
+                bp_systolic=120,
+                bp_diastolic=80,
+                weight=Decimal("70.00"),
+                height=Decimal("175.00"),
+            )
+            VisitAttachment.objects.create(
+                tenant_id=self.tenant_id,
+                visit=visit,
+                file="opd/attachments/report.pdf",
+                file_size_bytes=2048,
+            )
+            response = ClinicalNoteTemplateResponse.objects.create(
+                tenant_id=self.tenant_id,
+                content_type=visit_type,
+                object_id=visit.pk,
+                template=template,
+                filled_by_id=self.doctor_user_id,
+            )
+            ClinicalNoteTemplateFieldResponse.objects.create(
+                tenant_id=self.tenant_id, response=response, field=field
+            ).selected_options.add(option)
+        self.bill = bill
+        self.response = response
+
+        self.client = APIClient()
+        token = _jwt_for(
+            tenant_id=self.tenant_id,
+            user_id=self.doctor_user_id,
+            email="doctor@example.com",
+            permissions={"hms.opd.view": "all", "hms.opd.bill": "all"},
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def _get(self, path, queries):
+        with self.assertNumQueries(queries):
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def _list(self, path, queries):
+        # COUNT and page, plus any prefetches
+        results = self._get(path, queries)["results"]
+        self.assertEqual(len(results), 3)
+        return results
+
+    def test_visit_list(self):
+        rows = self._list("/api/opd/visits/", 2)
+        self.assertEqual(
+            sorted(row["patient_name"] for row in rows),
+            ["Patient0 Rows", "Patient1 Rows", "Patient2 Rows"],
+        )
+        self.assertEqual({row["doctor_name"] for row in rows}, {"Query Doctor"})
+
+    def test_visit_detail(self):
+        # Visit with flags, specialties, findings, attachments, IPD admission
+        data = self._get(f"/api/opd/visits/{self.visits[0].pk}/", 5)
+        self.assertEqual(data["doctor_details"]["specialties"], ["Cardiology"])
+        self.assertEqual(data["patient_details"]["full_name"], "Patient0 Rows")
+        self.assertTrue(data["has_opd_bill"])
+        self.assertTrue(data["has_clinical_note"])
+
+    def test_bill_list(self):
+        rows = self._list("/api/opd/opd-bills/", 3)
+        self.assertEqual({len(row["items"]) for row in rows}, {2})
+        self.assertEqual({row["doctor_name"] for row in rows}, {"Query Doctor"})
+
+    def test_bill_detail(self):
+        data = self._get(f"/api/opd/opd-bills/{self.bill.pk}/", 2)
+        self.assertEqual(data["patient_name"], "Patient2 Rows")
+        self.assertEqual(len(data["items"]), 2)
+
+    def test_clinical_note_list(self):
+        rows = self._list("/api/opd/clinical-notes/", 2)
+        self.assertEqual({row["diagnosis_short"] for row in rows}, {"d" * 100 + "..."})
+        self.assertEqual(
+            {row["visit_number"] for row in rows},
+            {visit.visit_number for visit in self.visits},
+        )
+
+    def test_clinical_note_detail(self):
+        data = self._get(f"/api/opd/clinical-notes/{self.visits[0].clinical_note.pk}/", 1)
+        self.assertEqual(data["patient_name"], "Patient0 Rows")
+
+    def test_finding_list(self):
+        rows = self._list("/api/opd/visit-findings/", 2)
+        self.assertEqual({row["blood_pressure"] for row in rows}, {"120/80"})
+        self.assertEqual({row["bmi_category"] for row in rows}, {"Normal"})
+
+    def test_finding_detail(self):
+        finding = self.visits[0].findings.get()
+        data = self._get(f"/api/opd/visit-findings/{finding.pk}/", 1)
+        self.assertEqual(data["visit_number"], self.visits[0].visit_number)
+
+    def test_attachment_list(self):
+        rows = self._list("/api/opd/visit-attachments/", 2)
+        self.assertEqual({row["file_size"] for row in rows}, {"2.00 KB"})
+        self.assertEqual({row["file_extension"] for row in rows}, {".pdf"})
+
+    def test_attachment_detail(self):
+        attachment = self.visits[0].attachments.get()
+        data = self._get(f"/api/opd/visit-attachments/{attachment.pk}/", 1)
+        self.assertEqual(data["visit_number"], self.visits[0].visit_number)
+
+    def test_template_response_list(self):
+        # Plus encounters, field response ids and filled-by names
+        rows = self._list("/api/opd/template-responses/", 5)
+        self.assertEqual(
+            {row["encounter_display"] for row in rows},
+            {f"OPD Visit: {visit.visit_number}" for visit in self.visits},
+        )
+        self.assertEqual({row["field_response_count"] for row in rows}, {1})
+        self.assertEqual({row["filled_by_name"] for row in rows}, {"Query Doctor"})
+
+    def test_template_response_detail(self):
+        path = f"/api/opd/template-responses/{self.response.pk}/"
+        # The first read stores the generated summary
+        self.client.get(path)
+        # Response, field responses, their options, encounter
+        data = self._get(path, 4)
+        self.assertEqual(data["field_responses"][0]["display_value"], "Mild")
+        self.assertEqual(data["summary"]["severity"]["value"], "Mild")
+
+
+class OPDBillBulkPaymentTests(TestCase):
+    def setUp(self):
+        self.tenant_id = uuid.uuid4()
+        self.bills = [self._bill(self.tenant_id, index) for index in range(2)]
+
+    def _bill(self, tenant_id, index):
+        patient = PatientProfile.objects.create(
+            tenant_id=tenant_id,
+            first_name=f"Payer{index}",
+            last_name="Patient",
+            gender="male",
+            mobile_primary=f"910000000{index}",
+        )
+        visit = Visit.objects.create(
+            tenant_id=tenant_id, patient=patient, visit_date=datetime.date.today()
+        )
+        bill = OPDBill.objects.create(tenant_id=tenant_id, visit=visit, received_amount=Decimal("0.00"))
+        OPDBillItem.bulk_add(bill, [
+            OPDBillItem(tenant_id=tenant_id, item_name="Consultation", unit_price=Decimal("500.00")),
+        ])
+        return bill
+
+    def _ledger(self, bill):
+        return list(
+            Transaction.objects.filter(
+                content_type=ContentType.objects.get_for_model(OPDBill), object_id=bill.pk
+            ).order_by("created_at").values_list("amount", "payment_method")
+        )
+
+    def test_payments_update_bills_and_record_ledger_transactions(self):
+        paid, partial = self.bills
+
+        bills = OPDBill.bulk_record_payments(self.tenant_id, [
+            (paid.pk, Decimal("300.00"), "cash"),
+            (paid.pk, "200.00", "upi"),
+            (partial.pk, Decimal("100.00"), "card"),
+        ])
+
+        self.assertEqual(set(bills), {paid.pk, partial.pk})
+        paid.refresh_from_db()
+        partial.refresh_from_db()
+        self.assertEqual(
+            (paid.received_amount, paid.balance_amount, paid.payment_status),
+            (Decimal("500.00"), Decimal("0.00"), "paid"),
+        )
+        self.assertEqual(
+            (partial.received_amount, partial.balance_amount, partial.payment_status),
+            (Decimal("100.00"), Decimal("400.00"), "partial"),
+        )
+        # Same ledger rows record_payment() produces through save()
+        self.assertEqual(self._ledger(paid), [(Decimal("500.00"), "upi")])
+        self.assertEqual(self._ledger(partial), [(Decimal("100.00"), "card")])
+
+        OPDBill.bulk_record_payments(self.tenant_id, [(partial.pk, Decimal("50.00"), "cash")])
+        self.assertEqual(
+            self._ledger(partial), [(Decimal("100.00"), "card"), (Decimal("50.00"), "cash")]
+        )
+
+    def test_other_tenants_bills_are_not_credited(self):
+        other = self._bill(uuid.uuid4(), 9)
+
+        with self.assertRaises(OPDBill.DoesNotExist):
+            OPDBill.bulk_record_payments(self.tenant_id, [
+                (self.bills[0].pk, Decimal("100.00"), "cash"),
+                (other.pk, Decimal("100.00"), "cash"),
+            ])
+
+        other.refresh_from_db()
+        self.bills[0].refresh_from_db()
+        self.assertEqual(other.received_amount, Decimal("0.00"))
+        self.assertEqual(self.bills[0].received_amount, Decimal("0.00"))
+        self.assertEqual(self._ledger(other), [])
+
+
+class VisitPaymentTotalsTriggerTests(TestCase):
+    """opd_bills_sync_visit_payment_totals (migration 0017) keeps the visit in step."""
+
+    def setUp(self):
+        self.tenant_id = uuid.uuid4()
+        patient = PatientProfile.objects.create(
+            tenant_id=self.tenant_id,
+            first_name="Trigger",
+            last_name="Patient",
+            gender="female",
+            mobile_primary="9200000000",
+        )
+        self.visit = Visit.objects.create(
+            tenant_id=self.tenant_id, patient=patient, visit_date=datetime.date.today()
+        )
+
+    def _bill(self, price):
+        bill = OPDBill.objects.create(
+            tenant_id=self.tenant_id, visit=self.visit, received_amount=Decimal("0.00")
+        )
+        OPDBillItem.bulk_add(bill, [
+            OPDBillItem(tenant_id=self.tenant_id, item_name="Consultation", unit_price=price),
+        ])
+        return bill
+
+    def assertVisitTotals(self, total, paid, balance, status):
+        self.visit.refresh_from_db(
+            fields=["total_amount", "paid_amount", "balance_amount", "payment_status"]
+        )
+        self.assertEqual(
+            (self.visit.total_amount, self.visit.paid_amount, self.visit.balance_amount,
+             self.visit.payment_status),
+            (Decimal(total), Decimal(paid), Decimal(balance), status),
+        )
+
+    def test_bill_writes_update_visit_totals(self):
+        bill = self._bill(Decimal("500.00"))
+        self.assertVisitTotals("500.00", "0.00", "500.00", "unpaid")
+
+        bill.received_amount = Decimal("200.00")
+        bill.save()
+        self.assertVisitTotals("500.00", "200.00", "300.00", "partial")
+
+        # update() bypasses save() and signals
+        OPDBill.objects.filter(pk=bill.pk).update(received_amount=Decimal("500.00"))
+        self.assertVisitTotals("500.00", "500.00", "0.00", "paid")
+
+        self._bill(Decimal("100.00"))
+        self.assertVisitTotals("600.00", "500.00", "100.00", "partial")
+
+        bill.delete()
+        self.assertVisitTotals("100.00", "0.00", "100.00", "unpaid")
+
+
+class RecomputeVisitFindingBMICommandTests(TestCase):
+    def setUp(self):
+        self.tenant_id = uuid.uuid4()
+        self.measured = self._finding(self.tenant_id, 0, height=Decimal("175.00"))
+        self.no_height = self._finding(self.tenant_id, 1, height=None)
+        self.other_tenant = self._finding(uuid.uuid4(), 2, height=Decimal("175.00"))
+        # Simulate rows written before BMI was derived on save
+        VisitFinding.objects.update(bmi=None)
+
+    def _finding(self, tenant_id, index, height):
+        patient = PatientProfile.objects.create(
+            tenant_id=tenant_id,
+            first_name=f"Measured{index}",
+            last_name="Patient",
+            gender="female",
+            mobile_primary=f"920000000{index}",
+        )
+        visit = Visit.objects.create(
+            tenant_id=tenant_id, patient=patient, visit_date=datetime.date.today()
+        )
+        return VisitFinding.objects.create(
+            tenant_id=tenant_id, visit=visit, weight=Decimal("70.00"), height=height
+        )
+
+    def _bmi(self, finding):
+        finding.refresh_from_db(fields=["bmi"])
+        return finding.bmi
+
+    def test_dry_run_leaves_rows_untouched(self):
+        out = StringIO()
+        call_command("recompute_visit_finding_bmi", tenant_id=str(self.tenant_id), stdout=out)
+
+        self.assertIn("Findings with weight and height: 1", out.getvalue())
+        self.assertIsNone(self._bmi(self.measured))
+
+    def test_apply_backfills_the_tenant_in_one_update(self):
+        out = StringIO()
+        with self.assertNumQueries(1):
+            call_command(
+                "recompute_visit_finding_bmi", tenant_id=str(self.tenant_id), apply=True, stdout=out
+            )
+
+        self.assertIn("Updated findings: 1", out.getvalue())
+        self.assertEqual(self._bmi(self.measured), Decimal("22.86"))
+        self.assertIsNone(self._bmi(self.no_height))
+        self.assertIsNone(self._bmi(self.other_tenant))
+
+
+class VisitQueueEndpointTests(TestCase):
+    def setUp(self):
+        self.tenant_id = uuid.uuid4()
+        patient = PatientProfile.objects.create(
+            tenant_id=self.tenant_id,
+            first_name="Queued",
+            last_name="Patient",
+            gender="male",
+            mobile_primary="9300000000",
+        )
+        now = datetime.datetime.now(datetime.timezone.utc)
+        self.visits = {}
+        for minutes, status in enumerate(["called", "in_consultation", "waiting", "completed", "waiting"]):
+            visit = Visit.objects.create(
+                tenant_id=self.tenant_id,
+                patient=patient,
+                status=status,
+                visit_date=datetime.date.today(),
+            )
+            Visit.objects.filter(pk=visit.pk).update(entry_time=now + datetime.timedelta(minutes=minutes))
+            self.visits.setdefault(status, []).append(visit.pk)
+
+        self.client = APIClient()
+        token = _jwt_for(
+            tenant_id=self.tenant_id,
+            user_id=uuid.uuid4(),
+            email="frontdesk@example.com",
+            permissions={"hms.opd.view": "all"},
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    @staticmethod
+    def _positions(rows):
+        return [(row["id"], row["queue_position"]) for row in rows]
+
+    def test_queue_reports_live_positions_across_waiting_and_called(self):
+        response = self.client.get("/api/opd/visits/queue/")
+
+        self.assertEqual(response.status_code, 200)
+        data = response.data["data"]
+        called_id = self.visits["called"][0]
+        first_waiting, second_waiting = self.visits["waiting"]
+        self.assertEqual(self._positions(data["called"]), [(called_id, 1)])
+        self.assertEqual(self._positions(data["waiting"]), [(first_waiting, 2), (second_waiting, 3)])
+        self.assertEqual([row["id"] for row in data["in_consultation"]], self.visits["in_consultation"])
@@ -1,5 +1,6 @@
 # opd/views.py
-from django.db.models import Q, Count, Sum, Avg, F
+from django.db.models import Q, Count, Sum, Avg, F, Prefetch, Case, When, Value, CharField
+from django.db.models.functions import Concat, Length, Substr
 from django.utils import timezone
 from django.db import transaction
 from datetime import date, timedelta
@@ -68,6 +69,7 @@ from .serializers import (
     ClinicalNoteTemplateResponseListSerializer, ClinicalNoteTemplateResponseDetailSerializer,
     ClinicalNoteTemplateResponseCreateUpdateSerializer,
     ClinicalNoteTemplateFieldResponseSerializer,
+    ClinicalNoteTemplateFieldResponseListSerializer,
     ClinicalNoteTemplateFieldResponseCreateUpdateSerializer,
     ClinicalNoteResponseTemplateDetailSerializer
 )
@@ -157,11 +159,7 @@ class VisitViewSet(TenantViewSetMixin, viewsets.ModelViewSet):
     Handles patient visits, queue management, and visit workflow.
     Uses JWT-based HMS permissions from the auth backend.
     """
-    queryset = Visit.objects.select_related(
-        'patient', 'doctor', 'appointment', 'referred_by'
-    ).prefetch_related(
-         'findings', 'attachments'
-    )
+    queryset = Visit.objects.with_related()
     permission_classes = [HMSPermissionAllowOwnView]
     hms_module = 'opd'  # Maps to permissions.hms.opd in JWT
 
@@ -238,6 +236,13 @@ class VisitViewSet(TenantViewSetMixin, viewsets.ModelViewSet):
                 'follow_up_notes',
             )
         queryset = super().get_queryset()
+        if self.action == 'retrieve':
+            queryset = queryset.with_full_detail()
+        elif self.action in {'call_next', 'start', 'complete'}:
+            # These render VisitDetailSerializer for an existing visit
+            queryset = queryset.with_record_flags()
+        elif self.action in {'list', 'today', 'queue'}:
+            queryset = queryset.for_listing()
         # JWT auth: use request.roles, never request.user.groups
         # TenantViewSetMixin already scopes by tenant_id.
         # HMSPermission gates action access. For "own" read scope, apply the
@@ -353,9 +358,12 @@ class VisitViewSet(TenantViewSetMixin, viewsets.ModelViewSet):
             else:
                 queryset = queryset.filter(doctor_id=own_doctor.id)
 
-        # Group by status
-        waiting = queryset.filter(status='waiting').order_by('entry_time')
-        called = queryset.filter(status='called').order_by('entry_time')
+        # Waiting and called visits share one queue; fetch both in one query
+        # with live positions in place of the unmaintained queue_position column
+        waiting, called = [], []
+        for visit in queryset.queue_positions(request.tenant_id, today):
+            visit.queue_position = visit.queue_pos
+            (waiting if visit.status == 'waiting' else called).append(visit)
         in_consultation = queryset.filter(status='in_consultation').order_by('entry_time')
 
         return Response({
@@ -728,7 +736,7 @@ class VisitViewSet(TenantViewSetMixin, viewsets.ModelViewSet):
 
         if request.method == 'GET':
             # List all template responses for this visit
-            responses = visit.template_responses.select_related('template').all()
+            responses = visit.template_responses.for_listing()
             serializer = ClinicalNoteTemplateResponseListSerializer(responses, many=True)
             return Response({
                 'success': True,
@@ -920,7 +928,7 @@ class VisitViewSet(TenantViewSetMixin, viewsets.ModelViewSet):
         2. Identifies all unbilled items (where bill_item_link is null).
         3. Creates OPDBillItem entries for them, linked to the master bill.
         4. Updates the source Orders to link them to these new Bill Items.
-        5. Bill totals are updated automatically by signals.
+        5. Recalculates the bill totals once after all items are added.
         """
         from django.contrib.contenttypes.models import ContentType
         from apps.diagnostics.models import (
@@ -983,8 +991,12 @@ class VisitViewSet(TenantViewSetMixin, viewsets.ModelViewSet):
                 bill_item_content_type__isnull=True
             ).select_related('investigation')
 
+            # Items are inserted together below; orders are linked afterwards
+            # since bill_item_link needs the item primary keys
+            orders_and_items = []
+
             for order in diagnostic_orders:
-                item = OPDBillItem.objects.create(
+                item = OPDBillItem(
                     bill=opd_bill,
                     tenant_id=request.tenant_id,
                     item_name=order.investigation.name,
@@ -996,10 +1008,7 @@ class VisitViewSet(TenantViewSetMixin, viewsets.ModelViewSet):
                     origin_object_id=order.pk,
                     notes=f"Test: {order.investigation.code}"
                 )
-                order.bill_item_link = item
-                order.save(update_fields=['bill_item_content_type', 'bill_item_object_id'])
-                created_items_count += 1
-                updated_orders_count += 1
+                orders_and_items.append((order, item))
 
             # Process other order types similarly...
             # (MedicineOrder, ProcedureOrder, PackageOrder, PanchakarmaOrder)
@@ -1011,7 +1020,7 @@ class VisitViewSet(TenantViewSetMixin, viewsets.ModelViewSet):
             ).select_related('product')
 
             for order in medicine_orders:
-                item = OPDBillItem.objects.create(
+                item = OPDBillItem(
                     bill=opd_bill,
                     tenant_id=request.tenant_id,
                     item_name=order.product.product_name,
@@ -1023,13 +1032,18 @@ class VisitViewSet(TenantViewSetMixin, viewsets.ModelViewSet):
                     origin_object_id=order.pk,
                     notes=f"Medicine - Qty: {order.quantity}"
                 )
+                orders_and_items.append((order, item))
+
+            # One INSERT for all items, then a single bill recalculation
+            OPDBillItem.bulk_add(opd_bill, [item for _, item in orders_and_items])
+
+            # Order saves stay per-row: their post_save receivers sync the bill item
+            for order, item in orders_and_items:
                 order.bill_item_link = item
                 order.save(update_fields=['bill_item_content_type', 'bill_item_object_id'])
                 created_items_count += 1
                 updated_orders_count += 1
 
-            # Final bill calculation is handled by signals
-
         return Response({
             'success': True,
             'message': f'Synced {created_items_count} clinical charges to bill {opd_bill.bill_number}',
@@ -1114,6 +1128,13 @@ class OPDBillViewSet(TenantViewSetMixin, viewsets.ModelViewSet):
             return OPDBillCreateUpdateSerializer
         return OPDBillDetailSerializer
 
+    def get_queryset(self):
+        """Narrow list rows to the columns the list serializer renders"""
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = queryset.for_listing()
+        return queryset
+
     @extend_schema(
         summary="Record Payment",
         description="Record a payment for an OPD bill",
@@ -1489,7 +1510,7 @@ class ProcedurePackageViewSet(TenantViewSetMixin, viewsets.ModelViewSet):
     Manages bundled procedures with discounted pricing.
     Uses Django model permissions for access control.
     """
-    queryset = ProcedurePackage.objects.prefetch_related('procedures')
+    queryset = ProcedurePackage.objects.with_savings()
     permission_classes = [HMSPermission]
     hms_module = 'opd'
 
@@ -1516,6 +1537,13 @@ class ProcedurePackageViewSet(TenantViewSetMixin, viewsets.ModelViewSet):
             return ProcedurePackageCreateUpdateSerializer
         return ProcedurePackageDetailSerializer
 
+    def get_queryset(self):
+        """Count procedures in SQL for listings; load them only for detail."""
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            return queryset.with_procedure_count()
+        return queryset.prefetch_related('procedures')
+
 
 
 # ============================================================================
@@ -1577,7 +1605,23 @@ class ClinicalNoteViewSet(TenantViewSetMixin, viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Filter clinical notes — JWT auth, tenant already scoped by mixin"""
-        return super().get_queryset()
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # Truncate in SQL so the full diagnosis text never leaves the database
+            queryset = queryset.for_listing().alias(
+                diagnosis_length=Length('diagnosis')
+            ).annotate(
+                diagnosis_short=Case(
+                    When(Q(diagnosis__isnull=True) | Q(diagnosis=''), then=Value(None)),
+                    When(
+                        diagnosis_length__gt=100,
+                        then=Concat(Substr('diagnosis', 1, 100), Value('...'))
+                    ),
+                    default=F('diagnosis'),
+                    output_field=CharField()
+                )
+            )
+        return queryset
 
 
 # ============================================================================
@@ -1637,6 +1681,13 @@ class VisitFindingViewSet(TenantViewSetMixin, viewsets.ModelViewSet):
             return VisitFindingCreateUpdateSerializer
         return VisitFindingDetailSerializer
 
+    def get_queryset(self):
+        """Narrow list rows to the columns the list serializer renders"""
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = queryset.for_listing()
+        return queryset
+
 
 # ============================================================================
 # VISIT ATTACHMENT VIEWSET
@@ -1666,9 +1717,8 @@ class VisitAttachmentViewSet(TenantViewSetMixin, viewsets.ModelViewSet):
     Manages medical documents and file uploads.
     Uses Django model permissions for access control.
     """
-    queryset = VisitAttachment.objects.select_related(
-        'visit__patient'
-    )
+    # Attachment serializers render visit_number only
+    queryset = VisitAttachment.objects.select_related('visit')
     permission_classes = [HMSPermission]
     hms_module = 'opd'
 
@@ -1696,6 +1746,13 @@ class VisitAttachmentViewSet(TenantViewSetMixin, viewsets.ModelViewSet):
             return VisitAttachmentCreateUpdateSerializer
         return VisitAttachmentDetailSerializer
 
+    def get_queryset(self):
+        """Narrow list rows to the columns the list serializer renders"""
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = queryset.for_listing(with_patient=False)
+        return queryset
+
 
 # ============================================================================
 # CLINICAL NOTE TEMPLATE GROUP VIEWSET
@@ -1725,7 +1782,7 @@ class ClinicalNoteTemplateGroupViewSet(TenantViewSetMixin, viewsets.ModelViewSet
     Manages template groups for organizing clinical note templates.
     Uses Django model permissions for access control.
     """
-    queryset = ClinicalNoteTemplateGroup.objects.prefetch_related('templates')
+    queryset = ClinicalNoteTemplateGroup.objects.annotate(template_count=Count('templates'))
     permission_classes = [HMSPermission]
     hms_module = 'opd'
 
@@ -1827,6 +1884,9 @@ class ClinicalNoteTemplateViewSet(TenantViewSetMixin, viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter active templates by default"""
         queryset = super().get_queryset()
+        if self.action == 'list':
+            # The list renders a field count, not the fields themselves
+            queryset = queryset.prefetch_related(None).annotate(field_count=Count('fields'))
 
         # Show only active templates unless explicitly requested
         show_inactive = self.request.query_params.get('show_inactive', 'false')
@@ -1968,6 +2028,9 @@ class ClinicalNoteTemplateFieldViewSet(TenantViewSetMixin, viewsets.ModelViewSet
     def get_queryset(self):
         """Filter by template if provided"""
         queryset = super().get_queryset()
+        if self.action == 'list':
+            # The list renders an option count, not the options themselves
+            queryset = queryset.prefetch_related(None).annotate(option_count=Count('options'))
 
         template_id = self.request.query_params.get('template_id')
         if template_id:
@@ -2066,7 +2129,14 @@ class ClinicalNoteTemplateResponseViewSet(TenantViewSetMixin, viewsets.ModelView
     """
     queryset = ClinicalNoteTemplateResponse.objects.select_related(
         'template', 'content_type'
-    ).prefetch_related('field_responses__field__options')
+    ).prefetch_related(
+        # Nested field responses render field label/type, selected option ids
+        # and display values
+        Prefetch(
+            'field_responses',
+            queryset=ClinicalNoteTemplateFieldResponse.objects.with_value_relations()
+        )
+    )
     permission_classes = [HMSPermission]
     hms_module = 'opd'
     parser_classes = [MultiPartParser, FormParser, JSONParser]  # For file upload support and JSON
@@ -2114,6 +2184,9 @@ class ClinicalNoteTemplateResponseViewSet(TenantViewSetMixin, viewsets.ModelView
     def get_queryset(self):
         """Filter by encounter if provided"""
         queryset = super().get_queryset()
+        if self.action == 'list':
+            # Detail prefetches whole field responses; listings only count them
+            queryset = queryset.prefetch_related(None).for_listing()
 
         # Support two filtering styles:
         # 1. encounter_type + encounter_id  (legacy)
@@ -2132,9 +2205,9 @@ class ClinicalNoteTemplateResponseViewSet(TenantViewSetMixin, viewsets.ModelView
             # 'admission' / 'ipd'  → ipd.admission
             et = encounter_type.lower()
             if et in ('opd', 'visit'):
-                content_type = ContentType.objects.get(app_label='opd', model='visit')
+                content_type = ContentType.objects.get_by_natural_key('opd', 'visit')
             elif et in ('ipd', 'admission'):
-                content_type = ContentType.objects.get(app_label='ipd', model='admission')
+                content_type = ContentType.objects.get_by_natural_key('ipd', 'admission')
             else:
                 return queryset.none()
 
@@ -2403,9 +2476,7 @@ class ClinicalNoteTemplateFieldResponseViewSet(TenantViewSetMixin, viewsets.Mode
     Manages individual field responses within template responses.
     Uses Django model permissions for access control.
     """
-    queryset = ClinicalNoteTemplateFieldResponse.objects.select_related(
-        'response__visit', 'field'
-    )
+    queryset = ClinicalNoteTemplateFieldResponse.objects.with_value_relations()
     permission_classes = [HMSPermission]
     hms_module = 'opd'
 
@@ -2428,11 +2499,16 @@ class ClinicalNoteTemplateFieldResponseViewSet(TenantViewSetMixin, viewsets.Mode
         """Return appropriate serializer"""
         if self.action in ['create', 'update', 'partial_update']:
             return ClinicalNoteTemplateFieldResponseCreateUpdateSerializer
+        elif self.action == 'list':
+            return ClinicalNoteTemplateFieldResponseListSerializer
         return ClinicalNoteTemplateFieldResponseSerializer
 
     def get_queryset(self):
         """Filter by response if provided"""
         queryset = super().get_queryset()
+        if self.action == 'list':
+            # Canvas documents are only shipped by retrieve
+            queryset = queryset.without_canvas_blobs()
 
         response_id = self.request.query_params.get('response_id')
         if response_id:
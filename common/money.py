@@ -0,0 +1,10 @@
+"""Decimal constants for bill arithmetic shared by the OPD and IPD apps.
+
+Module-level so totals recalculations don't re-parse the literals.
+"""
+
+from decimal import Decimal
+
+ZERO_AMOUNT = Decimal('0.00')
+HUNDRED = Decimal('100.00')
+CENT = Decimal('0.01')
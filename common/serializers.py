@@ -4,11 +4,117 @@ All tenant-aware serializers should inherit from :class:`TenantAwareSerializer`
 or mix in :class:`common.mixins.TenantMixin`.
 """
 
+import copy
+from contextlib import contextmanager
+
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import prefetch_related_objects
 from rest_framework import serializers
 
 from .mixins import TenantMixin
 
 
+class CachedFieldsMixin:
+    """Build a serializer class's fields once and hand out copies.
+
+    ``ModelSerializer.get_fields()`` introspects the model on every
+    instantiation, which adds up for nested ``many=True`` serializers. The
+    result depends only on the class, so it is cached per class (not
+    inherited by subclasses) and deep-copied per instance, the same way DRF
+    copies declared fields. Do not use with serializers whose fields depend
+    on the instance or context.
+    """
+
+    def get_fields(self):
+        cls = type(self)
+        cached = cls.__dict__.get("_fields_cache")
+        if cached is None:
+            cached = super().get_fields()
+            cls._fields_cache = cached
+        return copy.deepcopy(cached)
+
+
+class CachedFieldsModelSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    """ModelSerializer with per-class field caching (see CachedFieldsMixin)."""
+
+
+class EagerLoadingListSerializer(serializers.ListSerializer):
+    """Load the child serializer's ``eager_lookups`` before rendering rows.
+
+    List serializers read related objects (``visit.patient`` and the like)
+    and otherwise depend on every caller having joined or prefetched them.
+    ``prefetch_related_objects()`` skips relations the rows already carry, so
+    this costs nothing after a well-built queryset and one query per lookup
+    instead of one per row after any other. Use it as the child's
+    ``Meta.list_serializer_class``.
+    """
+
+    def to_representation(self, data):
+        lookups = getattr(self.child, "eager_lookups", ())
+        if lookups:
+            if isinstance(data, models.manager.BaseManager):
+                data = data.all()
+            data = list(data)
+            prefetch_related_objects(data, *lookups)
+        return super().to_representation(data)
+
+
+# (model label, field names) -> names of the unique constraints over them
+_unique_constraint_names = {}
+
+
+def _constraint_names(constraint):
+    """
+    Database names for ``constraint``: a constraint name, or a
+    ``(model, field_names)`` pair for unique_together / unique=True
+    constraints, whose generated names are read from the database once.
+    """
+    if isinstance(constraint, str):
+        return {constraint}
+    model, field_names = constraint
+    key = (model._meta.label, tuple(field_names))
+    names = _unique_constraint_names.get(key)
+    if names is None:
+        columns = [model._meta.get_field(name).column for name in field_names]
+        with connection.cursor() as cursor:
+            found = connection.introspection.get_constraints(cursor, model._meta.db_table)
+        names = _unique_constraint_names[key] = {
+            name for name, info in found.items()
+            if info["unique"] and not info["primary_key"] and info["columns"] == columns
+        }
+    return names
+
+
+def is_unique_violation(exc, constraint):
+    """
+    True if IntegrityError ``exc`` was raised by ``constraint`` (see
+    ``_constraint_names``), judged by the constraint name Postgres reports
+    rather than the message text.
+    """
+    diag = getattr(exc.__cause__, "diag", None)
+    violated = getattr(diag, "constraint_name", None)
+    return violated is not None and violated in _constraint_names(constraint)
+
+
+@contextmanager
+def unique_violation(constraint, errors):
+    """Report a violation of one unique constraint as a ValidationError.
+
+    Lets the constraint decide instead of a SELECT before every write. The
+    block runs in a savepoint so the request transaction stays usable after
+    the rejected INSERT/UPDATE. Only a violation of ``constraint`` (see
+    ``_constraint_names``) becomes ``ValidationError(errors)``; any other
+    integrity error propagates.
+    """
+    try:
+        with transaction.atomic():
+            yield
+    except IntegrityError as exc:
+        if not is_unique_violation(exc, constraint):
+            raise
+        raise serializers.ValidationError(errors) from exc
+
+
 class TenantAwareSerializer(TenantMixin, serializers.ModelSerializer):
     """Base ModelSerializer that automatically scopes records to the JWT tenant.
 
@@ -0,0 +1,54 @@
+from contextlib import nullcontext
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.db import IntegrityError
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ValidationError
+
+from common.serializers import is_unique_violation, unique_violation
+
+
+def _integrity_error(constraint_name):
+    exc = IntegrityError("duplicate key value violates unique constraint")
+    exc.__cause__ = SimpleNamespace(diag=SimpleNamespace(constraint_name=constraint_name))
+    return exc
+
+
+@patch("django.db.transaction.atomic", nullcontext)
+class UniqueViolationTests(SimpleTestCase):
+    def test_named_constraint_becomes_field_error(self):
+        with self.assertRaises(ValidationError) as caught:
+            with unique_violation("uniq_code", {"code": "Code already exists"}):
+                raise _integrity_error("uniq_code")
+        self.assertEqual(caught.exception.detail["code"], "Code already exists")
+
+    def test_other_constraints_propagate(self):
+        with self.assertRaises(IntegrityError):
+            with unique_violation("uniq_code", {"code": "Code already exists"}):
+                raise _integrity_error("some_other_uniq")
+
+    def test_errors_without_constraint_name_propagate(self):
+        # NOT NULL violations report no constraint name
+        with self.assertRaises(IntegrityError):
+            with unique_violation("uniq_code", {"code": "Code already exists"}):
+                raise _integrity_error(None)
+
+    @patch("common.serializers._unique_constraint_names", {("opd.ProcedureMaster", ("tenant_id", "code")): {"pm_uniq"}})
+    def test_generated_constraint_names_are_resolved_per_model_fields(self):
+        from apps.opd.models import ProcedureMaster
+
+        with self.assertRaises(ValidationError):
+            with unique_violation((ProcedureMaster, ["tenant_id", "code"]), {"code": "dup"}):
+                raise _integrity_error("pm_uniq")
+
+
+class IsUniqueViolationTests(SimpleTestCase):
+    @patch("common.serializers._unique_constraint_names", {("opd.OPDBill", ("tenant_id", "bill_number")): {"bill_uniq"}})
+    def test_matches_only_the_named_constraint(self):
+        from apps.opd.models import OPDBill
+
+        constraint = (OPDBill, ["tenant_id", "bill_number"])
+        self.assertTrue(is_unique_violation(_integrity_error("bill_uniq"), constraint))
+        self.assertFalse(is_unique_violation(_integrity_error("opd_bills_visit_id_fkey"), constraint))
+        self.assertFalse(is_unique_violation(_integrity_error(None), constraint))